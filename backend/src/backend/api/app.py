@@ -0,0 +1,72 @@
+import os
+from contextlib import asynccontextmanager
+from typing import Callable, Optional
+from fastapi import FastAPI
+from backend.api.routers.metrics import router as metrics_router
+from backend.api.routers.predict import router as predict_router
+from backend.api.services.prediction_cache import PredictionCache
+from backend.api.services.prediction_service import PredictionService
+
+
+def _ohlcv_source_from_env(max_age_s: float) -> Optional[Callable]:
+    """
+    Źródło świec dla /signal: fetch_history z OhlcvCache w MUSA_OHLCV_CACHE_DIR (zakres MUSA_OHLCV_PERIOD).
+    Świece młodsze niż `max_age_s` są czytane z dysku bez zapytania do sieci. Bez katalogu - brak źródła.
+    """
+
+    cache_dir = os.environ.get("MUSA_OHLCV_CACHE_DIR")
+    if cache_dir is None:
+        return None
+
+    period = os.environ.get("MUSA_OHLCV_PERIOD", "1y")
+
+    def source(ticker: str, interval: str):
+        from datetime import timedelta
+        from backend.ml.data.fetchers.ohlcv_cache import OhlcvCache
+        from backend.ml.data.fetchers.yahoo_fetcher import fetch_history
+
+        cache = OhlcvCache(cache_dir, max_age=timedelta(seconds=max_age_s))
+        return fetch_history(ticker, interval, period=period, cache=cache)
+
+    return source
+
+
+def create_app(service: Optional[PredictionService] = None) -> FastAPI:
+    """
+    Tworzy aplikację FastAPI z serwisem predykcji.
+
+    Args:
+        service (Optional[PredictionService]): Gotowy serwis. Jeśli None, model i skaler są wczytywane
+            przy starcie z MUSA_MODEL_PATH (plik .joblib albo katalog artefaktu) i MUSA_SCALER_PATH, a mikro-paczki konfigurują
+            MUSA_MAX_BATCH_SIZE i MUSA_MAX_WAIT_MS. Cache sygnałów konfigurują MUSA_CACHE_TTL_S i
+            MUSA_CACHE_MAX_ENTRIES, wersję modelu w kluczu - MUSA_MODEL_VERSION, a źródło świec dla
+            /signal - MUSA_OHLCV_CACHE_DIR i MUSA_OHLCV_PERIOD.
+
+    Returns:
+        FastAPI: Aplikacja gotowa do uruchomienia przez uvicorn.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        cache_ttl_s = float(os.environ.get("MUSA_CACHE_TTL_S", 60.0))
+        prediction_service = service or PredictionService.from_paths(
+            model_path=os.environ["MUSA_MODEL_PATH"],
+            scaler_path=os.environ.get("MUSA_SCALER_PATH"),
+            max_batch_size=int(os.environ.get("MUSA_MAX_BATCH_SIZE", 64)),
+            max_wait_ms=float(os.environ.get("MUSA_MAX_WAIT_MS", 5.0)),
+            cache=PredictionCache(cache_ttl_s, int(os.environ.get("MUSA_CACHE_MAX_ENTRIES", 1024))),
+            model_version=os.environ.get("MUSA_MODEL_VERSION", "latest"),
+            ohlcv_source=_ohlcv_source_from_env(cache_ttl_s),
+        )
+        prediction_service.batcher.start()
+        app.state.prediction_service = prediction_service
+
+        yield
+
+        await prediction_service.batcher.stop()
+
+    app = FastAPI(title="Mansa-Musa", lifespan=lifespan)
+    app.include_router(predict_router)
+    app.include_router(metrics_router)
+
+    return app
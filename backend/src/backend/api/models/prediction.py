@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field
+
+
+class PredictRequest(BaseModel):
+    """
+    Jeden wiersz cech do predykcji.
+
+    ## Attributes:
+        :features (dict[str, float]): Wartości cech z `map_ohlcv_to_features`, np. {"rsi": 55.1, ...}.
+    """
+
+    features: dict[str, float] = Field(..., min_length=1)
+
+
+class PredictResponse(BaseModel):
+    """
+    Wynik predykcji dla jednego wiersza.
+
+    ## Attributes:
+        :prediction (int): Klasa z największym prawdopodobieństwem (1, 0, -1).
+        :probabilities (dict[str, float]): Prawdopodobieństwo każdej klasy, klucz to etykieta klasy.
+        :batch_size (int): Liczba zapytań obsłużonych tym samym wywołaniem predict_proba.
+    """
+
+    prediction: int
+    probabilities: dict[str, float]
+    batch_size: int
+
+
+class SignalResponse(PredictResponse):
+    """
+    Sygnał dla ostatniej świecy tickera.
+
+    ## Attributes:
+        :ticker (str): Symbol, np. 'AAPL'.
+        :interval (str): Interwał świec, np. '1h'.
+        :model_version (str): Wersja modelu, który policzył wynik.
+        :bar_timestamp (str): Znacznik czasu (ISO 8601) świecy, dla której liczono cechy.
+    """
+
+    ticker: str
+    interval: str
+    model_version: str
+    bar_timestamp: str
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+from backend.monitoring.instrumentation import recorder
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request) -> str:
+    """Zwraca pomiary etapów potoku (i liczniki cache predykcji) w formacie tekstowym Prometheusa."""
+    text = recorder.render_prometheus()
+
+    cache = getattr(request.app.state.prediction_service, "cache", None)
+    if cache is not None:
+        text += cache.render_prometheus()
+
+    return text
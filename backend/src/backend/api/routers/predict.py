@@ -0,0 +1,38 @@
+from fastapi import APIRouter, HTTPException, Request
+from backend.api.models.prediction import PredictRequest, PredictResponse, SignalResponse
+
+router = APIRouter()
+
+
+@router.post("/predict", response_model=PredictResponse)
+async def predict(body: PredictRequest, request: Request) -> PredictResponse:
+    """Zwraca klasę i prawdopodobieństwa dla jednego wiersza cech."""
+    service = request.app.state.prediction_service
+
+    try:
+        result = await service.predict(body.features)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return PredictResponse(**result)
+
+
+@router.get("/signal/{ticker}", response_model=SignalResponse)
+async def signal(ticker: str, request: Request, interval: str = "1d") -> SignalResponse:
+    """Zwraca sygnał dla ostatniej świecy tickera (z cache, jeśli ta świeca była już liczona)."""
+    service = request.app.state.prediction_service
+
+    if service.ohlcv_source is None:
+        raise HTTPException(status_code=503, detail="Serwis nie ma skonfigurowanego źródła świec.")
+
+    try:
+        result = await service.predict_ticker(ticker, interval)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return SignalResponse(**result)
+
+
+@router.get("/health")
+async def health() -> dict[str, str]:
+    return {"status": "ok"}
@@ -0,0 +1,114 @@
+import asyncio
+from typing import Any, Callable, Optional
+
+
+class MicroBatcher:
+    """
+    Zbiera równoległe zapytania w mikro-paczki i obsługuje je jednym wywołaniem funkcji wsadowej.
+
+    Pierwsze zapytanie w kolejce otwiera paczkę; kolejne są do niej dokładane, dopóki nie minie
+    `max_wait_ms` albo paczka nie osiągnie `max_batch_size`. Funkcja wsadowa działa w puli wątków,
+    więc nie blokuje pętli zdarzeń FastAPI.
+
+    ## Args:
+        :batch_fn (Callable[[list], list]): Funkcja przyjmująca listę wejść i zwracająca listę wyników tej samej długości.
+        :max_batch_size (int): Maksymalny rozmiar paczki (domyślnie 64).
+        :max_wait_ms (float): Maksymalny czas oczekiwania na dopełnienie paczki w milisekundach (domyślnie 5).
+
+    ## Methods:
+        :start():
+            Uruchamia pętlę obsługi paczek (wymaga działającej pętli asyncio).
+        :stop():
+            Zatrzymuje pętlę obsługi; zapytania jeszcze nieobsłużone kończą się RuntimeError.
+        :submit(item) -> Any:
+            Dodaje wejście do kolejki i czeka na jego wynik.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list], list],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: list[tuple[Any, asyncio.Future]] = []
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        # Zapytania z przerwanej paczki i z kolejki nie dostałyby już wyniku - kończymy je błędem,
+        # zamiast zostawiać czekające na zawsze.
+        pending, self._inflight = self._inflight, []
+        if self._queue is not None:
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            self._queue = None
+
+        error = RuntimeError("MicroBatcher został zatrzymany przed obsłużeniem zapytania.")
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    async def submit(self, item: Any) -> Any:
+        if self._queue is None:
+            raise RuntimeError("MicroBatcher nie został uruchomiony! Wywołaj najpierw .start().")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self, batch: list[tuple[Any, asyncio.Future]]) -> list[tuple[Any, asyncio.Future]]:
+        """Czeka na pierwsze zapytanie, a potem dobiera kolejne do `batch` do limitu czasu lub rozmiaru."""
+        loop = asyncio.get_running_loop()
+        batch.append(await self._queue.get())
+        deadline = loop.time() + self.max_wait_ms / 1000
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            # Paczka jest widoczna dla stop(), który po anulowaniu pętli kończy jej zapytania błędem.
+            self._inflight = []
+            batch = await self._collect(self._inflight)
+            items = [item for item, _ in batch]
+
+            try:
+                results = await loop.run_in_executor(None, self.batch_fn, items)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
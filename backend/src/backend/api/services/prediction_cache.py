@@ -0,0 +1,144 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, NamedTuple
+
+
+class PredictionKey(NamedTuple):
+    """
+    Klucz wyniku predykcji: ten sam ticker, interwał, model i ostatnia świeca dają tę samą odpowiedź.
+
+    ## Attributes:
+        :ticker (str): Symbol, np. 'AAPL'.
+        :interval (str): Interwał świec, np. '1h'.
+        :model_version (str): Wersja modelu, który policzył wynik.
+        :last_bar (Any): Znacznik czasu ostatniej świecy użytej do cech.
+    """
+
+    ticker: str
+    interval: str
+    model_version: str
+    last_bar: Any
+
+
+@dataclass
+class CacheStats:
+    """
+    Liczniki PredictionCache.
+
+    ## Attributes:
+        :hits (int): Odpowiedzi z cache.
+        :misses (int): Wyliczenia (wywołania funkcji liczącej).
+        :coalesced (int): Zapytania, które doczekały się wyniku wyliczenia już trwającego dla tego samego klucza.
+        :evictions (int): Wpisy usunięte przez limit rozmiaru.
+        :expirations (int): Wpisy usunięte po upływie TTL.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class PredictionCache:
+    """
+    Cache wyników predykcji z TTL, limitem rozmiaru (LRU) i single-flight.
+
+    Przy chybieniu wynik liczy dokładnie jedno zadanie na klucz - równoległe zapytania o ten
+    sam klucz czekają na nie zamiast liczyć cechy i predict_proba od nowa. Anulowanie
+    czekającego nie przerywa wyliczenia pozostałym. Błędy nie są zapamiętywane: kolejne
+    zapytanie liczy wynik ponownie. Cache żyje w jednej pętli asyncio (bez blokad).
+
+    ## Args:
+        :ttl_s (float): Czas życia wpisu w sekundach (domyślnie 60).
+        :max_entries (int): Maksymalna liczba wpisów; nadmiar usuwany od najdawniej używanego (domyślnie 1024).
+        :clock (Callable[[], float]): Źródło czasu (domyślnie time.monotonic).
+
+    ## Methods:
+        :get_or_compute(key, compute) -> Any:
+            Zwraca wynik z cache albo czeka na (jedno) wyliczenie `compute()`.
+        :clear():
+            Usuwa wszystkie wpisy (liczniki zostają).
+        :render_prometheus() -> str:
+            Liczniki i rozmiar cache w formacie tekstowym Prometheusa.
+    """
+
+    def __init__(self, ttl_s: float = 60.0, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        if ttl_s <= 0 or max_entries < 1:
+            raise ValueError("ttl_s i max_entries muszą być dodatnie.")
+
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: OrderedDict[PredictionKey, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[PredictionKey, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: PredictionKey) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: PredictionKey, task: asyncio.Future):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        self._entries[key] = (self.clock() + self.ttl_s, task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def get_or_compute(self, key: PredictionKey, compute: Callable[[], Awaitable[Any]]) -> Any:
+        found, value = self._lookup(key)
+        if found:
+            self.stats.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats.misses += 1
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._store(key, done))
+        else:
+            self.stats.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def clear(self):
+        self._entries.clear()
+
+    def render_prometheus(self) -> str:
+        lines = [
+            "# HELP musa_prediction_cache_requests_total Zapytania do cache predykcji wg wyniku.",
+            "# TYPE musa_prediction_cache_requests_total counter",
+        ]
+        for result in ("hits", "misses", "coalesced"):
+            lines.append(f'musa_prediction_cache_requests_total{{result="{result}"}} {getattr(self.stats, result)}')
+
+        lines += [
+            "# HELP musa_prediction_cache_removals_total Wpisy usunięte z cache predykcji wg powodu.",
+            "# TYPE musa_prediction_cache_removals_total counter",
+            f'musa_prediction_cache_removals_total{{reason="evicted"}} {self.stats.evictions}',
+            f'musa_prediction_cache_removals_total{{reason="expired"}} {self.stats.expirations}',
+            "# HELP musa_prediction_cache_entries Liczba wpisów w cache predykcji.",
+            "# TYPE musa_prediction_cache_entries gauge",
+            f"musa_prediction_cache_entries {len(self._entries)}",
+        ]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import numpy as np
+from typing import TYPE_CHECKING, Callable, Optional
+from backend.api.services.micro_batcher import MicroBatcher
+from backend.api.services.prediction_cache import PredictionCache, PredictionKey
+from backend.monitoring.instrumentation import instrumented
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+    from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+    from backend.ml.data.feature_scaler import FeatureScaler
+
+
+class PredictionService:
+    """
+    Serwis predykcji: model i skaler są wczytywane raz, a zapytania trafiają do mikro-paczek.
+
+    ## Args:
+        :model (MusaRandomForestTreeClassifier): Wytrenowany model.
+        :scaler (Optional[FeatureScaler]): Wytrenowany skaler cech; None oznacza brak skalowania.
+        :max_batch_size (int): Maksymalny rozmiar mikro-paczki (domyślnie 64).
+        :max_wait_ms (float): Maksymalny czas dopełniania mikro-paczki w milisekundach (domyślnie 5).
+        :cache (Optional[PredictionCache]): Cache sygnałów per (ticker, interval, wersja modelu, ostatnia świeca).
+            None wyłącza cache (domyślnie None).
+        :model_version (str): Wersja modelu w kluczu cache (domyślnie 'latest').
+        :ohlcv_source (Optional[Callable[[str, str], DataFrame]]): Źródło świec (ticker, interval) dla
+            predict_ticker, np. fetch_history z OhlcvCache. Wywoływane w wątku roboczym.
+
+    ## Methods:
+        :from_paths(model_path, scaler_path, ...) -> PredictionService:
+            Wczytuje model i skaler z dysku (.joblib albo katalog artefaktu z forest_artifact, mapowany przez mmap).
+        :predict_batch(rows) -> list[dict]:
+            Synchroniczna predykcja dla listy wierszy cech (jedno wywołanie predict_proba).
+        :predict(features) -> dict:
+            Asynchroniczna predykcja jednego wiersza przez mikro-paczki.
+        :predict_ohlcv(ticker, interval, ohlcv) -> dict:
+            Sygnał dla ostatniej świecy; powtórzone zapytania w tej samej świecy idą z cache.
+        :predict_ticker(ticker, interval) -> dict:
+            Jak predict_ohlcv, ze świecami z `ohlcv_source`.
+    """
+
+    def __init__(
+        self,
+        model: MusaRandomForestTreeClassifier,
+        scaler: Optional[FeatureScaler] = None,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        cache: Optional[PredictionCache] = None,
+        model_version: str = "latest",
+        ohlcv_source: Optional[Callable[[str, str], DataFrame]] = None,
+    ):
+        self.model = model
+        compiled = self.model.compile()
+        self.scaler = scaler
+        self.feature_columns = list(compiled.feature_names_in_) if compiled.feature_names_in_ is not None else []
+        self.classes = [int(c) for c in compiled.classes_]
+        self.batcher = MicroBatcher(self.predict_batch, max_batch_size, max_wait_ms)
+        self.cache = cache
+        self.model_version = model_version
+        self.ohlcv_source = ohlcv_source
+        self._ohlcv_fetches: dict[tuple[str, str], asyncio.Future] = {}
+
+    @classmethod
+    def from_paths(
+        cls,
+        model_path: str,
+        scaler_path: Optional[str] = None,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        cache: Optional[PredictionCache] = None,
+        model_version: str = "latest",
+        ohlcv_source: Optional[Callable[[str, str], DataFrame]] = None,
+    ):
+        # sklearn/joblib ładujemy dopiero przy wczytywaniu modelu, a nie przy imporcie modułu.
+        from backend.ml.architectures.forest_artifact import is_artifact, load_artifact
+        from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+        from backend.ml.data.feature_scaler import FeatureScaler
+
+        scaler = None
+        if is_artifact(model_path):
+            artifact = load_artifact(model_path)
+            model, scaler = artifact.model, artifact.scaler
+        else:
+            model = MusaRandomForestTreeClassifier.load(model_path)
+
+        if scaler_path is not None:
+            scaler = FeatureScaler()
+            scaler.load_scaler(scaler_path)
+
+        return cls(model, scaler, max_batch_size, max_wait_ms, cache, model_version, ohlcv_source)
+
+    @instrumented("api_predict_batch")
+    def predict_batch(self, rows: list[dict[str, float]]) -> list[dict]:
+        """Skleja wiersze w jeden DataFrame, skaluje i wywołuje predict_proba raz dla całej paczki."""
+        from pandas import DataFrame
+
+        columns = self.feature_columns or list(rows[0])
+        X = DataFrame(rows, columns=columns)
+
+        if X.isna().any().any():
+            missing = next(m for m in (self._missing_features(row, columns) for row in rows) if m)
+            raise ValueError(f"Brak wymaganych cech: {missing}")
+
+        if self.scaler is not None:
+            X = self.scaler.transform(X)
+
+        probabilities = self.model.predict_proba(X)
+        best = np.argmax(probabilities, axis=1)
+
+        return [
+            {
+                "prediction": self.classes[best[i]],
+                "probabilities": {str(c): float(p) for c, p in zip(self.classes, probabilities[i])},
+                "batch_size": len(rows),
+            }
+            for i in range(len(rows))
+        ]
+
+    async def predict(self, features: dict[str, float]) -> dict:
+        # Walidacja przed mikro-paczką: błąd jednego wiersza nie może wywrócić całej paczki innym zapytaniom.
+        missing = self._missing_features(features, self.feature_columns)
+        if missing:
+            raise ValueError(f"Brak wymaganych cech: {missing}")
+
+        return await self.batcher.submit(features)
+
+    async def predict_ohlcv(self, ticker: str, interval: str, ohlcv: DataFrame) -> dict:
+        """
+        Sygnał dla ostatniej świecy z `ohlcv`.
+
+        Kluczem cache jest (ticker, interval, model_version, znacznik ostatniej świecy), więc do
+        zamknięcia nowej świecy kolejne zapytania nie liczą cech, skalowania ani predict_proba.
+        """
+
+        if len(ohlcv) == 0:
+            raise ValueError(f"Brak świec dla {ticker} ({interval}).")
+
+        last_bar = ohlcv.index.max()
+
+        async def compute() -> dict:
+            features = await asyncio.to_thread(self._last_features, ohlcv)
+            result = await self.predict(features)
+            return {
+                **result,
+                "ticker": ticker,
+                "interval": interval,
+                "model_version": self.model_version,
+                "bar_timestamp": last_bar.isoformat(),
+            }
+
+        if self.cache is None:
+            return await compute()
+
+        key = PredictionKey(ticker, interval, self.model_version, last_bar)
+        return await self.cache.get_or_compute(key, compute)
+
+    async def predict_ticker(self, ticker: str, interval: str = "1d") -> dict:
+        if self.ohlcv_source is None:
+            raise RuntimeError("Serwis nie ma źródła świec (ohlcv_source).")
+
+        ohlcv = await self._fetch_ohlcv(ticker, interval)
+        return await self.predict_ohlcv(ticker, interval, ohlcv)
+
+    async def _fetch_ohlcv(self, ticker: str, interval: str) -> DataFrame:
+        """
+        Single-flight pobierania świec: równoległe zapytania o ten sam (ticker, interval) czekają na
+        jedno wywołanie `ohlcv_source`, zamiast pisać równolegle do tego samego wpisu cache świec.
+        """
+
+        key = (ticker, interval)
+        task = self._ohlcv_fetches.get(key)
+        if task is None:
+            task = asyncio.ensure_future(asyncio.to_thread(self.ohlcv_source, ticker, interval))
+            self._ohlcv_fetches[key] = task
+            task.add_done_callback(lambda _: self._ohlcv_fetches.pop(key, None))
+
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _missing_features(row: dict[str, float], columns: list[str]) -> list[str]:
+        """Cechy z `columns`, których w wierszu brakuje albo mają wartość pustą (None/NaN)."""
+        return sorted(c for c in columns if row.get(c) is None or row[c] != row[c])
+
+    @staticmethod
+    def _last_features(ohlcv: DataFrame) -> dict[str, float]:
+        """Cechy ostatniej świecy (liczone na całej historii - wskaźniki EMA/Wildera zależą od niej)."""
+        from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
+
+        features = map_ohlcv_to_features(ohlcv)
+        if features.empty or features.index[-1] != ohlcv.index.max():
+            raise ValueError("Za mało świec, żeby policzyć cechy ostatniej świecy.")
+
+        return features.iloc[-1].to_dict()
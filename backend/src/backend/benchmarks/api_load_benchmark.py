@@ -0,0 +1,77 @@
+import asyncio
+import time
+import httpx
+import numpy as np
+import pandas as pd
+
+from backend.api.app import create_app
+from backend.api.services.prediction_service import PredictionService
+from backend.benchmarks.synthetic import generate_ohlcv
+from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+from backend.ml.data.create_target import create_market_target
+from backend.ml.data.feature_scaler import FeatureScaler
+from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
+
+
+def _build_service(max_batch_size: int, max_wait_ms: float) -> tuple[PredictionService, list[dict]]:
+    """Trenuje model na syntetycznych danych i zwraca serwis oraz przykładowe wiersze cech."""
+    df = generate_ohlcv(5_000)
+    dataset = pd.concat([map_ohlcv_to_features(df), create_market_target(df)], axis=1).dropna()
+    X, y = dataset.drop(columns="target"), dataset["target"]
+
+    scaler = FeatureScaler()
+    X_scaled = scaler.fit_transform(X, list(X.columns))
+    model = MusaRandomForestTreeClassifier()
+    model.train(X_scaled, y)
+
+    rows = X.tail(256).to_dict(orient="records")
+    return PredictionService(model, scaler, max_batch_size, max_wait_ms), rows
+
+
+async def _load_test(service: PredictionService, rows: list[dict], clients: int, requests_per_client: int) -> dict[str, float]:
+    app = create_app(service)
+    latencies = []
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def worker(worker_id: int):
+                for i in range(requests_per_client):
+                    row = rows[(worker_id + i) % len(rows)]
+                    start = time.perf_counter()
+                    response = await client.post("/predict", json={"features": row})
+                    latencies.append(time.perf_counter() - start)
+                    response.raise_for_status()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker(w) for w in range(clients)))
+            elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "throughput_rps": len(latencies) / elapsed,
+    }
+
+
+def run_api_load_benchmark(clients: int = 64, requests_per_client: int = 20, max_wait_ms: float = 5.0) -> dict[str, dict[str, float]]:
+    """
+    Lokalny test obciążeniowy /predict (w procesie, przez ASGITransport, bez sieci).
+    Porównuje obsługę pojedynczą (paczka = 1) z mikro-paczkami.
+
+    Returns:
+        dict[str, dict[str, float]]: p50/p99 w milisekundach i przepustowość dla obu wariantów.
+    """
+
+    results = {}
+    for name, batch_size, wait_ms in [("single", 1, 0.0), ("micro_batch", 64, max_wait_ms)]:
+        service, rows = _build_service(batch_size, wait_ms)
+        results[name] = asyncio.run(_load_test(service, rows, clients, requests_per_client))
+
+    return results
+
+
+if __name__ == "__main__":
+    print(run_api_load_benchmark())
@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import backend
+from backend.benchmarks.synthetic import generate_ohlcv
+from backend.ml.data.fetchers.ohlcv_cache import OhlcvCache
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(backend.__file__)))
+
+# Świeży interpreter na każdy tryb: szczyt RSS procesu (i procesów roboczych) dotyczy tylko tego przebiegu.
+_PROBE = """
+import json, resource, sys, time
+from backend.ml.data.chunked import iter_chunks
+from backend.ml.data.create_target import create_market_target
+from backend.ml.data.fetchers.ohlcv_cache import OhlcvCache
+from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
+
+mode, root, chunk_size, max_workers = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+df = OhlcvCache(root).read("SYN", "1m")
+
+start = time.perf_counter()
+if mode == "full":
+    rows = len(map_ohlcv_to_features(df).join(create_market_target(df)).dropna())
+else:
+    rows = sum(len(f.join(t).dropna()) for f, t in iter_chunks(df, chunk_size, max_workers=max_workers))
+elapsed = time.perf_counter() - start
+
+print(json.dumps({
+    "time_s": elapsed,
+    "rows": rows,
+    "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "worker_peak_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+}))
+"""
+
+
+def _probe(mode: str, root: str, chunk_size: int, max_workers: int) -> dict[str, float]:
+    env = {**os.environ, "PYTHONPATH": SRC_DIR}
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, mode, root, str(chunk_size), str(max_workers)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_chunked_features_benchmark(
+    periods: int = 2_000_000,
+    chunk_size: int = 250_000,
+    max_workers: int = 4,
+) -> dict[str, dict[str, float]]:
+    """
+    Porównuje cechy + target liczone całością w pamięci z trybem kawałkowym (iter_chunks, wynik strumieniowany).
+
+    Świece minutowe leżą w OhlcvCache (mmap), a każdy tryb działa w osobnym procesie.
+
+    Returns:
+        dict[str, dict[str, float]]: Dla 'full' i 'chunked': czas, liczba wierszy, szczyt RSS procesu
+            głównego i procesów roboczych w MB; oraz przyspieszenie.
+    """
+
+    with tempfile.TemporaryDirectory() as root:
+        OhlcvCache(root).write("SYN", "1m", generate_ohlcv(periods, freq="min"), coverage="benchmark")
+
+        results = {
+            "full": _probe("full", root, chunk_size, max_workers),
+            "chunked": _probe("chunked", root, chunk_size, max_workers),
+        }
+
+    if results["full"]["rows"] != results["chunked"]["rows"]:
+        raise AssertionError("Tryb kawałkowy dał inną liczbę wierszy niż pełny przebieg.")
+
+    results["speedup"] = results["full"]["time_s"] / results["chunked"]["time_s"]
+    return results
+
+
+if __name__ == "__main__":
+    for name, result in run_chunked_features_benchmark().items():
+        print(name, result)
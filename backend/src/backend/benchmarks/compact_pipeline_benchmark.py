@@ -0,0 +1,50 @@
+import time
+import tracemalloc
+from typing import Callable
+
+from backend.benchmarks.synthetic import generate_ohlcv
+from backend.ml.data.dataset import build_dataset
+from backend.ml.data.feature_scaler import FeatureScaler
+
+
+def _measure(fn: Callable[[], object]) -> dict[str, float]:
+    """Zwraca czas i szczytowe zużycie pamięci (tracemalloc śledzi też bufory NumPy)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"time_s": elapsed, "peak_mb": peak / 2**20}
+
+
+def run_compact_pipeline_benchmark(periods: int = 2_000_000) -> dict[str, dict[str, float]]:
+    """
+    Porównuje szczyt pamięci ścieżki cechy -> target -> zbiór -> skalowanie
+    w trybie domyślnym (DataFrame float64) i kompaktowym (float32/int8, skalowanie inplace).
+
+    Returns:
+        dict[str, dict[str, float]]: Czas i szczyt pamięci w MB dla obu trybów.
+    """
+
+    df = generate_ohlcv(periods, freq="min")
+
+    def default_pipeline():
+        dataset = build_dataset(df)
+        X = dataset.drop(columns="target")
+        return FeatureScaler().fit_transform(X, list(X.columns)), dataset["target"]
+
+    def compact_pipeline():
+        dataset = build_dataset(df, compact=True)
+        X = dataset.to_frame()
+        return FeatureScaler().fit_transform(X, dataset.columns, inplace=True), dataset.y
+
+    return {
+        "default": _measure(default_pipeline),
+        "compact": _measure(compact_pipeline),
+    }
+
+
+if __name__ == "__main__":
+    print(run_compact_pipeline_benchmark())
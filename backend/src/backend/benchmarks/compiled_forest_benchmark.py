@@ -0,0 +1,54 @@
+import time
+import numpy as np
+import pandas as pd
+
+from backend.benchmarks.synthetic import generate_ohlcv
+from backend.ml.architectures.compiled_forest import CompiledForest
+from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+from backend.ml.data.create_target import create_market_target
+from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
+
+
+def _time_per_call(fn, repeats: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def run_compiled_forest_benchmark(batch_sizes: tuple[int, ...] = (1, 8, 64, 1024), repeats: int = 50) -> dict[int, dict[str, float]]:
+    """
+    Porównuje czas predict_proba: RandomForestClassifier ze sklearn vs CompiledForest.
+
+    Returns:
+        dict[int, dict[str, float]]: Dla każdego rozmiaru paczki czas wywołania w ms (sklearn, compiled) i przyspieszenie.
+    """
+
+    df = generate_ohlcv(20_000)
+    dataset = pd.concat([map_ohlcv_to_features(df), create_market_target(df)], axis=1).dropna()
+    X, y = dataset.drop(columns="target"), dataset["target"]
+
+    model = MusaRandomForestTreeClassifier()
+    model.train(X, y)
+    compiled = CompiledForest(model.model)
+
+    results = {}
+    for batch_size in batch_sizes:
+        batch = X.tail(batch_size)
+        np.testing.assert_allclose(compiled.predict_proba(batch), model.predict_proba(batch), rtol=1e-12, atol=1e-15)
+
+        sklearn_s = _time_per_call(lambda: model.predict_proba(batch), repeats)
+        compiled_s = _time_per_call(lambda: compiled.predict_proba(batch), repeats)
+        results[batch_size] = {
+            "sklearn_ms": sklearn_s * 1000,
+            "compiled_ms": compiled_s * 1000,
+            "speedup": sklearn_s / compiled_s,
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    for batch_size, result in run_compiled_forest_benchmark().items():
+        print(batch_size, result)
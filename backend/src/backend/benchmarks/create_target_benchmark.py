@@ -0,0 +1,36 @@
+import time
+
+from backend.benchmarks.synthetic import generate_ohlcv
+from backend.ml.data.create_target import create_market_target
+
+
+def run_create_target_benchmark(periods: int = 200_000, window: int = 5) -> dict[str, float]:
+    """
+    Porównuje czas etykietowania Triple Barrier: pętla referencyjna vs silnik wektorowy.
+
+    Returns:
+        dict[str, float]: Czasy w sekundach dla obu silników oraz przyspieszenie.
+    """
+
+    df = generate_ohlcv(periods)
+
+    start = time.perf_counter()
+    expected = create_market_target(df, window=window, engine="loop")
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = create_market_target(df, window=window, engine="vectorized")
+    vectorized_time = time.perf_counter() - start
+
+    if not result.equals(expected):
+        raise AssertionError("Silnik wektorowy zwrócił inne etykiety niż pętla!")
+
+    return {
+        "loop_s": loop_time,
+        "vectorized_s": vectorized_time,
+        "speedup": loop_time / vectorized_time,
+    }
+
+
+if __name__ == "__main__":
+    print(run_create_target_benchmark())
@@ -0,0 +1,51 @@
+import time
+
+from backend.benchmarks.synthetic import generate_ohlcv
+from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+from backend.ml.data.dataset import build_dataset
+from backend.ml.data.event_sampling import cusum_events, volatility_threshold
+
+
+def run_event_sampling_benchmark(periods: int = 200_000, freq: str = "min", multiplier: float = 5.0) -> dict[str, float]:
+    """
+    Porównuje trening na wszystkich świecach z treningiem tylko na zdarzeniach CUSUM.
+
+    Args:
+        periods (int): Liczba świec syntetycznych.
+        freq (str): Częstotliwość świec, np. 'min'.
+        multiplier (float): Próg CUSUM w odchyleniach standardowych log-zwrotów (volatility_threshold).
+
+    Returns:
+        dict[str, float]: Liczby wierszy, redukcja, czas filtra CUSUM, czasy treningu i przyspieszenie.
+    """
+
+    df = generate_ohlcv(periods, freq=freq)
+
+    start = time.perf_counter()
+    events = cusum_events(df, volatility_threshold(df, multiplier=multiplier))
+    cusum_time = time.perf_counter() - start
+
+    full = build_dataset(df)
+    sampled = build_dataset(df, events=events)
+
+    timings = {}
+    for name, dataset in [("full", full), ("events", sampled)]:
+        model = MusaRandomForestTreeClassifier()
+        start = time.perf_counter()
+        model.train(dataset.drop(columns="target"), dataset["target"])
+        timings[name] = time.perf_counter() - start
+
+    return {
+        "bars": len(df),
+        "full_rows": len(full),
+        "event_rows": len(sampled),
+        "row_reduction": 1 - len(sampled) / len(full),
+        "cusum_s": cusum_time,
+        "train_full_s": timings["full"],
+        "train_events_s": timings["events"],
+        "train_speedup": timings["full"] / timings["events"],
+    }
+
+
+if __name__ == "__main__":
+    print(run_event_sampling_benchmark())
@@ -0,0 +1,101 @@
+import time
+
+import numpy as np
+from pandas import DataFrame
+from ta.momentum import rsi
+from ta.trend import macd, macd_diff
+from ta.volatility import average_true_range
+
+from backend.benchmarks.synthetic import generate_ohlcv
+from backend.ml.data.mappers.feature_graph import OHLCV_GRAPH
+from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
+
+# Kolejność dokładania cech - każda kolejna dzieli część etapów pośrednich z poprzednimi.
+FEATURE_ORDER = [
+    "macd",
+    "macd_hist",
+    "macd_signal",
+    "rsi",
+    "log_returns",
+    "true_range",
+    "atr",
+    "ema_fast",
+    "ema_slow",
+    "hour_sin",
+    "hour_cos",
+    "day_sin",
+    "day_cos",
+]
+
+
+def run_feature_graph_benchmark(periods: int = 200_000, repeat: int = 3) -> DataFrame:
+    """
+    Porównuje liczenie k cech niezależnie (każda od zera, jak osobne wywołania `ta`)
+    z jednym przejściem po grafie, gdzie wspólne etapy są liczone raz.
+
+    Returns:
+        DataFrame: Dla każdego k: czas niezależny, czas grafu i przyspieszenie (najlepszy z `repeat`).
+    """
+
+    df = generate_ohlcv(periods, market_hours=True)
+    rows = []
+
+    for k in range(1, len(FEATURE_ORDER) + 1):
+        outputs = FEATURE_ORDER[:k]
+
+        isolated, shared = float("inf"), float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for name in outputs:
+                OHLCV_GRAPH.compute(df, [name])
+            isolated = min(isolated, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            OHLCV_GRAPH.compute(df, outputs)
+            shared = min(shared, time.perf_counter() - start)
+
+        rows.append({"features": k, "isolated_s": isolated, "graph_s": shared, "speedup": isolated / shared})
+
+    return DataFrame(rows)
+
+
+def _ta_features(df: DataFrame) -> DataFrame:
+    """Poprzednia wersja map_ohlcv_to_features: każdy wskaźnik z `ta` liczy swoje etapy od zera."""
+    X = DataFrame(index=df.index)
+    X["log_returns"] = np.log(df["Close"] / df["Close"].shift(1))
+    X["rsi"] = rsi(close=df["Close"], window=14)
+    X["macd"] = macd(close=df["Close"])
+    X["macd_hist"] = macd_diff(close=df["Close"])
+    X["atr"] = average_true_range(high=df["High"], low=df["Low"], close=df["Close"], window=14)
+
+    hour = 2 * np.pi * df.index.hour / 24
+    X["hour_sin"] = np.sin(hour)
+    X["hour_cos"] = np.cos(hour)
+    day_of_week = 2 * np.pi * df.index.dayofweek / 7
+    X["day_sin"] = np.sin(day_of_week)
+    X["day_cos"] = np.cos(day_of_week)
+
+    return X.dropna()
+
+
+def run_mapper_vs_ta_benchmark(periods: int = 200_000) -> dict[str, float]:
+    """Czas map_ohlcv_to_features na grafie vs poprzednia wersja oparta o `ta` (wyniki muszą być identyczne)."""
+    df = generate_ohlcv(periods, market_hours=True)
+
+    start = time.perf_counter()
+    expected = _ta_features(df)
+    ta_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = map_ohlcv_to_features(df)
+    graph_time = time.perf_counter() - start
+
+    if not result.equals(expected):
+        raise AssertionError("Graf cech zwrócił inne wartości niż `ta`!")
+
+    return {"ta_s": ta_time, "graph_s": graph_time, "speedup": ta_time / graph_time}
+
+
+if __name__ == "__main__":
+    print(run_mapper_vs_ta_benchmark())
+    print(run_feature_graph_benchmark().to_string(index=False))
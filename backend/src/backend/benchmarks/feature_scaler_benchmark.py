@@ -0,0 +1,57 @@
+import time
+import numpy as np
+import pandas as pd
+
+from backend.ml.data.feature_scaler import FeatureScaler
+
+
+def _best_time(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_feature_scaler_benchmark(rows: tuple[int, ...] = (1, 1_000_000), n_features: int = 9, chunk_size: int = 100_000) -> dict[int | str, dict[str, float]]:
+    """
+    Porównuje FeatureScaler: fit_transform vs fit_chunks oraz transform (DataFrame) vs transform_array.
+
+    Returns:
+        dict[int | str, dict[str, float]]: Najlepsze czasy w ms dla każdej liczby wierszy oraz dla dopasowania ('fit').
+    """
+
+    rng = np.random.default_rng(0)
+    columns = [f"f{i}" for i in range(n_features)]
+    train = pd.DataFrame(rng.normal(size=(max(rows), n_features)), columns=columns)
+
+    def chunks():
+        return (train.iloc[i : i + chunk_size] for i in range(0, len(train), chunk_size))
+
+    results = {}
+    for n_rows in rows:
+        df = train.iloc[:n_rows]
+        X = df.to_numpy()
+        repeats = 200 if n_rows < 1_000 else 5
+
+        scaler = FeatureScaler()
+        scaler.fit_transform(train, columns)
+        np.testing.assert_allclose(scaler.transform_array(X), scaler.transform(df).to_numpy(), rtol=1e-12, atol=1e-12)
+
+        results[n_rows] = {
+            "transform_ms": _best_time(lambda: scaler.transform(df), repeats) * 1000,
+            "transform_array_ms": _best_time(lambda: scaler.transform_array(X), repeats) * 1000,
+        }
+
+    results["fit"] = {
+        "fit_transform_ms": _best_time(lambda: FeatureScaler().fit_transform(train, columns), 3) * 1000,
+        "fit_chunks_ms": _best_time(lambda: FeatureScaler().fit_chunks(chunks(), columns), 3) * 1000,
+    }
+
+    return results
+
+
+if __name__ == "__main__":
+    for key, result in run_feature_scaler_benchmark().items():
+        print(key, result)
@@ -0,0 +1,47 @@
+import time
+from typing import Optional
+
+from backend.benchmarks.synthetic import generate_ohlcv
+from backend.ml.data.fetchers.ohlcv_cache import OhlcvCache
+from backend.ml.data.fetchers.yahoo_fetcher import fetch_history_many
+
+
+def run_fetch_many_benchmark(
+    n_tickers: int = 100, latency_s: float = 0.02, max_workers: int = 16
+) -> dict[str, float]:
+    """
+    Mierzy przepustowość fetch_history_many na lokalnym, sztucznym źródle danych
+    (stałe opóźnienie `latency_s` imituje sieć). Porównuje pobieranie sekwencyjne z pulą wątków.
+
+    Returns:
+        dict[str, float]: Czasy w sekundach oraz liczba tickerów na sekundę dla obu wariantów.
+    """
+
+    bars = generate_ohlcv(1_000, freq="D")
+
+    def fake_fetch(
+        ticker: str,
+        interval: str = "1d",
+        start_date: Optional[str] = None,
+        period: str = "max",
+        cache: Optional[OhlcvCache] = None,
+    ):
+        time.sleep(latency_s)
+        return bars
+
+    tickers = [f"T{i:04d}" for i in range(n_tickers)]
+    results = {}
+
+    for name, workers in [("sequential", 1), ("pool", max_workers)]:
+        start = time.perf_counter()
+        fetched = sum(r.ok for r in fetch_history_many(tickers, max_workers=workers, fetch_fn=fake_fetch))
+        elapsed = time.perf_counter() - start
+
+        results[f"{name}_s"] = elapsed
+        results[f"{name}_tickers_per_s"] = fetched / elapsed
+
+    return results
+
+
+if __name__ == "__main__":
+    print(run_fetch_many_benchmark())
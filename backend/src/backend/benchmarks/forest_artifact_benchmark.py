@@ -0,0 +1,102 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import pandas as pd
+
+import backend
+from backend.benchmarks.synthetic import generate_ohlcv
+from backend.ml.architectures.forest_artifact import save_artifact
+from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+from backend.ml.data.create_target import create_market_target
+from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(backend.__file__)))
+
+# Świeży interpreter: importy zanim zaczniemy mierzyć, potem wczytanie modelu i jedna predykcja.
+# RssAnon to prywatna pamięć procesu, RssFile - strony plików współdzielone przez page cache.
+_PROBE = """
+import json, sys, time
+from backend.ml.architectures.forest_artifact import load_artifact
+from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+
+def rss():
+    with open("/proc/self/status") as f:
+        fields = dict(line.split(":", 1) for line in f)
+    return {key: int(fields[key].split()[0]) / 1024 for key in ("VmRSS", "RssAnon", "RssFile")}
+
+fmt, path, n_features = sys.argv[1], sys.argv[2], int(sys.argv[3])
+before = rss()
+start = time.perf_counter()
+model = load_artifact(path).model if fmt == "mmap" else MusaRandomForestTreeClassifier.load(path)
+load_s = time.perf_counter() - start
+model.compile()
+model.predict_proba([[0.0] * n_features])
+after = rss()
+print(json.dumps({"load_ms": load_s * 1000, **{key + "_mb": after[key] - before[key] for key in before}}))
+"""
+
+
+def _probe(fmt: str, path: str, n_features: int) -> dict[str, float]:
+    env = {**os.environ, "PYTHONPATH": SRC_DIR}
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, fmt, path, str(n_features)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _size_bytes(path: str) -> int:
+    if os.path.isdir(path):
+        return sum(entry.stat().st_size for entry in os.scandir(path))
+    return os.path.getsize(path)
+
+
+def run_forest_artifact_benchmark(periods: int = 20_000, repeats: int = 3) -> dict[str, dict[str, float]]:
+    """
+    Porównuje format .joblib (model.save) z artefaktem tablicowym (save_artifact, wczytanie przez mmap).
+
+    Każdy pomiar to osobny, świeży proces (zimne wczytanie jak w nowym workerze API): czas
+    wczytania oraz przyrost RSS po wczytaniu i pierwszej predykcji, rozbity na pamięć prywatną
+    (RssAnon) i strony plików (RssFile, współdzielone między procesami).
+
+    Returns:
+        dict[str, dict[str, float]]: Dla formatu 'joblib' i 'mmap': rozmiar na dysku, mediana czasu
+            wczytania w ms i przyrosty RSS w MB.
+    """
+
+    df = generate_ohlcv(periods)
+    dataset = pd.concat([map_ohlcv_to_features(df), create_market_target(df)], axis=1).dropna()
+    X, y = dataset.drop(columns="target"), dataset["target"]
+
+    model = MusaRandomForestTreeClassifier()
+    model.train(X, y)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"joblib": os.path.join(tmp, "model.joblib"), "mmap": os.path.join(tmp, "forest")}
+        model.save(paths["joblib"])
+        save_artifact(model, paths["mmap"])
+
+        for fmt, path in paths.items():
+            runs = sorted((_probe(fmt, path, X.shape[1]) for _ in range(repeats)), key=lambda r: r["load_ms"])
+            median = runs[len(runs) // 2]
+            results[fmt] = {
+                "file_mb": _size_bytes(path) / 2**20,
+                "load_ms": median["load_ms"],
+                "rss_mb": median["VmRSS_mb"],
+                "rss_anon_mb": median["RssAnon_mb"],
+                "rss_file_mb": median["RssFile_mb"],
+            }
+
+    results["load_speedup"] = results["joblib"]["load_ms"] / results["mmap"]["load_ms"]
+    return results
+
+
+if __name__ == "__main__":
+    for name, result in run_forest_artifact_benchmark().items():
+        print(name, result)
@@ -0,0 +1,60 @@
+import time
+import numpy as np
+
+from backend.benchmarks.synthetic import generate_ohlcv
+from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+from backend.ml.data.dataset import build_dataset
+
+
+def run_incremental_training_benchmark(
+    periods: int = 120_000,
+    new_bars: int = 1_440,
+    recent_bars: int = 10_080,
+    n_new_trees: int = 10,
+) -> dict[str, float]:
+    """
+    Porównuje dzienny retrening: pełny train() na całej historii vs update() na świeżym oknie.
+
+    Args:
+        periods (int): Liczba świec minutowych w historii (łącznie z nowym dniem).
+        new_bars (int): Liczba nowych świec od ostatniego treningu (domyślnie jeden dzień).
+        recent_bars (int): Długość okna, na którym dorastają nowe drzewa (domyślnie tydzień).
+        n_new_trees (int): Liczba drzew dorastanych (i wycofywanych) w aktualizacji.
+
+    Returns:
+        dict[str, float]: Liczby wierszy, czasy pełnego treningu i aktualizacji, przyspieszenie
+            oraz trafność obu modeli na świecach po nowym dniu.
+    """
+
+    dataset = build_dataset(generate_ohlcv(periods + new_bars, freq="min"))
+    X, y = dataset.drop(columns="target"), dataset["target"]
+    holdout = len(X) - new_bars
+    history = holdout - new_bars
+
+    base = MusaRandomForestTreeClassifier()
+    base.train(X.iloc[:history], y.iloc[:history])
+
+    full = MusaRandomForestTreeClassifier()
+    start = time.perf_counter()
+    full.train(X.iloc[:holdout], y.iloc[:holdout])
+    full_s = time.perf_counter() - start
+
+    window = slice(holdout - recent_bars, holdout)
+    start = time.perf_counter()
+    base.update(X.iloc[window], y.iloc[window], n_new_trees=n_new_trees)
+    update_s = time.perf_counter() - start
+
+    X_test, y_test = X.iloc[holdout:], y.iloc[holdout:].to_numpy()
+    return {
+        "history_rows": holdout,
+        "update_rows": recent_bars,
+        "full_refit_s": full_s,
+        "incremental_update_s": update_s,
+        "speedup": full_s / update_s,
+        "full_refit_accuracy": float(np.mean(full.predict(X_test) == y_test)),
+        "incremental_accuracy": float(np.mean(base.predict(X_test) == y_test)),
+    }
+
+
+if __name__ == "__main__":
+    print(run_incremental_training_benchmark())
@@ -0,0 +1,192 @@
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import sklearn
+from pandas import DataFrame
+
+from backend.benchmarks.synthetic import generate_ohlcv
+from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+from backend.ml.data.create_target import create_market_target
+from backend.ml.data.feature_scaler import FeatureScaler
+from backend.ml.data.fetchers.yahoo_fetcher import fetch_history
+from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
+
+STAGES = ["fetch_stub", "features", "target", "concat_dropna", "scale", "train", "predict"]
+
+
+def _run_stage(fn: Callable[[], Any], track_memory: bool) -> tuple[Any, float, Optional[float]]:
+    """Uruchamia etap i zwraca (wynik, czas w s, szczyt pamięci w MB lub None)."""
+    if track_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+
+    peak_mb = None
+    if track_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = peak / 2**20
+
+    return result, elapsed, peak_mb
+
+
+def _environment() -> dict[str, str]:
+    """Metadane uruchomienia, żeby dało się porównać wyniki dwóch commitów."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def run_pipeline_suite(
+    sizes: tuple[int, ...] = (1_000, 100_000, 1_000_000),
+    freq: str = "h",
+    market_hours: bool = False,
+    max_train_rows: int = 200_000,
+    track_memory: bool = True,
+    output_path: Optional[str] = None,
+) -> dict:
+    """
+    Mierzy czas (i szczyt pamięci) każdego etapu potoku ML na syntetycznych danych, bez sieci.
+
+    Etapy: fetch_stub (fetch_history na podstawionym yf.download), features, target,
+    concat_dropna, scale, train, predict. Trening i predykcja używają co najwyżej
+    `max_train_rows` ostatnich wierszy, żeby duże rozmiary nie trenowały lasu godzinami.
+    tracemalloc spowalnia kod czysto pythonowy, więc czasy z track_memory=True są porównywalne
+    tylko z innymi wynikami zebranymi z tą samą flagą.
+
+    Args:
+        sizes (tuple[int, ...]): Liczby świec do przetestowania (np. od 1k do 10M).
+        freq (str): Częstotliwość świec, np. 'D', 'h', 'min'.
+        market_hours (bool): Indeks intraday tylko w godzinach sesji.
+        max_train_rows (int): Limit wierszy dla etapów train/predict.
+        track_memory (bool): Czy mierzyć szczyt pamięci przez tracemalloc.
+        output_path (Optional[str]): Ścieżka pliku JSON z wynikami.
+
+    Returns:
+        dict: {"environment": {...}, "config": {...}, "results": [{size, stage, rows, time_s, peak_mb}, ...]}
+    """
+
+    results = []
+
+    for size in sizes:
+        raw = generate_ohlcv(size, freq=freq, market_hours=market_hours)
+
+        def record(stage: str, fn: Callable[[], Any], rows: int) -> Any:
+            value, elapsed, peak_mb = _run_stage(fn, track_memory)
+            results.append({"size": size, "stage": stage, "rows": rows, "time_s": elapsed, "peak_mb": peak_mb})
+            return value
+
+        with patch("backend.ml.data.fetchers.yahoo_fetcher.yf.download", return_value=raw):
+            df = record("fetch_stub", lambda: fetch_history("SYNTH", interval=freq), size)
+
+        features = record("features", lambda: map_ohlcv_to_features(df), len(df))
+        target = record("target", lambda: create_market_target(df), len(df))
+        dataset = record("concat_dropna", lambda: pd.concat([features, target], axis=1).dropna(), len(features))
+
+        X, y = dataset.drop(columns="target"), dataset["target"]
+        scaler = FeatureScaler()
+        X_scaled = record("scale", lambda: scaler.fit_transform(X, list(X.columns)), len(X))
+
+        X_train, y_train = X_scaled.tail(max_train_rows), y.tail(max_train_rows)
+        model = MusaRandomForestTreeClassifier()
+        record("train", lambda: model.train(X_train, y_train), len(X_train))
+        record("predict", lambda: model.predict_proba(X_train), len(X_train))
+
+    report = {
+        "environment": _environment(),
+        "config": {
+            "sizes": list(sizes),
+            "freq": freq,
+            "market_hours": market_hours,
+            "max_train_rows": max_train_rows,
+            "track_memory": track_memory,
+        },
+        "results": results,
+    }
+
+    if output_path is not None:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    return report
+
+
+def compare_results(base_path: str, new_path: str) -> DataFrame:
+    """
+    Porównuje dwa pliki JSON z run_pipeline_suite (np. z dwóch commitów).
+
+    Returns:
+        DataFrame: Dla każdej pary (size, stage) czasy i pamięć obu przebiegów oraz ich stosunek (new / base).
+    """
+
+    frames = []
+    for label, path in [("base", base_path), ("new", new_path)]:
+        with open(path, "r", encoding="utf-8") as f:
+            frame = DataFrame(json.load(f)["results"]).set_index(["size", "stage"])
+        frames.append(frame[["time_s", "peak_mb"]].add_prefix(f"{label}_"))
+
+    comparison = pd.concat(frames, axis=1, join="inner")
+    comparison["time_ratio"] = comparison["new_time_s"] / comparison["base_time_s"]
+    comparison["peak_ratio"] = comparison["new_peak_mb"] / comparison["base_peak_mb"]
+
+    return comparison
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark potoku ML na syntetycznych danych OHLCV.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Uruchamia benchmark i zapisuje wyniki do JSON.")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    run_parser.add_argument("--freq", default="h")
+    run_parser.add_argument("--market-hours", action="store_true")
+    run_parser.add_argument("--max-train-rows", type=int, default=200_000)
+    run_parser.add_argument("--no-memory", action="store_true", help="Wyłącza pomiar pamięci (tracemalloc).")
+    run_parser.add_argument("--output", default="bench_results.json")
+
+    compare_parser = subparsers.add_parser("compare", help="Porównuje dwa pliki wyników.")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_pipeline_suite(
+            sizes=tuple(args.sizes),
+            freq=args.freq,
+            market_hours=args.market_hours,
+            max_train_rows=args.max_train_rows,
+            track_memory=not args.no_memory,
+            output_path=args.output,
+        )
+        print(DataFrame(report["results"]).to_string(index=False))
+    else:
+        print(compare_results(args.base, args.new).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
+
+# Domyślny początek szeregu. Dłuższe szeregi są odliczane wstecz od END, żeby zmieściły się w datetime64[ns].
+START = pd.Timestamp("2000-01-03")
+END = pd.Timestamp("2262-01-01")
+
+
+def generate_ohlcv(
+    periods: int, freq: str = "h", seed: int = 42, market_hours: bool = False
+) -> DataFrame:
+    """
+    Generuje deterministyczny, syntetyczny szereg OHLCV (błądzenie losowe w skali logarytmicznej).
+
+    Args:
+        periods (int): Liczba świec.
+        freq (str): Częstotliwość indeksu Datetime, np. 'D', 'h', 'min'.
+        seed (int): Ziarno generatora losowego.
+        market_hours (bool): Indeks intraday tylko w dni robocze, w godzinach sesji 09:30-16:00
+            (America/New_York), jak dla akcji z yfinance. Dla False indeks jest ciągły.
+
+    Returns:
+        DataFrame: Kolumny [Open, High, Low, Close, Volume] z indeksem Datetime.
+
+    Raises:
+        ValueError: Gdy `periods` świec o częstotliwości `freq` nie mieści się w zakresie datetime64[ns]
+            (ok. 584 lata, np. powyżej ~213 tys. świec dziennych).
+    """
+
+    index = _market_hours_index(periods, freq) if market_hours else _continuous_index(periods, freq)
+    rng = np.random.default_rng(seed)
+
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    open_ = np.empty(periods)
+    open_[0] = close[0]
+    open_[1:] = close[:-1]
+
+    spread = np.abs(rng.normal(0, 0.005, periods))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    volume = rng.integers(1_000, 100_000, periods).astype(np.float64)
+
+    return DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=index,
+    )
+
+
+def _continuous_index(periods: int, freq: str) -> pd.DatetimeIndex:
+    """Ciągły indeks od START; gdy szereg wyszedłby poza END, kończy się na END."""
+    offset = to_offset(freq)
+    if not isinstance(offset, Tick):
+        try:
+            return pd.date_range(START, periods=periods, freq=offset)
+        except (OverflowError, pd.errors.OutOfBoundsDatetime, pd.errors.OutOfBoundsTimedelta) as e:
+            raise ValueError(f"{periods} świec o częstotliwości {freq} nie mieści się w zakresie datetime64[ns].") from e
+
+    # Rachunek na int (nanosekundy), bo sama długość szeregu może przekraczać zakres Timedelta.
+    latest_start = END.value - offset.nanos * max(periods - 1, 0)
+    if latest_start < pd.Timestamp.min.ceil("D").value:
+        raise ValueError(f"{periods} świec o częstotliwości {freq} nie mieści się w zakresie datetime64[ns].")
+
+    return pd.date_range(min(START, pd.Timestamp(latest_start)), periods=periods, freq=offset)
+
+
+def _market_hours_index(periods: int, freq: str) -> pd.DatetimeIndex:
+    """Buduje indeks świec sesyjnych: kolejne dni robocze x świece od 09:30 do 16:00."""
+    offsets = pd.timedelta_range("9h30min", "16h", freq=freq)
+    offsets = offsets[offsets < pd.Timedelta("16h")]
+    n_days = -(-periods // len(offsets))
+
+    # Dni robocze liczone w datetime64[D] (numpy) - bdate_range nie obsługuje rozpiętości ponad ~292 lata.
+    start, end, earliest = (np.datetime64(t.date(), "D") for t in (START, END, pd.Timestamp.min.ceil("D")))
+    first_day = np.busday_offset(start, 0, roll="forward")
+    if np.busday_offset(first_day, n_days - 1) > end:
+        first_day = np.busday_offset(end, -(n_days - 1), roll="backward")
+    if first_day < earliest:
+        raise ValueError(f"{periods} świec sesyjnych o częstotliwości {freq} nie mieści się w zakresie datetime64[ns].")
+
+    days = np.busday_offset(first_day, np.arange(n_days)).astype("datetime64[ns]")
+    timestamps = (days[:, None] + offsets.values[None, :]).ravel()[:periods]
+    return pd.DatetimeIndex(timestamps).tz_localize("America/New_York")
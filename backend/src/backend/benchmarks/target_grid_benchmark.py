@@ -0,0 +1,44 @@
+import time
+
+from backend.benchmarks.synthetic import generate_ohlcv
+from backend.ml.data.create_target import barrier_grid, create_market_target, create_market_target_grid
+
+
+def run_target_grid_benchmark(
+    periods: int = 200_000,
+    tp_values: tuple[float, ...] = (0.005, 0.01, 0.015, 0.02, 0.03),
+    sl_values: tuple[float, ...] = (0.005, 0.01, 0.015, 0.02),
+    windows: tuple[int, ...] = (3, 5, 10, 20),
+) -> dict[str, float]:
+    """
+    Porównuje etykietowanie siatki konfiguracji: osobne wywołania create_market_target vs jedno przejście.
+
+    Returns:
+        dict[str, float]: Liczba konfiguracji, czasy w sekundach i przyspieszenie.
+    """
+
+    df = generate_ohlcv(periods)
+    configs = barrier_grid(list(tp_values), list(sl_values), list(windows))
+
+    start = time.perf_counter()
+    expected = [create_market_target(df, tp_pct=tp, sl_pct=sl, window=w) for tp, sl, w in configs]
+    per_config_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grid = create_market_target_grid(df, configs)
+    grid_time = time.perf_counter() - start
+
+    for k, labels in enumerate(expected):
+        if not grid.label_series(k).equals(labels):
+            raise AssertionError(f"Siatka zwróciła inne etykiety dla konfiguracji {configs[k]}!")
+
+    return {
+        "configs": len(configs),
+        "per_config_s": per_config_time,
+        "grid_s": grid_time,
+        "speedup": per_config_time / grid_time,
+    }
+
+
+if __name__ == "__main__":
+    print(run_target_grid_benchmark())
@@ -1,15 +1,21 @@
-from backend.ml.data.fetchers.yahoo_fetcher import fetch_history
-from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
-from backend.ml.data.create_target import create_market_target
-
-import pandas as pd
+# Ciężkie zależności (pandas, sklearn, yfinance, ta) są importowane wewnątrz funkcji,
+# żeby samo `import backend.main` (np. przez skrypty z pyproject) było natychmiastowe.
+import os
 
 
 def start_api() -> None:
     """
-    Uruchamia serwer FastAPI
+    Uruchamia serwer FastAPI.
+    Ścieżki do modelu i skalera są brane ze zmiennych MUSA_MODEL_PATH i MUSA_SCALER_PATH.
     """
-    pass
+    import uvicorn
+    from backend.api.app import create_app
+
+    uvicorn.run(
+        create_app(),
+        host=os.environ.get("MUSA_HOST", "127.0.0.1"),
+        port=int(os.environ.get("MUSA_PORT", 8000)),
+    )
 
 
 def start_dev() -> None:
@@ -17,11 +23,19 @@ def start_dev() -> None:
     Funkcja uruchamiająca aplikację w formie dla szkolenia
     i testowania modelów sztucznej intelignecji
     """
+    from backend.ml.data.fetchers.yahoo_fetcher import fetch_history
+    from backend.ml.data.dataset import build_dataset
+    from backend.ml.evaluation.walk_forward import walk_forward_backtest
+    from backend.monitoring.instrumentation import recorder
+
     df = fetch_history("AAPL")
-    results = map_ohlcv_to_features(df)
-    target = create_market_target(df)
-    dataset = pd.concat([results, target], axis=1)
-    final_dataset = dataset.dropna()
+    final_dataset = build_dataset(df)
 
     print(final_dataset.head(30))
-    print(final_dataset.tail(0))
+
+    report = walk_forward_backtest(final_dataset)
+    print(report.folds)
+    print(f"Walk-forward zakończony w {report.wall_time_s:.2f} s")
+
+    if recorder.enabled:
+        recorder.export_json(os.environ.get("MUSA_METRICS_LOG", "metrics.jsonl"))
@@ -0,0 +1,160 @@
+import numpy as np
+from typing import Optional
+from numpy import ndarray
+from pandas import DataFrame
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.utils import assert_all_finite
+
+
+class CompiledForest:
+    """
+    Las losowy skompilowany do płaskich tablic NumPy, przeznaczony do szybkiej inferencji.
+
+    Węzły wszystkich drzew są sklejone w jedne tablice (cecha, próg, dzieci, wartości liści).
+    Liście wskazują same na siebie, więc przejście po drzewie to `depth` kroków wektorowych
+    wykonywanych jednocześnie dla wszystkich drzew i wszystkich wierszy - bez walidacji
+    sklearn, bez joblib i bez wywołań Pythona per drzewo. Wejście jest rzutowane na float32
+    tak jak w sklearn, więc wyniki są zgodne z `RandomForestClassifier.predict_proba` - łącznie
+z walidacją: nieskończoności (także po przepełnieniu float32) dają ten sam ValueError co w sklearn,
+a NaN jest odrzucany tylko wtedy, gdy drzewa nie obsługują braków danych.
+
+    ## Args:
+        :model (RandomForestClassifier): Wytrenowany las ze Scikit-Learn.
+
+    ## Attributes:
+        :classes_ (ndarray): Etykiety klas w kolejności kolumn predict_proba.
+        :feature_names_in_ (Optional[ndarray]): Nazwy cech z treningu (jeśli trenowano na DataFrame).
+        :depth (int): Maksymalna głębokość drzew, czyli liczba kroków przejścia.
+        :allow_nan (bool): Czy drzewa obsługują NaN na wejściu (jak w sklearn), czy NaN jest błędem.
+
+    ## Methods:
+        :from_arrays(arrays, classes, feature_names_in, n_features_in, depth, allow_nan) -> CompiledForest:
+            Odtwarza las z gotowych tablic węzłów (np. mapowanych z artefaktu), bez sklearn i bez kopii.
+        :predict_proba(X) -> ndarray:
+            Średnie prawdopodobieństwa klas ze wszystkich drzew.
+        :predict(X) -> ndarray:
+            Klasa z największym prawdopodobieństwem.
+    """
+
+    SMALL_BATCH = 64
+    ARRAYS = ("feature", "threshold", "left", "right", "missing_left", "value", "roots")
+
+    def __init__(self, model: RandomForestClassifier):
+        self.classes_ = model.classes_
+        self.feature_names_in_ = getattr(model, "feature_names_in_", None)
+        self.n_features_in_ = model.n_features_in_
+        self.allow_nan = bool(model.estimators_[0].__sklearn_tags__().input_tags.allow_nan)
+
+        features, thresholds, lefts, rights, missing_left, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        depth = 0
+
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+
+            # Liść wskazuje na siebie - dalsze kroki przejścia nic nie zmieniają.
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            missing_left.append(
+                np.asarray(getattr(tree, "missing_go_to_left", np.zeros(tree.node_count)), dtype=bool)
+            )
+
+            # Od sklearn 1.4 tree_.value klasyfikatora przechowuje już udziały klas w liściu.
+            values.append(tree.value[:, 0, :])
+
+            roots.append(offset)
+            offset += tree.node_count
+            depth = max(depth, tree.max_depth)
+
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.missing_left = np.concatenate(missing_left)
+        self.value = np.concatenate(values)
+        self.roots = np.array(roots, dtype=np.intp)
+        self.depth = depth
+        self.n_trees = len(roots)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        arrays: dict[str, ndarray],
+        classes: ndarray,
+        feature_names_in: Optional[ndarray],
+        n_features_in: int,
+        depth: int,
+        allow_nan: bool = True,
+    ) -> "CompiledForest":
+        forest = cls.__new__(cls)
+        forest.classes_ = classes
+        forest.feature_names_in_ = feature_names_in
+        forest.n_features_in_ = n_features_in
+        forest.allow_nan = allow_nan
+        for name in cls.ARRAYS:
+            setattr(forest, name, arrays[name])
+        forest.depth = depth
+        forest.n_trees = len(forest.roots)
+
+        return forest
+
+    def _to_array(self, X: DataFrame | ndarray) -> ndarray:
+        """Sprowadza wejście do ciągłej tablicy float32 w kolejności cech z treningu."""
+        if isinstance(X, DataFrame):
+            if self.feature_names_in_ is not None:
+                X = X[self.feature_names_in_]
+            X = X.to_numpy(dtype=np.float32)
+
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"Oczekiwano {self.n_features_in_} cech, otrzymano tablicę o kształcie {X.shape}"
+            )
+
+        # Szybkie sprawdzenie numpy; komunikat błędu bierzemy z walidatora sklearn, żeby był identyczny.
+        invalid = np.isinf(X).any() if self.allow_nan else not np.isfinite(X).all()
+        if invalid:
+            assert_all_finite(X, allow_nan=self.allow_nan, input_name="X")
+        return X
+
+    def _leaves(self, X: ndarray) -> ndarray:
+        """Zwraca indeksy liści o kształcie (wiersze, drzewa)."""
+        n_samples, n_features = X.shape
+        nodes = np.broadcast_to(self.roots, (n_samples, self.n_trees)).copy()
+        row_offsets = (np.arange(n_samples, dtype=np.intp) * n_features)[:, None]
+        flat_X = X.ravel()
+
+        for _ in range(self.depth):
+            x = flat_X[row_offsets + self.feature[nodes]]
+            go_left = x <= self.threshold[nodes]
+            go_left |= np.isnan(x) & self.missing_left[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return nodes
+
+    def predict_proba(self, X: DataFrame | ndarray, chunk_size: int = 4096) -> ndarray:
+        X = self._to_array(X)
+
+        if len(X) <= self.SMALL_BATCH:
+            return self._predict_proba_small(X)
+
+        proba = np.empty((len(X), len(self.classes_)))
+        for start in range(0, len(X), chunk_size):
+            stop = start + chunk_size
+            proba[start:stop] = self._predict_proba_small(X[start:stop])
+        return proba
+
+    def _predict_proba_small(self, X: ndarray) -> ndarray:
+        """Ścieżka niskich opóźnień: jedno przejście wektorowe po wszystkich drzewach naraz."""
+        # Redukcja po osi drzew (nie ostatniej) dodaje drzewa po kolei - ta sama kolejność co w sklearn.
+        proba = self.value[self._leaves(X)].sum(axis=1)
+        proba /= self.n_trees
+
+        return proba
+
+    def predict(self, X: DataFrame | ndarray) -> ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
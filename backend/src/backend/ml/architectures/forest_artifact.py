@@ -0,0 +1,130 @@
+import json
+import os
+import numpy as np
+from dataclasses import dataclass
+from typing import Literal, Optional
+from backend.ml.architectures.compiled_forest import CompiledForest
+from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+from backend.ml.data.feature_scaler import FeatureScaler
+
+ARTIFACT_FORMAT = "musa-forest"
+ARTIFACT_VERSION = 1
+HEADER_FILE = "header.json"
+
+
+@dataclass
+class ForestArtifact:
+    """
+    Model (i opcjonalnie skaler) wczytany z artefaktu tablicowego.
+
+    ## Attributes:
+        :model (MusaRandomForestTreeClassifier): Model z samym lasem skompilowanym (tylko inferencja).
+        :scaler (Optional[FeatureScaler]): Skaler odtworzony z nagłówka lub None.
+        :header (dict): Nagłówek artefaktu (parametry, nazwy cech, klasy, opis tablic).
+    """
+
+    model: MusaRandomForestTreeClassifier
+    scaler: Optional[FeatureScaler]
+    header: dict
+
+
+def is_artifact(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, HEADER_FILE))
+
+
+def save_artifact(model: MusaRandomForestTreeClassifier, path: str, scaler: Optional[FeatureScaler] = None):
+    """
+    Zapisuje model jako katalog artefaktu: `header.json` + jeden plik .npy na tablicę węzłów CompiledForest.
+
+    Tablice są nieskompresowane, a np.save wyrównuje początek danych do 64 bajtów, więc
+    np.load(mmap_mode='r') mapuje je bez kopiowania - wiele procesów API dzieli wtedy jedną
+    kopię w page cache. Nagłówek jest zapisywany na końcu (atomowo), więc jego obecność
+    oznacza kompletny artefakt.
+
+    Args:
+        model (MusaRandomForestTreeClassifier): Wytrenowany model.
+        path (str): Katalog artefaktu.
+        scaler (Optional[FeatureScaler]): Skaler, którego parametry trafią do nagłówka.
+    """
+
+    # Kompilacja lokalna - zapis artefaktu nie przełącza ścieżki predykcji żywego modelu.
+    compiled = model.compiled if model.compiled is not None else CompiledForest(model.model)
+    os.makedirs(path, exist_ok=True)
+
+    arrays = {}
+    for name in CompiledForest.ARRAYS:
+        array = np.ascontiguousarray(getattr(compiled, name))
+        tmp_path = os.path.join(path, name + ".npy.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, os.path.join(path, name + ".npy"))
+        arrays[name] = {"dtype": array.dtype.str, "shape": list(array.shape)}
+
+    params = model.model.get_params()
+    header = {
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "params": {key: params[key] for key in ("n_estimators", "max_depth", "random_state", "class_weight")},
+        "feature_names": None if compiled.feature_names_in_ is None else list(compiled.feature_names_in_),
+        "n_features": int(compiled.n_features_in_),
+        "classes": compiled.classes_.tolist(),
+        "classes_dtype": compiled.classes_.dtype.str,
+        "depth": int(compiled.depth),
+        "allow_nan": bool(compiled.allow_nan),
+        "n_trees": int(compiled.n_trees),
+        "tree_generations": model.tree_generations.tolist(),
+        "arrays": arrays,
+        "scaler": scaler.to_params() if scaler is not None else None,
+    }
+
+    header_path = os.path.join(path, HEADER_FILE)
+    with open(header_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(header, f, indent=2)
+    os.replace(header_path + ".tmp", header_path)
+    print(f"Model zapisany w: {path}")
+
+
+def load_artifact(path: str, mmap_mode: Optional[Literal["r", "c"]] = "r") -> ForestArtifact:
+    """
+    Wczytuje artefakt zapisany przez save_artifact.
+
+    Args:
+        path (str): Katalog artefaktu.
+        mmap_mode (Optional[Literal["r", "c"]]): Tryb mapowania tablic (domyślnie 'r' - tylko odczyt,
+            strony współdzielone między procesami). None wczytuje tablice do pamięci procesu.
+
+    Returns:
+        ForestArtifact: Model gotowy do predict/predict_proba i skaler z nagłówka.
+    """
+
+    with open(os.path.join(path, HEADER_FILE), "r", encoding="utf-8") as f:
+        header = json.load(f)
+
+    if header.get("format") != ARTIFACT_FORMAT or header.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"Nieobsługiwany format artefaktu w {path}: {header.get('format')} v{header.get('version')}")
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        # np.asarray zdejmuje podklasę np.memmap (tańsze indeksowanie), pamięć dalej jest mapowana z pliku.
+        array = np.asarray(np.load(os.path.join(path, name + ".npy"), mmap_mode=mmap_mode))
+        if array.dtype.str != spec["dtype"] or list(array.shape) != spec["shape"]:
+            raise ValueError(f"Tablica {name} w {path} nie zgadza się z nagłówkiem.")
+        arrays[name] = array
+
+    feature_names = header["feature_names"]
+    compiled = CompiledForest.from_arrays(
+        arrays,
+        classes=np.asarray(header["classes"], dtype=header["classes_dtype"]),
+        feature_names_in=None if feature_names is None else np.asarray(feature_names, dtype=object),
+        n_features_in=header["n_features"],
+        depth=header["depth"],
+        allow_nan=header.get("allow_nan", True),
+    )
+
+    model = MusaRandomForestTreeClassifier(**header["params"])
+    model.compiled = compiled
+    model.is_trained = True
+
+    scaler = FeatureScaler.from_params(header["scaler"]) if header["scaler"] is not None else None
+
+    return ForestArtifact(model=model, scaler=scaler, header=header)
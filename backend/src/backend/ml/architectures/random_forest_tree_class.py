@@ -1,10 +1,13 @@
 import joblib
+import warnings
 import numpy as np
 from typing import Literal, Optional
 from numpy import ndarray
 from pandas import DataFrame, Series
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.exceptions import NotFittedError
+from backend.ml.architectures.compiled_forest import CompiledForest
+from backend.monitoring.instrumentation import instrumented
 
 
 class MusaRandomForestTreeClassifier:
@@ -19,18 +22,26 @@ class MusaRandomForestTreeClassifier:
     ## Attributes:
         :model (RandomForestClassifier): Rdzeń modelu ze Scikit-Learn.
         :is_trained (bool): Flaga stanu informująca, czy model przeszedł trening.
+        :compiled (Optional[CompiledForest]): Skompilowana wersja lasu do szybkiej inferencji (None, dopóki nie wywołano compile()).
+        :tree_generations (ndarray): Generacja każdego drzewa w model.estimators_ (0 - pełny trening, k - k-ta aktualizacja).
+        :generation (int): Numer ostatniej aktualizacji przyrostowej (0 po train()).
 
     ## Methods:
         :train(X_train, y_train):
             Trenuje model na danych historycznych i ustawia flagę is_trained.
+        :update(X_recent, y_recent, n_new_trees, max_trees):
+            Dorasta nowe drzewa na świeżym oknie danych i wycofuje najstarsze.
         :predict(X) -> ndarray:
             Przewiduje kierunek ruchu ceny (target):
         :predict_proba(X) -> ndarray:
             Zwraca pewność modelu dla każdej z trzech powyższych klas.
+        :compile() -> CompiledForest:
+            Kompiluje las do płaskich tablic NumPy; predict/predict_proba dla paczek do 64 wierszy idą ścieżką skompilowaną.
         :save(file_path):
-            Zapisuje surowy modelu (nie klasę) do pliku .joblib.
+            Zapisuje surowy modelu (nie klasę) do pliku .joblib - razem z generacjami drzew, więc po load() można kontynuować update().
         :load(file_path) -> MusaRandomForestTreeClassifier:
             Wczytuje model z dysku i odtwarza stan instancji klasy.
+            Szybko ładowany, mapowany w pamięci format tylko do inferencji: forest_artifact.save_artifact/load_artifact.
     """
 
     def __init__(
@@ -48,15 +59,104 @@ class MusaRandomForestTreeClassifier:
             n_jobs=-1,
         )
         self.is_trained = False
+        self.compiled: Optional[CompiledForest] = None
 
+    @property
+    def tree_generations(self) -> ndarray:
+        return getattr(self.model, "tree_generations_", np.zeros(len(getattr(self.model, "estimators_", [])), dtype=np.int64))
+
+    @property
+    def generation(self) -> int:
+        return getattr(self.model, "generation_", 0)
+
+    @instrumented("model_train")
     def train(self, X_train: DataFrame, y_train: Series):
         """Trenuje model i ustawia flagi gotowości."""
+        # Pełny trening od zera; rozmiar lasu to limit z ostatniej aktualizacji (jeśli była), a seed - bazowy,
+        # nie przesunięty przez update(), więc ponowny pełny trening jest powtarzalny.
+        self.model.set_params(
+            warm_start=False,
+            n_estimators=getattr(self.model, "max_trees_", self.model.n_estimators),
+            random_state=getattr(self.model, "base_random_state_", self.model.random_state),
+        )
         self.model.fit(X_train, y_train)
+        self.compiled = None
 
+        self.model.tree_generations_ = np.zeros(len(self.model.estimators_), dtype=np.int64)
+        self.model.generation_ = 0
+        self.model.base_random_state_ = self.model.random_state
         self.model.is_trained = True
         self.is_trained = True
         print("Model skończył trening")
 
+    @instrumented("model_update")
+    def update(
+        self,
+        X_recent: DataFrame,
+        y_recent: Series,
+        n_new_trees: int = 10,
+        max_trees: Optional[int] = None,
+    ):
+        """
+        Aktualizacja przyrostowa: dorasta `n_new_trees` drzew (warm_start) tylko na świeżym oknie
+        danych, a potem wycofuje najstarsze drzewa ponad limit `max_trees` (FIFO po generacjach).
+        Koszt zależy od długości okna i liczby nowych drzew, a nie od długości całej historii.
+
+        Args:
+            X_recent (DataFrame): Cechy z ostatniego okna (np. ostatnie dni świec).
+            y_recent (Series): Target dla tego okna - musi zawierać te same klasy co pełny trening.
+            n_new_trees (int): Liczba drzew dorastanych w tej aktualizacji.
+            max_trees (Optional[int]): Maksymalny rozmiar lasu po aktualizacji (domyślnie liczba drzew z train()).
+        """
+
+        self._check_if_trained()
+        if self._compiled_only:
+            raise NotFittedError("Model z artefaktu tablicowego służy tylko do inferencji - update() wymaga modelu z .joblib.")
+        if n_new_trees < 1:
+            raise ValueError("n_new_trees musi być dodatnie.")
+
+        classes = np.unique(np.asarray(y_recent))
+        if not np.array_equal(classes, self.model.classes_):
+            raise ValueError(
+                f"Okno aktualizacji ma klasy {classes.tolist()}, a model {self.model.classes_.tolist()}. "
+                "Wydłuż okno albo wykonaj pełny trening."
+            )
+
+        max_trees = max_trees or getattr(self.model, "max_trees_", len(self.model.estimators_))
+        generations = self.tree_generations
+        generation = self.generation + 1
+        base_seed = getattr(self.model, "base_random_state_", self.model.random_state)
+
+        # Inny seed na każdą generację - sklearn wyznacza seedy nowych drzew z pozycji w lesie,
+        # a po wycofaniu starych drzew pozycje się powtarzają.
+        self.model.set_params(
+            warm_start=True,
+            n_estimators=len(self.model.estimators_) + n_new_trees,
+            random_state=None if base_seed is None else base_seed + generation,
+        )
+        with warnings.catch_warnings():
+            # class_weight='balanced' liczony na oknie aktualizacji jest tu zamierzony.
+            warnings.filterwarnings("ignore", message="class_weight presets", category=UserWarning)
+            self.model.fit(X_recent, y_recent)
+        self.model.set_params(warm_start=False, random_state=base_seed)
+
+        generations = np.concatenate([generations, np.full(n_new_trees, generation, dtype=np.int64)])
+        retired = max(len(self.model.estimators_) - max_trees, 0)
+        if retired:
+            self.model.estimators_ = self.model.estimators_[retired:]
+            generations = generations[retired:]
+        self.model.set_params(n_estimators=len(self.model.estimators_))
+
+        self.model.tree_generations_ = generations
+        self.model.generation_ = generation
+        self.model.max_trees_ = max_trees
+        self.compiled = None
+
+    @property
+    def _compiled_only(self) -> bool:
+        """Model wczytany z artefaktu tablicowego (forest_artifact) ma tylko las skompilowany, bez drzew sklearn."""
+        return self.compiled is not None and not hasattr(self.model, "estimators_")
+
     def _check_if_trained(self):
         """Wewnętrzny bezpiecznik sprawdzający stan modelu."""
         if not self.is_trained:
@@ -64,16 +164,30 @@ class MusaRandomForestTreeClassifier:
                 "Ten model nie jest jeszcze wytrenowany! Wywołaj .train() przed predykcją."
             )
 
+    @instrumented("model_predict")
     def predict(self, X: DataFrame) -> ndarray:
         """Przewiduje klasy rynkowe (1, 0, -1)."""
         self._check_if_trained()
+        if self.compiled is not None and (len(X) <= CompiledForest.SMALL_BATCH or self._compiled_only):
+            return self.compiled.predict(X)
         return self.model.predict(X)
 
+    @instrumented("model_predict_proba")
     def predict_proba(self, X: DataFrame) -> ndarray:
         """Zwraca prawdopodobieństwo dla każdej z klas."""
         self._check_if_trained()
+        if self.compiled is not None and (len(X) <= CompiledForest.SMALL_BATCH or self._compiled_only):
+            return self.compiled.predict_proba(X)
         return self.model.predict_proba(X)
 
+    def compile(self) -> CompiledForest:
+        """Kompiluje wytrenowany las do tablic węzłów (wyniki identyczne jak w sklearn, mniejszy narzut na wywołanie)."""
+        self._check_if_trained()
+        if self._compiled_only:
+            return self.compiled
+        self.compiled = CompiledForest(self.model)
+        return self.compiled
+
     def save(self, file_path: str):
         """Zapisuje model wewnątrz klasy do pliku .joblib."""
         joblib.dump(self.model, file_path)
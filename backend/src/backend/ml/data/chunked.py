@@ -0,0 +1,208 @@
+import os
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, Optional
+from pandas import DataFrame, Series
+from backend.ml.data.create_target import create_market_target
+from backend.ml.data.mappers.feature_graph import FEATURE_COLUMNS, OHLCV_GRAPH
+from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
+from backend.monitoring.instrumentation import instrumented
+
+# Węzły z rekurencją (EMA i wygładzanie Wildera). Ich wartości zależą od całej historii, więc
+# o zgodności kawałka z pełnym przebiegiem decyduje ich stan na granicy kawałków.
+STATE_NODES = ["ema_fast", "ema_slow", "macd_signal", "gain_wilder", "loss_wilder", "atr"]
+# MACD 26 + sygnał 9 - 1: po tylu świecach wszystkie węzły mają wartości (RSI/ATR 14 mieszczą się w tym).
+MIN_OVERLAP = 34
+# Rekurencje kawałka zbiegają się co do bitu z pełnym przebiegiem po ok. 450-600 świecach.
+DEFAULT_OVERLAP = 1024
+# Górny limit zakładki przy ponownym liczeniu kawałka - ogranicza pamięć i czas jednego kawałka.
+MAX_OVERLAP = 16 * DEFAULT_OVERLAP
+
+
+@dataclass(frozen=True)
+class ChunkSpec:
+    """
+    Kawałek szeregu: wiersze [start, stop) należą do kawałka, a liczony jest zakres
+    [start - lead, stop + lookahead) - rozgrzewka wskaźników przed i okno barier po.
+    """
+
+    start: int
+    stop: int
+    lead: int
+    lookahead: int
+
+
+def plan_chunks(n_rows: int, chunk_size: int, overlap: int = DEFAULT_OVERLAP, window: int = 5) -> list[ChunkSpec]:
+    """Dzieli n_rows świec na kawałki po chunk_size z zakładką `overlap` wstecz i `window` w przód."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size musi być dodatni.")
+    if overlap < MIN_OVERLAP:
+        raise ValueError(f"overlap musi pokrywać rozgrzewkę wskaźników (co najmniej {MIN_OVERLAP} świec).")
+
+    specs = []
+    for start in range(0, n_rows, chunk_size):
+        stop = min(start + chunk_size, n_rows)
+        specs.append(ChunkSpec(start, stop, lead=min(overlap, start), lookahead=min(window, n_rows - stop)))
+
+    return specs
+
+
+@instrumented("map_chunked")
+def map_features_and_target_chunked(
+    df: DataFrame,
+    chunk_size: int = 250_000,
+    overlap: int = DEFAULT_OVERLAP,
+    tp_pct: float = 0.015,
+    sl_pct: float = 0.01,
+    window: int = 5,
+    compact: bool = False,
+    max_workers: Optional[int] = None,
+    max_overlap: int = MAX_OVERLAP,
+) -> tuple[DataFrame, Series]:
+    """
+    map_ohlcv_to_features i create_market_target liczone kawałkami, równolegle - wynik jest identyczny
+    (co do bitu) z pełnym przebiegiem w pamięci. Zwraca sklejone (cechy, target); do zapisu strumieniowego
+    bez trzymania całego wyniku służy iter_chunks.
+    """
+
+    parts = list(iter_chunks(df, chunk_size, overlap, tp_pct, sl_pct, window, compact, max_workers, max_overlap))
+    if not parts:
+        return map_ohlcv_to_features(df, compact=compact), create_market_target(df, tp_pct=tp_pct, sl_pct=sl_pct, window=window)
+
+    return pd.concat([features for features, _ in parts]), pd.concat([target for _, target in parts])
+
+
+def iter_chunks(
+    df: DataFrame,
+    chunk_size: int = 250_000,
+    overlap: int = DEFAULT_OVERLAP,
+    tp_pct: float = 0.015,
+    sl_pct: float = 0.01,
+    window: int = 5,
+    compact: bool = False,
+    max_workers: Optional[int] = None,
+    max_overlap: int = MAX_OVERLAP,
+) -> Iterator[tuple[DataFrame, Series]]:
+    """
+    Kolejne kawałki (cechy, target) w porządku czasowym.
+
+    Każdy kawałek jest liczony w osobnym procesie na wycinku [start - overlap, stop + window):
+    zakładka wstecz pokrywa rozgrzewkę MACD 26/9 oraz RSI/ATR 14, a zakładka w przód - okno
+    barier (ostatnie `window` etykiet wycinka są NaN, ale nie należą do kawałka). W toku jest
+    najwyżej 2 * max_workers kawałków, więc pamięć zależy od chunk_size, a nie od długości szeregu.
+
+    EMA i wygładzanie Wildera mają nieskończoną pamięć, więc zakładka sama nie gwarantuje
+    identycznych wyników. Dlatego na każdej granicy stan rekurencji (STATE_NODES) w ostatniej
+    świecy przed kawałkiem jest porównywany ze stanem poprzedniego kawałka. Przy rozbieżności
+    kawałek jest liczony ponownie z podwojoną zakładką, najwyżej do `max_overlap` świec (albo
+    od początku szeregu, jeśli jest bliżej) - dalej ValueError zamiast wycinka rosnącego do
+    rozmiaru całego szeregu.
+
+    Args:
+        df (DataFrame): Dane OHLCV (mogą być mapowane z dysku, np. z OhlcvCache - kopiowany jest tylko wycinek).
+        chunk_size (int): Liczba świec należących do jednego kawałka.
+        overlap (int): Zakładka wstecz w świecach (co najmniej MIN_OVERLAP).
+        tp_pct (float): Próg Take Profit dla create_market_target.
+        sl_pct (float): Próg Stop Loss dla create_market_target.
+        window (int): Okno Triple Barrier (zakładka w przód).
+        compact (bool): Cechy jako float32, jak w map_ohlcv_to_features(compact=True).
+        max_workers (Optional[int]): Liczba procesów (domyślnie liczba rdzeni); 1 liczy w bieżącym procesie.
+        max_overlap (int): Największa zakładka przy ponownym liczeniu kawałka (domyślnie MAX_OVERLAP).
+    """
+
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    if max_overlap < overlap:
+        raise ValueError("max_overlap nie może być mniejszy niż overlap.")
+
+    specs = plan_chunks(len(df), chunk_size, overlap, window)
+    args = (tp_pct, sl_pct, window, compact)
+
+    if max_workers == 1:
+        results = (_process_chunk(_slice(df, spec), spec.lead, spec.stop - spec.start, *args) for spec in specs)
+        yield from _verified(df, specs, results, args, max_overlap)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = 2 * (max_workers or os.cpu_count() or 1)
+        pending: deque[Future] = deque()
+        upcoming = iter(specs)
+
+        def submit_next():
+            spec = next(upcoming, None)
+            if spec is not None:
+                pending.append(executor.submit(_process_chunk, _slice(df, spec), spec.lead, spec.stop - spec.start, *args))
+
+        for _ in range(in_flight):
+            submit_next()
+
+        def results():
+            while pending:
+                result = pending.popleft().result()
+                submit_next()
+                yield result
+
+        yield from _verified(df, specs, results(), args, max_overlap)
+
+
+def _verified(
+    df: DataFrame, specs: list[ChunkSpec], results: Iterator[dict], args: tuple, max_overlap: int
+) -> Iterator[tuple[DataFrame, Series]]:
+    """Sprawdza stan rekurencji na granicach i w razie potrzeby liczy kawałek ponownie z dłuższą zakładką."""
+    previous_tail = None
+
+    for spec, result in zip(specs, results):
+        lead = spec.lead
+        while lead < spec.start and not _same_state(result["head_state"], previous_tail):
+            if lead >= max_overlap:
+                raise ValueError(
+                    f"Stan wskaźników kawałka od świecy {spec.start} nie zbiegł się z pełnym przebiegiem "
+                    f"przy zakładce {max_overlap} świec. Zwiększ max_overlap albo licz bez podziału (chunk_size=None)."
+                )
+            lead = min(2 * lead, spec.start, max_overlap)
+            wider = ChunkSpec(spec.start, spec.stop, lead, spec.lookahead)
+            result = _process_chunk(_slice(df, wider), lead, spec.stop - spec.start, *args)
+
+        previous_tail = result["tail_state"]
+        yield result["features"], result["target"]
+
+
+def _same_state(head: dict, tail: dict) -> bool:
+    return all(np.array_equal(head[node], tail[node], equal_nan=True) for node in STATE_NODES)
+
+
+def _slice(df: DataFrame, spec: ChunkSpec) -> DataFrame:
+    return df.iloc[spec.start - spec.lead : spec.stop + spec.lookahead].copy()
+
+
+def _process_chunk(
+    chunk: DataFrame,
+    lead: int,
+    owned: int,
+    tp_pct: float,
+    sl_pct: float,
+    window: int,
+    compact: bool,
+) -> dict:
+    """Cechy i target dla wierszy [lead, lead + owned) wycinka oraz stan rekurencji przed i na końcu kawałka."""
+    nodes = OHLCV_GRAPH.compute(chunk, FEATURE_COLUMNS + STATE_NODES)
+    values = {name: np.asarray(value, dtype=np.float64) for name, value in nodes.items()}
+    rows = slice(lead, lead + owned)
+
+    features = DataFrame({column: values[column][rows] for column in FEATURE_COLUMNS}, index=chunk.index[rows]).dropna()
+    target = create_market_target(chunk, tp_pct=tp_pct, sl_pct=sl_pct, window=window).iloc[rows]
+
+    def state(position: int) -> dict:
+        return {node: values[node][position] for node in STATE_NODES}
+
+    return {
+        "features": features.astype(np.float32) if compact else features,
+        "target": target,
+        "head_state": state(lead - 1) if lead > 0 else None,
+        "tail_state": state(lead + owned - 1),
+    }
+
@@ -1,10 +1,21 @@
 import pandas as pd
 import numpy as np
-from pandas import DataFrame, Series
+from dataclasses import dataclass
+from itertools import product
+from typing import Literal
+from numpy import ndarray
+from numpy.lib.stride_tricks import sliding_window_view
+from pandas import DataFrame, Index, Series
+from backend.monitoring.instrumentation import instrumented
 
 
+@instrumented("create_market_target")
 def create_market_target(
-    df: DataFrame, tp_pct: float = 0.015, sl_pct: float = 0.01, window: int = 5
+    df: DataFrame,
+    tp_pct: float = 0.015,
+    sl_pct: float = 0.01,
+    window: int = 5,
+    engine: Literal["vectorized", "loop"] = "vectorized",
 ) -> Series:
     """
     Generuje klasy dla modelu przy użyciu metody Triple Barrier, symulując realne warunki handlowe (TP/SL/Czas).
@@ -13,6 +24,8 @@ def create_market_target(
         tp_pct (float): Procentowy próg dla bariery górnej (Take Profit).
         sl_pct (float): Procentowy próg dla bariery dolnej (Stop Loss).
         window (int): Maksymalny czas oczekiwania na rozstrzygnięcie transakcji (w godzinach).
+        engine (Literal["vectorized", "loop"]): Silnik etykietowania. 'loop' to referencyjna
+            pętla w czystym Pythonie, 'vectorized' daje identyczne wyniki na widokach okien (domyślnie 'vectorized').
 
     Returns:
         Series (Kolumna target z indeksem Datetime):
@@ -26,6 +39,26 @@ def create_market_target(
     high = df["High"].values
     low = df["Low"].values
 
+    if engine == "loop":
+        labels = _triple_barrier_loop(close, high, low, tp_pct, sl_pct, window)
+    elif engine == "vectorized":
+        labels = _triple_barrier_vectorized(close, high, low, tp_pct, sl_pct, window)
+    else:
+        raise ValueError(f"Nieznany silnik etykietowania: {engine}")
+
+    return Series(labels, index=df.index, name="target")
+
+
+def _triple_barrier_loop(
+    close: ndarray,
+    high: ndarray,
+    low: ndarray,
+    tp_pct: float,
+    sl_pct: float,
+    window: int,
+) -> ndarray:
+    """Referencyjna implementacja Triple Barrier - pętla po każdej świecy i każdym kroku okna."""
+
     labels = np.zeros(len(close))
 
     for i in range(len(close) - window):
@@ -48,4 +81,217 @@ def create_market_target(
 
     labels[-window:] = np.nan
 
-    return Series(labels, index=df.index, name="target")
+    return labels
+
+
+def _triple_barrier_vectorized(
+    close: ndarray,
+    high: ndarray,
+    low: ndarray,
+    tp_pct: float,
+    sl_pct: float,
+    window: int,
+    chunk_size: int = 1_000_000,
+) -> ndarray:
+    """
+    Wektorowa implementacja Triple Barrier.
+
+    Dla każdej świecy buduje widok (bez kopii) na kolejne `window` wartości High/Low i szuka
+    pierwszego dotknięcia bariery wzdłuż osi okna. Przy remisie w tej samej świecy wygrywa TP,
+    tak jak w pętli referencyjnej. Wiersze są przetwarzane porcjami, żeby macierz masek
+    (wiersze x window) nie rosła bez ograniczeń.
+    """
+
+    labels = np.zeros(len(close))
+    n_labeled = max(len(close) - window, 0)
+
+    if n_labeled > 0 and window > 0:
+        high_windows = sliding_window_view(high[1:], window)
+        low_windows = sliding_window_view(low[1:], window)
+        step = max(chunk_size // window, 1)
+
+        for start in range(0, n_labeled, step):
+            stop = min(start + step, n_labeled)
+            entry_price = close[start:stop]
+
+            upper_barrier = entry_price * (1 + tp_pct)
+            lower_barrier = entry_price * (1 - sl_pct)
+
+            tp_first = _first_hit(high_windows[start:stop] >= upper_barrier[:, None])
+            sl_first = _first_hit(low_windows[start:stop] <= lower_barrier[:, None])
+
+            chunk = labels[start:stop]
+            chunk[(tp_first < window) & (tp_first <= sl_first)] = 1
+            chunk[(sl_first < window) & (sl_first < tp_first)] = -1
+
+    labels[-window:] = np.nan
+
+    return labels
+
+
+def _first_hit(mask: ndarray) -> ndarray:
+    """Zwraca indeks pierwszego True w każdym wierszu lub szerokość okna, gdy brak trafienia."""
+
+    first = mask.argmax(axis=1)
+    first[~mask.any(axis=1)] = mask.shape[1]
+    return first
+
+
+@dataclass
+class TargetGrid:
+    """
+    Etykiety Triple Barrier dla wielu konfiguracji (tp_pct, sl_pct, window) naraz.
+
+    ## Attributes:
+        :configs (list[tuple[float, float, int]]): Konfiguracje w kolejności kolumn macierzy.
+        :index (Index): Indeks świec z danych wejściowych.
+        :labels (ndarray): int8 (świece x konfiguracje): 1, 0, -1; 0 także dla wierszy bez etykiety.
+        :valid (ndarray): bool (świece x konfiguracje): czy wiersz ma etykietę (False tam, gdzie create_market_target daje NaN).
+        :hit_bars (ndarray): int16: po ilu świecach transakcja się rozstrzygnęła (window przy barierze czasowej).
+        :returns (ndarray): float32: zrealizowany zwrot - tp_pct, -sl_pct albo zmiana Close do końca okna; NaN bez etykiety.
+
+    ## Methods:
+        :label_series(k) -> Series:
+            Etykiety k-tej konfiguracji w formacie create_market_target.
+        :summary() -> DataFrame:
+            Dla każdej konfiguracji: udziały klas, średni czas rozstrzygnięcia i średni zwrot.
+    """
+
+    configs: list[tuple[float, float, int]]
+    index: Index
+    labels: ndarray
+    valid: ndarray
+    hit_bars: ndarray
+    returns: ndarray
+
+    def label_series(self, k: int) -> Series:
+        labels = self.labels[:, k].astype(np.float64)
+        labels[~self.valid[:, k]] = np.nan
+        return Series(labels, index=self.index, name="target")
+
+    def summary(self) -> DataFrame:
+        rows = []
+        for k, (tp_pct, sl_pct, window) in enumerate(self.configs):
+            valid = self.valid[:, k]
+            labels = self.labels[valid, k]
+            rows.append(
+                {
+                    "tp_pct": tp_pct,
+                    "sl_pct": sl_pct,
+                    "window": window,
+                    "rows": int(valid.sum()),
+                    "share_tp": float(np.mean(labels == 1)) if len(labels) else np.nan,
+                    "share_sl": float(np.mean(labels == -1)) if len(labels) else np.nan,
+                    "share_time": float(np.mean(labels == 0)) if len(labels) else np.nan,
+                    "mean_hit_bars": float(self.hit_bars[valid, k].mean()) if len(labels) else np.nan,
+                    "mean_return": float(self.returns[valid, k].mean()) if len(labels) else np.nan,
+                }
+            )
+        return DataFrame(rows)
+
+
+def barrier_grid(
+    tp_values: list[float], sl_values: list[float], windows: list[int]
+) -> list[tuple[float, float, int]]:
+    """Iloczyn kartezjański parametrów Triple Barrier w kolejności (tp, sl, window)."""
+    return list(product(tp_values, sl_values, windows))
+
+
+@instrumented("create_market_target_grid")
+def create_market_target_grid(
+    df: DataFrame,
+    configs: list[tuple[float, float, int]],
+    chunk_size: int = 1_000_000,
+) -> TargetGrid:
+    """
+    Liczy etykiety Triple Barrier dla całej siatki konfiguracji w jednym przejściu po danych.
+
+    Dla każdej świecy wyznaczana jest raz ścieżka narastającego maksimum High i minimum Low
+    na `max(window)` świec w przód. Ścieżki są monotoniczne, więc pierwsze dotknięcie bariery
+    to liczba kroków, w których ścieżka jej jeszcze nie osiągnęła - jedna redukcja na każdy
+    unikalny próg tp/sl, wspólna dla wszystkich okien. Kolumna k jest identyczna z
+    `create_market_target(df, *configs[k])`.
+
+    Args:
+        df (DataFrame): Dane wejściowe OHLCV. Muszą zawierać kolumny High, Low oraz Close.
+        configs (list[tuple[float, float, int]]): Lista (tp_pct, sl_pct, window), np. z barrier_grid.
+        chunk_size (int): Limit elementów macierzy ścieżek przetwarzanej naraz.
+
+    Returns:
+        TargetGrid: Macierze etykiet, czasów rozstrzygnięcia i zwrotów (świece x konfiguracje).
+    """
+
+    close = df["Close"].to_numpy(dtype=np.float64)
+    high = df["High"].to_numpy(dtype=np.float64)
+    low = df["Low"].to_numpy(dtype=np.float64)
+
+    n_bars, n_configs = len(close), len(configs)
+    max_window = max((window for _, _, window in configs), default=0)
+
+    # Układ kolumnowy (Fortran): każda konfiguracja zapisuje ciągły blok pamięci.
+    labels = np.zeros((n_bars, n_configs), dtype=np.int8, order="F")
+    hit_bars = np.zeros((n_bars, n_configs), dtype=np.int16, order="F")
+    returns = np.full((n_bars, n_configs), np.nan, dtype=np.float32, order="F")
+    valid = np.zeros((n_bars, n_configs), dtype=bool, order="F")
+    for k, (_, _, window) in enumerate(configs):
+        if window > 0:
+            valid[: max(n_bars - window, 0), k] = True
+
+    if n_bars > 1 and max_window > 0:
+        tp_values = sorted({tp for tp, _, _ in configs})
+        sl_values = sorted({sl for _, sl, _ in configs})
+
+        # Dopełnienie końca, żeby każda świeca miała pełną ścieżkę max_window (padding nigdy nie trafia bariery).
+        high_windows = sliding_window_view(np.r_[high[1:], np.full(max_window, -np.inf)], max_window)
+        low_windows = sliding_window_view(np.r_[low[1:], np.full(max_window, np.inf)], max_window)
+        step = max(chunk_size // max_window, 1)
+
+        for start in range(0, n_bars, step):
+            stop = min(start + step, n_bars)
+            entry_price = close[start:stop]
+
+            # fmax/fmin pomijają NaN - jak w pętli referencyjnej, gdzie porównanie z NaN nie jest trafieniem.
+            high_path = np.fmax.accumulate(high_windows[start:stop], axis=1)
+            low_path = np.fmin.accumulate(low_windows[start:stop], axis=1)
+
+            # Trafienia tworzą sufiks ścieżki, więc indeks pierwszego = max_window - liczba trafień.
+            tp_first = {
+                tp: max_window - (high_path >= (entry_price * (1 + tp))[:, None]).sum(axis=1)
+                for tp in tp_values
+            }
+            sl_first = {
+                sl: max_window - (low_path <= (entry_price * (1 - sl))[:, None]).sum(axis=1)
+                for sl in sl_values
+            }
+
+            rows = np.arange(start, stop)
+            timeout_return = {
+                window: close[np.minimum(rows + window, n_bars - 1)] / entry_price - 1
+                for window in {window for _, _, window in configs if window > 0}
+            }
+
+            for k, (tp, sl, window) in enumerate(configs):
+                if window <= 0:
+                    continue
+
+                tp_k = tp_first[tp]
+                sl_k = sl_first[sl]
+                is_tp = (tp_k < window) & (tp_k <= sl_k)
+                is_sl = (sl_k < window) & (sl_k < tp_k)
+
+                labels[start:stop, k] = is_tp.view(np.int8) - is_sl.view(np.int8)
+                hit_bars[start:stop, k] = np.minimum(np.minimum(tp_k, sl_k) + 1, window)
+                returns[start:stop, k] = np.where(is_tp, tp, np.where(is_sl, -sl, timeout_return[window]))
+
+        labels[~valid] = 0
+        hit_bars[~valid] = 0
+        returns[~valid] = np.nan
+
+    return TargetGrid(
+        configs=list(configs),
+        index=df.index,
+        labels=labels,
+        valid=valid,
+        hit_bars=hit_bars,
+        returns=returns,
+    )
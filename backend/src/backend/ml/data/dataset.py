@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from numpy import ndarray
+from typing import Optional
+from pandas import DataFrame, DatetimeIndex, Index
+from backend.ml.data.chunked import map_features_and_target_chunked
+from backend.ml.data.create_target import create_market_target
+from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
+from backend.monitoring.instrumentation import instrumented
+
+
+@dataclass
+class CompactDataset:
+    """
+    Zbiór treningowy w trybie kompaktowym: ciągłe tablice zamiast DataFrame.
+
+    ## Attributes:
+        :X (ndarray): Cechy float32 o kształcie (wiersze, cechy), ułożone wierszami (C-contiguous).
+        :y (ndarray): Target int8 (1, 0, -1).
+        :index (DatetimeIndex): Znaczniki czasu wierszy.
+        :columns (list[str]): Nazwy cech w kolejności kolumn X.
+
+    ## Methods:
+        :to_frame() -> DataFrame:
+            Widok DataFrame na X (bez kopiowania) do odczytu. Zapis kolumn ramki (także
+            FeatureScaler.transform(..., inplace=True)) podmienia kolumny w ramce, a nie zmienia X -
+            do skalowania X w miejscu służy FeatureScaler.transform_array(X, out=X).
+    """
+
+    X: ndarray
+    y: ndarray
+    index: DatetimeIndex
+    columns: list[str]
+
+    def to_frame(self) -> DataFrame:
+        return DataFrame(self.X, index=self.index, columns=self.columns, copy=False)
+
+
+@instrumented("build_dataset")
+def build_dataset(
+    df: DataFrame,
+    tp_pct: float = 0.015,
+    sl_pct: float = 0.01,
+    window: int = 5,
+    compact: bool = False,
+    events: Optional[Index] = None,
+    chunk_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> DataFrame | CompactDataset:
+    """
+    Buduje zbiór treningowy (cechy + target) z danych OHLCV.
+
+    Args:
+        df (DataFrame): Dane wejściowe [Open, High, Low, Close, Volume] z indeksem Datetime.
+        tp_pct (float): Próg Take Profit dla create_market_target.
+        sl_pct (float): Próg Stop Loss dla create_market_target.
+        window (int): Okno Triple Barrier.
+        compact (bool): Zamiast DataFrame float64 zwraca CompactDataset (float32/int8) bez pośrednich
+            kopii z pd.concat i dropna.
+        events (Optional[Index]): Znaczniki świec-zdarzeń (np. z cusum_events). Cechy i target są liczone
+            na wszystkich świecach (wskaźniki potrzebują historii, bariery - przyszłych cen), ale do zbioru
+            trafiają tylko zdarzenia. None oznacza wszystkie świece.
+        chunk_size (Optional[int]): Liczy cechy i target kawałkami po tyle świec, równolegle w `max_workers`
+            procesach (patrz chunked.iter_chunks). Wynik jest identyczny jak bez podziału. None - całość naraz.
+        max_workers (Optional[int]): Liczba procesów dla chunk_size (domyślnie liczba rdzeni).
+
+    Returns:
+        DataFrame | CompactDataset: [cechy..., target] bez NaN albo zbiór kompaktowy z tymi samymi wierszami.
+    """
+
+    if chunk_size is not None:
+        features, target = map_features_and_target_chunked(
+            df, chunk_size, tp_pct=tp_pct, sl_pct=sl_pct, window=window, compact=compact, max_workers=max_workers
+        )
+    else:
+        features = map_ohlcv_to_features(df, compact=compact)
+        target = create_market_target(df, tp_pct=tp_pct, sl_pct=sl_pct, window=window)
+
+    if events is not None:
+        features = features[features.index.isin(events)]
+
+    if not compact:
+        return pd.concat([features, target], axis=1).dropna()
+
+    labels = target.reindex(features.index).to_numpy()
+    valid = ~np.isnan(labels)
+
+    return CompactDataset(
+        X=np.ascontiguousarray(features.to_numpy()[valid]),
+        y=labels[valid].astype(np.int8),
+        index=features.index[valid],
+        columns=list(features.columns),
+    )
@@ -0,0 +1,163 @@
+import numpy as np
+from typing import Literal
+from numpy import ndarray
+from pandas import DataFrame, DatetimeIndex, Series
+from backend.monitoring.instrumentation import instrumented
+
+MIN_BLOCK = 16
+MAX_BLOCK = 65_536
+# Poniżej tego oczekiwanego odstępu między zdarzeniami narzut jednego wywołania NumPy na zdarzenie
+# przewyższa koszt pętli po świecach, więc silnik wektorowy przechodzi na pętlę.
+DENSE_GAP = 20.0
+
+
+def volatility_threshold(df: DataFrame, span: int = 100, multiplier: float = 1.0) -> Series:
+    """
+    Próg CUSUM skalowany zmiennością: multiplier * EWM odchylenia standardowego log-zwrotów.
+
+    Args:
+        df (DataFrame): Dane OHLCV z kolumną Close.
+        span (int): Okres EWM odchylenia standardowego.
+        multiplier (float): Ile odchyleń standardowych musi się skumulować, żeby powstało zdarzenie.
+
+    Returns:
+        Series: Próg dla każdej świecy (NaN na początku, dopóki EWM nie ma danych - wtedy brak zdarzeń).
+    """
+
+    log_returns = np.log(df["Close"]).diff()
+    return log_returns.ewm(span=span).std() * multiplier
+
+
+@instrumented("cusum_events")
+def cusum_events(
+    df: DataFrame,
+    threshold: float | Series | ndarray,
+    engine: Literal["vectorized", "loop"] = "vectorized",
+) -> DatetimeIndex:
+    """
+    Symetryczny filtr CUSUM na log-zwrotach Close (López de Prado, AFML 2.5.2.1).
+
+    Sumy S+ = max(0, S+ + r) i S- = min(0, S- + r) rosną z każdą świecą. Zdarzenie powstaje,
+    gdy S- < -h (wtedy zeruje się S-) albo S+ > h (zeruje się S+). Wybrane świece to
+    momenty, w których cena przesunęła się istotnie od ostatniego zdarzenia - zamiast
+    każdej, prawie identycznej świecy intraday.
+
+    Args:
+        df (DataFrame): Dane OHLCV z kolumną Close.
+        threshold (float | Series | ndarray): Próg h - stały albo per świeca (np. volatility_threshold).
+        engine (Literal["vectorized", "loop"]): 'loop' to referencyjna pętla po świecach, 'vectorized'
+            szuka kolejnych zdarzeń blokami na skumulowanych zwrotach (domyślnie 'vectorized').
+
+    Returns:
+        DatetimeIndex: Znaczniki czasu świec-zdarzeń.
+    """
+
+    log_close = np.log(df["Close"].to_numpy(dtype=np.float64))
+    h = np.broadcast_to(np.asarray(threshold, dtype=np.float64), log_close.shape)
+
+    if engine == "loop":
+        positions = _cusum_loop(log_close, h)
+    elif engine == "vectorized":
+        positions = _cusum_vectorized(log_close, h)
+    else:
+        raise ValueError(f"Nieznany silnik CUSUM: {engine}")
+
+    return df.index[positions]
+
+
+def _cusum_loop(log_close: ndarray, h: ndarray) -> ndarray:
+    """Referencyjna implementacja - pętla po każdej świecy."""
+    events = []
+    s_pos, s_neg = 0.0, 0.0
+    # Listy Pythona zamiast indeksowania tablic NumPy - pojedyncze odczyty są kilka razy szybsze.
+    prices, thresholds = log_close.tolist(), h.tolist()
+
+    for i in range(1, len(prices)):
+        r = prices[i] - prices[i - 1]
+        s_pos, s_neg = max(0.0, s_pos + r), min(0.0, s_neg + r)
+
+        if s_neg < -thresholds[i]:
+            s_neg = 0.0
+            events.append(i)
+        elif s_pos > thresholds[i]:
+            s_pos = 0.0
+            events.append(i)
+
+    return np.array(events, dtype=np.intp)
+
+
+def _cusum_vectorized(log_close: ndarray, h: ndarray) -> ndarray:
+    """
+    Wektorowa implementacja CUSUM.
+
+    Po wyzerowaniu w świecy p suma S+ w świecy t to C[t] - min(C[p..t]), a S- to
+    C[t] - max(C[p..t]), gdzie C to skumulowane log-zwroty. Kolejne przekroczenie progu
+    jest więc szukane wektorowo (narastające min/max w blokach) od ostatniego zerowania,
+    a pętla Pythona wykonuje się raz na zdarzenie, a nie raz na świecę. Pierwszy blok ma
+    rozmiar rzędu oczekiwanego odstępu między zdarzeniami, (h / sigma)^2. Przy gęstych
+    zdarzeniach (odstęp < DENSE_GAP) szybsza jest pętla referencyjna i to ona jest używana.
+    """
+
+    n = len(log_close)
+    if n < 2:
+        return np.array([], dtype=np.intp)
+
+    cumulative = log_close - log_close[0]
+    sigma = np.std(np.diff(cumulative))
+    expected_gap = (np.nanmedian(h) / sigma) ** 2 if sigma > 0 else np.inf
+    if expected_gap < DENSE_GAP:
+        return _cusum_loop(log_close, h)
+
+    block = int(np.clip(2 * expected_gap, MIN_BLOCK, MAX_BLOCK)) if np.isfinite(expected_gap) else MAX_BLOCK
+
+    def next_hit(reset: int, after: int, positive: bool) -> int:
+        return _next_hit(cumulative, h, reset, after, positive, block)
+
+    events = []
+    pos_reset, neg_reset = 0, 0
+    next_pos = next_hit(pos_reset, 0, positive=True)
+    next_neg = next_hit(neg_reset, 0, positive=False)
+
+    while min(next_pos, next_neg) < n:
+        # Przy przekroczeniu obu progów w tej samej świecy wygrywa S- (jak w pętli referencyjnej).
+        if next_neg <= next_pos:
+            t = next_neg
+            neg_reset = t
+            next_neg = next_hit(neg_reset, t, positive=False)
+            if next_pos == t:
+                next_pos = next_hit(pos_reset, t, positive=True)
+        else:
+            t = next_pos
+            pos_reset = t
+            next_pos = next_hit(pos_reset, t, positive=True)
+
+        events.append(t)
+
+    return np.array(events, dtype=np.intp)
+
+
+def _next_hit(cumulative: ndarray, h: ndarray, reset: int, after: int, positive: bool, block: int) -> int:
+    """Pierwsza świeca t > after, w której suma wyzerowana w `reset` przekracza próg; len(cumulative), gdy brak."""
+    n = len(cumulative)
+    extreme = cumulative[reset : after + 1].min() if positive else cumulative[reset : after + 1].max()
+    start = after + 1
+
+    while start < n:
+        stop = min(start + block, n)
+        segment = cumulative[start:stop]
+
+        if positive:
+            running = np.minimum.accumulate(np.minimum(segment, extreme))
+            hits = np.flatnonzero(segment - running > h[start:stop])
+        else:
+            running = np.maximum.accumulate(np.maximum(segment, extreme))
+            hits = np.flatnonzero(segment - running < -h[start:stop])
+
+        if len(hits):
+            return start + int(hits[0])
+
+        extreme = running[-1]
+        start, block = stop, min(block * 2, MAX_BLOCK)
+
+    return n
+
@@ -1,42 +1,102 @@
+import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 import joblib
 import os
+from typing import Iterable, Optional
+from backend.monitoring.instrumentation import instrumented
 
 class FeatureScaler:
     def __init__(self):
         self.scaler = StandardScaler()
         self.columns_to_scale = []
         self.is_fitted = False
+        self.mean_: Optional[np.ndarray] = None
+        self.inv_scale_: Optional[np.ndarray] = None
 
-    def fit_transform(self, df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    @instrumented("scaler_fit_transform")
+    def fit_transform(self, df: pd.DataFrame, columns: list[str], inplace: bool = False) -> pd.DataFrame:
         """
         Używać TYLKO na zbiorze treningowym (X_train).
         Oblicza średnią i odchylenie, a potem skaluje dane.
+        Przy inplace=True nadpisuje kolumny w przekazanym DataFrame zamiast kopiować całą ramkę.
         """
         
         self.columns_to_scale = columns
-        df_scaled = df.copy()
+        df_scaled = df if inplace else df.copy()
         scaled_values = self.scaler.fit_transform(df[columns])
         df_scaled[columns] = scaled_values
-        self.is_fitted = True
+        self._set_fitted()
         return df_scaled
 
-    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+    def partial_fit(self, chunk: pd.DataFrame | np.ndarray, columns: list[str]):
+        """
+        Aktualizuje średnią i odchylenie o kolejną porcję danych (StandardScaler.partial_fit).
+        Tablica NumPy musi mieć kolumny w kolejności `columns`.
+        """
+
+        self.columns_to_scale = columns
+        if isinstance(chunk, np.ndarray):
+            chunk = pd.DataFrame(chunk, columns=columns, copy=False)
+        self.scaler.partial_fit(chunk[columns])
+        self._set_fitted()
+
+    @instrumented("scaler_fit_chunks")
+    def fit_chunks(self, chunks: Iterable[pd.DataFrame | np.ndarray], columns: list[str]):
+        """
+        Dopasowuje skaler strumieniowo - w pamięci jest tylko jedna porcja naraz.
+        Wynik jest zgodny z fit_transform na całym zbiorze (z dokładnością do zaokrągleń).
+        """
+
+        self.scaler = StandardScaler()
+        self.is_fitted = False
+        self.mean_ = None
+        self.inv_scale_ = None
+        for chunk in chunks:
+            self.partial_fit(chunk, columns)
+
+        if not self.is_fitted:
+            raise ValueError("Brak danych do dopasowania skalera!")
+
+    @instrumented("scaler_transform")
+    def transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
         """
         Używać na zbiorze testowym (X_test) lub nowych danych live.
         Używa średniej zapamiętanej z fit_transform.
+        Przy inplace=True nadpisuje kolumny w przekazanym DataFrame zamiast kopiować całą ramkę.
         """
 
         if not self.is_fitted:
             raise ValueError("Skaler nie został wytrenowany! Użyj najpierw fit_transform na danych treningowych.")
             
-        df_scaled = df.copy()
+        df_scaled = df if inplace else df.copy()
         scaled_values = self.scaler.transform(df[self.columns_to_scale])
         df_scaled[self.columns_to_scale] = scaled_values
         
         return df_scaled
 
+    def transform_array(self, X: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Szybka ścieżka bez DataFrame: (X - mean) * (1 / scale).
+        Kolumny X muszą odpowiadać `columns_to_scale`. Podanie out=X skaluje tablicę w miejscu.
+        """
+
+        if not self.is_fitted:
+            raise ValueError("Skaler nie został wytrenowany! Użyj najpierw fit_transform na danych treningowych.")
+
+        if out is None:
+            out = np.empty_like(X, dtype=np.result_type(X.dtype, np.float32))
+        np.subtract(X, self.mean_, out=out, casting="same_kind")
+        np.multiply(out, self.inv_scale_, out=out, casting="same_kind")
+
+        return out
+
+    def _set_fitted(self):
+        """Zapamiętuje średnią i odwrotność skali, żeby transform_array nie liczył ich przy każdym wywołaniu."""
+        self.is_fitted = True
+        self.mean_ = self.scaler.mean_
+        self.inv_scale_ = 1.0 / self.scaler.scale_
+
     def save_scaler(self, path: str):
         """Zapisuje skaler do pliku"""
 
@@ -44,9 +104,40 @@ class FeatureScaler:
         joblib.dump(self.scaler, path)
         print(f"Skaler zapisany w: {path}")
 
-    def load_scaler(self, path: str, columns: list[str]):
-        """Wczytuje skaler"""
+    def load_scaler(self, path: str, columns: Optional[list[str]] = None):
+        """Wczytuje skaler. Bez podanych kolumn używa nazw zapamiętanych przez StandardScaler przy fit."""
 
         self.scaler = joblib.load(path)
-        self.columns_to_scale = columns
-        self.is_fitted = True
+        self.columns_to_scale = columns if columns is not None else list(self.scaler.feature_names_in_)
+        self._set_fitted()
+
+    def to_params(self) -> dict:
+        """Parametry skalera jako słownik JSON (kolumny, średnie, skale) - np. do nagłówka artefaktu modelu."""
+
+        if not self.is_fitted:
+            raise ValueError("Skaler nie został wytrenowany! Użyj najpierw fit_transform na danych treningowych.")
+
+        return {
+            "columns": list(self.columns_to_scale),
+            "mean": self.scaler.mean_.tolist(),
+            "scale": self.scaler.scale_.tolist(),
+            "var": self.scaler.var_.tolist(),
+            "n_samples_seen": np.asarray(self.scaler.n_samples_seen_).tolist(),
+        }
+
+    @classmethod
+    def from_params(cls, params: dict) -> "FeatureScaler":
+        """Odtwarza wytrenowany skaler z to_params() bez pliku .joblib."""
+
+        instance = cls()
+        columns = list(params["columns"])
+        instance.scaler.mean_ = np.asarray(params["mean"], dtype=np.float64)
+        instance.scaler.scale_ = np.asarray(params["scale"], dtype=np.float64)
+        instance.scaler.var_ = np.asarray(params["var"], dtype=np.float64)
+        instance.scaler.n_samples_seen_ = np.asarray(params["n_samples_seen"])
+        instance.scaler.n_features_in_ = len(columns)
+        instance.scaler.feature_names_in_ = np.asarray(columns, dtype=object)
+        instance.columns_to_scale = columns
+        instance._set_fitted()
+
+        return instance
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from typing import Optional
+from pandas import DataFrame
+from backend.ml.data.dataset import build_dataset
+from backend.ml.data.mappers.feature_graph import FEATURE_COLUMNS, OHLCV_GRAPH
+
+FEATURE_STORE_VERSION = 2
+
+
+class FeatureStore:
+    """
+    Magazyn gotowych zbiorów (cechy + target) zapisanych jako tablice mapowane w pamięci.
+
+    Wpis jest identyfikowany przez (ticker, interval, hash konfiguracji). Hash obejmuje
+    parametry Triple Barrier (`tp_pct`, `sl_pct`, `window`), listę cech i parametry grafu
+    cech (okna RSI/ATR/MACD) oraz wersję formatu. Dane są trzymane jako jedna macierz
+    `values.npy` w układzie kolumnowym (Fortran), więc `np.load(mmap_mode='r')` daje
+    DataFrame bez kopiowania. Każdy wpis ma własny `meta.json` (zapisywany atomowo na końcu),
+    a po każdym zapisie najdawniej używane wpisy są usuwane, dopóki łączny rozmiar nie
+    zmieści się w `max_bytes`.
+
+    Nie ma wspólnego pliku modyfikowanego przez wielu pisarzy, więc równoległe budowanie
+    różnych wpisów (wątki, procesy) niczego nie gubi. Odczyt oznacza użycie wpisu przez
+    mtime jego katalogu (os.utime).
+
+    ## Args:
+        :root (str): Katalog magazynu.
+        :max_bytes (Optional[int]): Limit rozmiaru wszystkich wpisów. None wyłącza eviction (domyślnie None).
+
+    ## Methods:
+        :get_or_build(ticker, interval, ohlcv, tp_pct, sl_pct, window) -> DataFrame:
+            Zwraca zbiór z magazynu albo liczy go od nowa, gdy zmieniła się konfiguracja lub dane źródłowe.
+        :load(ticker, interval, tp_pct, sl_pct, window) -> Optional[DataFrame]:
+            Otwiera zapisany zbiór (zero-copy) bez sprawdzania danych źródłowych.
+        :total_bytes() -> int:
+            Łączny rozmiar wszystkich wpisów.
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(self, root: str, max_bytes: Optional[int] = None):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def config_hash(tp_pct: float, sl_pct: float, window: int) -> str:
+        """Hash parametrów cech i targetu, stabilny między uruchomieniami."""
+        config = {
+            "tp_pct": tp_pct,
+            "sl_pct": sl_pct,
+            "window": window,
+            "features": FEATURE_COLUMNS,
+            "graph": OHLCV_GRAPH.params,
+            "version": FEATURE_STORE_VERSION,
+        }
+        payload = json.dumps(config, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()[:16]
+
+    @staticmethod
+    def source_hash(ohlcv: DataFrame) -> str:
+        """Odcisk danych OHLCV (wartości i indeks), z których liczony jest zbiór."""
+        row_hashes = pd.util.hash_pandas_object(ohlcv, index=True).values
+        return hashlib.sha256(row_hashes.tobytes()).hexdigest()[:16]
+
+    def _key(self, ticker: str, interval: str, config_hash: str) -> str:
+        safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        return f"{safe_ticker}__{interval}__{config_hash}"
+
+    def _read_meta(self, key: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(self.root, key, self.META_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _entries(self) -> dict[str, dict]:
+        """Metadane wszystkich kompletnych wpisów (katalogów z meta.json)."""
+        entries = {}
+        for name in os.listdir(self.root):
+            meta = self._read_meta(name)
+            if meta is not None:
+                entries[name] = meta
+        return entries
+
+    def get_or_build(
+        self,
+        ticker: str,
+        interval: str,
+        ohlcv: DataFrame,
+        tp_pct: float = 0.015,
+        sl_pct: float = 0.01,
+        window: int = 5,
+    ) -> DataFrame:
+        """
+        Zwraca zbiór [cechy..., target] bez NaN, tak jak w `start_dev`.
+
+        Args:
+            ticker (str): Symbol, np. 'AAPL'.
+            interval (str): Interwał świec, np. '1d'.
+            ohlcv (DataFrame): Dane źródłowe [Open, High, Low, Close, Volume].
+            tp_pct (float): Próg Take Profit dla create_market_target.
+            sl_pct (float): Próg Stop Loss dla create_market_target.
+            window (int): Okno Triple Barrier.
+
+        Returns:
+            DataFrame: Zbiór z magazynu (tylko do odczytu) albo świeżo policzony i zapisany.
+        """
+
+        config_hash = self.config_hash(tp_pct, sl_pct, window)
+        key = self._key(ticker, interval, config_hash)
+        source_hash = self.source_hash(ohlcv)
+
+        entry = self._read_meta(key)
+        if entry is not None and entry["source_hash"] == source_hash:
+            dataset = self._open(key)
+            if dataset is not None:
+                return dataset
+
+        dataset = build_dataset(ohlcv, tp_pct=tp_pct, sl_pct=sl_pct, window=window)
+
+        self._save(
+            key,
+            dataset,
+            {
+                "ticker": ticker,
+                "interval": interval,
+                "config": {"tp_pct": tp_pct, "sl_pct": sl_pct, "window": window},
+                "source_hash": source_hash,
+            },
+        )
+
+        return dataset
+
+    def load(
+        self,
+        ticker: str,
+        interval: str,
+        tp_pct: float = 0.015,
+        sl_pct: float = 0.01,
+        window: int = 5,
+    ) -> Optional[DataFrame]:
+        """Otwiera zapisany zbiór (np. w API, gdzie nie ma danych źródłowych). Zwraca None, gdy brak wpisu."""
+        key = self._key(ticker, interval, self.config_hash(tp_pct, sl_pct, window))
+        return self._open(key)
+
+    def total_bytes(self) -> int:
+        return sum(entry["bytes"] for entry in self._entries().values())
+
+    def _open(self, key: str) -> Optional[DataFrame]:
+        entry = self._read_meta(key)
+        if entry is None:
+            return None
+
+        entry_dir = os.path.join(self.root, key)
+        try:
+            values = np.load(os.path.join(entry_dir, "values.npy"), mmap_mode="r")
+            index_values = np.load(os.path.join(entry_dir, "index.npy"), mmap_mode="r")
+        except FileNotFoundError:
+            return None
+
+        if len(values) != entry["rows"] or len(index_values) != entry["rows"]:
+            return None
+
+        index = pd.DatetimeIndex(pd.to_datetime(np.asarray(index_values), utc=True))
+        index = index.tz_convert(entry["tz"]) if entry["tz"] else index.tz_localize(None)
+        index.name = entry["index_name"]
+
+        self._touch(entry_dir)
+
+        # values ma układ Fortran, więc values.T to ciągły blok kolumn - pandas go nie kopiuje.
+        return DataFrame(values, index=index, columns=entry["columns"], copy=False)
+
+    def _save(self, key: str, dataset: DataFrame, entry: dict):
+        entry_dir = os.path.join(self.root, key)
+        os.makedirs(entry_dir, exist_ok=True)
+
+        index = dataset.index
+        tz = str(index.tz) if index.tz is not None else None
+        utc_index = index.tz_convert("UTC") if tz else index.tz_localize("UTC")
+
+        values = np.asfortranarray(dataset.to_numpy(dtype=np.float64))
+        for name, array in [("values.npy", values), ("index.npy", utc_index.asi8)]:
+            tmp_path = _tmp_path(entry_dir, name)
+            with open(tmp_path, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp_path, os.path.join(entry_dir, name))
+
+        meta = {
+            **entry,
+            "columns": list(dataset.columns),
+            "rows": len(dataset),
+            "tz": tz,
+            "index_name": index.name,
+            "bytes": values.nbytes + utc_index.asi8.nbytes,
+            "created_at": time.time(),
+        }
+        # meta.json na końcu - jego obecność oznacza kompletny wpis.
+        tmp_path = _tmp_path(entry_dir, self.META_FILE)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(entry_dir, self.META_FILE))
+
+        self._touch(entry_dir)
+        self._evict(keep=key)
+
+    def _evict(self, keep: str):
+        """Usuwa najdawniej używane wpisy, dopóki magazyn przekracza max_bytes."""
+        if self.max_bytes is None:
+            return
+
+        entries = self._entries()
+        total = sum(entry["bytes"] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: self._last_access(k, entries[k])):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+
+            total -= entries[key]["bytes"]
+            shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+
+    @staticmethod
+    def _touch(entry_dir: str):
+        """Oznacza użycie wpisu: mtime katalogu wpisu to czas ostatniego dostępu."""
+        try:
+            os.utime(entry_dir)
+        except OSError:
+            pass
+
+    def _last_access(self, key: str, entry: dict) -> float:
+        try:
+            return os.path.getmtime(os.path.join(self.root, key))
+        except OSError:
+            return entry.get("created_at", 0.0)
+
+
+def _tmp_path(directory: str, name: str) -> str:
+    """Unikalny plik tymczasowy w katalogu wpisu - równolegli pisarze nie podmieniają sobie plików."""
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=name + ".", suffix=".tmp")
+    os.close(fd)
+    return tmp_path
@@ -0,0 +1,253 @@
+import asyncio
+import random
+import time
+import weakref
+import yfinance as yf
+from dataclasses import dataclass
+from typing import Optional, Protocol
+from pandas import DataFrame
+from yfinance.exceptions import YFRateLimitError
+from backend.ml.data.fetchers.errors import EmptyDataError, RateLimitError
+from backend.ml.data.fetchers.yahoo_fetcher import REQUIRED_COLS, FetchResult
+
+
+class FetchBackend(Protocol):
+    """Źródło świec OHLCV dla AsyncFetcher."""
+
+    async def download(
+        self, ticker: str, interval: str, start_date: Optional[str], period: str
+    ) -> DataFrame: ...
+
+
+class YFinanceBackend:
+    """
+    Produkcyjne źródło: yf.Ticker(...).history w wątku roboczym, żeby nie blokować pętli zdarzeń (np. FastAPI).
+
+    W przeciwieństwie do yf.download (który łapie błędy pojedynczych tickerów i zwraca pustą ramkę)
+    Ticker.history zgłasza limit zapytań wyjątkiem YFRateLimitError - ten staje się RateLimitError
+    i jest ponawiany przez AsyncFetcher. Pusta ramka to EmptyDataError.
+    """
+
+    async def download(
+        self, ticker: str, interval: str, start_date: Optional[str], period: str
+    ) -> DataFrame:
+        try:
+            return await asyncio.to_thread(self._history, ticker, interval, start_date, period)
+        except YFRateLimitError as e:
+            raise RateLimitError(str(e)) from e
+
+    @staticmethod
+    def _history(ticker: str, interval: str, start_date: Optional[str], period: str) -> DataFrame:
+        history = yf.Ticker(ticker)
+        if start_date is not None:
+            df = history.history(interval=interval, start=start_date)
+        else:
+            df = history.history(interval=interval, period=period)
+
+        if df.empty:
+            raise EmptyDataError("CRITICAL: Nie udało się pobrać danych.")
+
+        return df[REQUIRED_COLS].dropna()
+
+
+class FakeBackend:
+    """
+    Lokalne źródło w pamięci procesu - do testów przepustowości i ponowień bez sieci.
+
+    ## Args:
+        :data (dict[str, DataFrame]): Świece zwracane dla tickerów. Nieznany ticker daje EmptyDataError.
+        :latency_s (float): Symulowany czas odpowiedzi.
+        :failures (Optional[dict[str, list[Exception]]]): Kolejka błędów per ticker - kolejne wywołania
+            rzucają je po kolei, a dopiero potem zwracają dane.
+
+    ## Attributes:
+        :calls (list[tuple[str, float]]): (ticker, time.monotonic()) każdego wywołania.
+        :max_active (int): Największa liczba równoczesnych wywołań.
+    """
+
+    def __init__(
+        self,
+        data: dict[str, DataFrame],
+        latency_s: float = 0.0,
+        failures: Optional[dict[str, list[Exception]]] = None,
+    ):
+        self.data = data
+        self.latency_s = latency_s
+        self.failures = {ticker: list(errors) for ticker, errors in (failures or {}).items()}
+        self.calls: list[tuple[str, float]] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def download(
+        self, ticker: str, interval: str, start_date: Optional[str], period: str
+    ) -> DataFrame:
+        self.calls.append((ticker, time.monotonic()))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+
+        try:
+            await asyncio.sleep(self.latency_s)
+
+            pending = self.failures.get(ticker)
+            if pending:
+                raise pending.pop(0)
+
+            if ticker not in self.data:
+                raise EmptyDataError("CRITICAL: Nie udało się pobrać danych.")
+
+            return self.data[ticker].copy()
+        finally:
+            self.active -= 1
+
+
+class TokenBucket:
+    """
+    Limiter zapytań typu token bucket.
+
+    Żetony przybywają w tempie `rate` na sekundę, do pojemności `capacity` (dopuszczalny
+    wybuch zapytań). Czekający są obsługiwani po kolei (FIFO). Blokada jest tworzona osobno
+    dla każdej pętli zdarzeń, więc kubełek można używać w kolejnych asyncio.run.
+
+    ## Args:
+        :rate (float): Średnia liczba zapytań na sekundę.
+        :capacity (Optional[float]): Pojemność kubełka (domyślnie max(rate, 1)).
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate musi być dodatnie.")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = weakref.WeakKeyDictionary()
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+
+        async with lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class FetchStats:
+    """Liczniki AsyncFetcher: wysłane zapytania, ponowienia i ostateczne porażki."""
+
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+
+
+class AsyncFetcher:
+    """
+    Asynchroniczne pobieranie świec z limitem zapytań, ograniczoną współbieżnością i ponowieniami.
+
+    Każda próba czeka na żeton z TokenBucket i na wolne miejsce w semaforze. Błędy z
+    `retry_on` (domyślnie limit zapytań i błędy sieci) są ponawiane z wykładniczym
+    opóźnieniem z pełnym jitterem: losowo z [0, min(backoff_max_s, backoff_base_s * 2^próba)].
+    Pozostałe błędy, np. EmptyDataError dla błędnego tickera, są zgłaszane od razu.
+
+    ## Args:
+        :backend (Optional[FetchBackend]): Źródło danych (domyślnie YFinanceBackend).
+        :rate_per_s (float): Średni limit zapytań na sekundę (domyślnie 2).
+        :burst (Optional[float]): Pojemność kubełka żetonów (domyślnie max(rate_per_s, 1)).
+        :max_concurrency (int): Maksymalna liczba zapytań w toku (domyślnie 4).
+        :max_retries (int): Liczba ponowień po pierwszej próbie (domyślnie 3).
+        :backoff_base_s (float): Bazowe opóźnienie ponowienia w sekundach (domyślnie 1).
+        :backoff_max_s (float): Górny limit opóźnienia w sekundach (domyślnie 30).
+        :retry_on (tuple[type[Exception], ...]): Typy błędów, które są ponawiane.
+
+    ## Methods:
+        :fetch(ticker, interval, start_date, period) -> DataFrame:
+            Pobiera jeden ticker (z ponowieniami).
+        :fetch_many(tickers, interval, start_date, period) -> list[FetchResult]:
+            Pobiera wiele tickerów współbieżnie; błąd jednego nie przerywa reszty.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[FetchBackend] = None,
+        rate_per_s: float = 2.0,
+        burst: Optional[float] = None,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        backoff_base_s: float = 1.0,
+        backoff_max_s: float = 30.0,
+        retry_on: tuple[type[Exception], ...] = (RateLimitError, ConnectionError, TimeoutError),
+    ):
+        self.backend = backend or YFinanceBackend()
+        self.limiter = TokenBucket(rate_per_s, burst)
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.retry_on = retry_on
+        self.stats = FetchStats()
+        self.max_concurrency = max_concurrency
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Semafor bieżącej pętli zdarzeń (jak blokada TokenBucket - fetcher działa w kolejnych asyncio.run)."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2**attempt))
+
+    async def fetch(
+        self,
+        ticker: str,
+        interval: str = '1d',
+        start_date: Optional[str] = None,
+        period: str = 'max',
+    ) -> DataFrame:
+        attempt = 0
+
+        while True:
+            async with self._semaphore():
+                await self.limiter.acquire()
+                self.stats.requests += 1
+                try:
+                    return await self.backend.download(ticker, interval, start_date, period)
+                except self.retry_on:
+                    if attempt >= self.max_retries:
+                        self.stats.failures += 1
+                        raise
+                except Exception:
+                    self.stats.failures += 1
+                    raise
+
+            # Opóźnienie poza semaforem - czekający na ponowienie nie blokuje innych tickerów.
+            await asyncio.sleep(self._backoff(attempt))
+            self.stats.retries += 1
+            attempt += 1
+
+    async def fetch_many(
+        self,
+        tickers: list[str],
+        interval: str = '1d',
+        start_date: Optional[str] = None,
+        period: str = 'max',
+    ) -> list[FetchResult]:
+        async def fetch_one(ticker: str) -> FetchResult:
+            try:
+                return FetchResult(ticker=ticker, data=await self.fetch(ticker, interval, start_date, period))
+            except Exception as e:
+                return FetchResult(ticker=ticker, error=e)
+
+        return await asyncio.gather(*(fetch_one(ticker) for ticker in dict.fromkeys(tickers)))
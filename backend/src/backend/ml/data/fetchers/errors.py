@@ -0,0 +1,10 @@
+class FetchError(Exception):
+    """Bazowy błąd pobierania danych rynkowych."""
+
+
+class EmptyDataError(FetchError, ValueError):
+    """Źródło zwróciło pustą ramkę (np. błędny ticker). Dziedziczy po ValueError dla zgodności wstecznej."""
+
+
+class RateLimitError(FetchError):
+    """Źródło odrzuciło zapytanie z powodu limitu zapytań - warto ponowić po chwili."""
@@ -0,0 +1,153 @@
+import json
+import os
+import re
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from datetime import timedelta
+from typing import Optional
+from pandas import DataFrame
+
+
+class OhlcvCache:
+    """
+    Lokalny, kolumnowy cache świec OHLCV na dysku.
+
+    Każdy klucz (ticker, interval) to osobny katalog z jedną tablicą `.npy` na kolumnę,
+    indeksem czasu (int64, ns UTC) oraz plikiem `meta.json`. Tablice są czytane przez
+    `np.load(mmap_mode='r')`, więc odczyt nie wymaga parsowania ani sieci.
+
+    ## Args:
+        :root (str): Katalog główny cache.
+        :max_age (Optional[timedelta]): Polityka świeżości. Jeśli ostatnie pobranie jest młodsze
+            niż `max_age`, dane są zwracane z dysku bez zapytania do sieci. None oznacza, że
+            każde wywołanie dociąga nowe świece (domyślnie None).
+
+    ## Methods:
+        :read(ticker, interval) -> Optional[DataFrame]:
+            Zwraca zapisane świece albo None, gdy klucza nie ma lub zapis jest niespójny.
+        :write(ticker, interval, df, coverage):
+            Nadpisuje świece dla klucza i zapisuje czas pobrania.
+        :touch(ticker, interval):
+            Odnawia czas pobrania bez zmiany świec (np. po dociągnięciu, które nie przyniosło nowych świec).
+        :is_fresh(ticker, interval) -> bool:
+            Sprawdza politykę świeżości dla klucza.
+        :coverage(ticker, interval) -> Optional[str]:
+            Zwraca opis zakresu (start_date/period), z jakim klucz został pierwotnie pobrany.
+    """
+
+    META_FILE = "meta.json"
+    INDEX_FILE = "index.npy"
+
+    def __init__(self, root: str, max_age: Optional[timedelta] = None):
+        self.root = root
+        self.max_age = max_age
+
+    def _key_dir(self, ticker: str, interval: str) -> str:
+        """Zamienia (ticker, interval) na bezpieczną nazwę katalogu."""
+        safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        return os.path.join(self.root, f"{safe_ticker}__{interval}")
+
+    def _read_meta(self, ticker: str, interval: str) -> Optional[dict]:
+        meta_path = os.path.join(self._key_dir(ticker, interval), self.META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def read(self, ticker: str, interval: str) -> Optional[DataFrame]:
+        """Wczytuje świece z dysku (mmap) i odtwarza indeks Datetime."""
+        meta = self._read_meta(ticker, interval)
+        if meta is None:
+            return None
+
+        key_dir = self._key_dir(ticker, interval)
+        try:
+            index_values = np.load(os.path.join(key_dir, self.INDEX_FILE), mmap_mode="r")
+            columns = {
+                col: np.load(os.path.join(key_dir, f"{col}.npy"), mmap_mode="r")
+                for col in meta["columns"]
+            }
+        except FileNotFoundError:
+            return None
+
+        if any(len(values) != meta["rows"] for values in [index_values, *columns.values()]):
+            return None
+
+        index = pd.DatetimeIndex(pd.to_datetime(np.asarray(index_values), utc=True))
+        index = index.tz_convert(meta["tz"]) if meta["tz"] else index.tz_localize(None)
+        index.name = meta["index_name"]
+
+        return DataFrame(columns, index=index)
+
+    def write(self, ticker: str, interval: str, df: DataFrame, coverage: str):
+        """Zapisuje świece kolumnowo. Plik meta.json jest zapisywany na końcu, jako znacznik spójności."""
+        key_dir = self._key_dir(ticker, interval)
+        os.makedirs(key_dir, exist_ok=True)
+
+        index = df.index
+        tz = str(index.tz) if index.tz is not None else None
+        utc_index = index.tz_convert("UTC") if tz else index.tz_localize("UTC")
+
+        _atomic_save(os.path.join(key_dir, self.INDEX_FILE), utc_index.asi8)
+        for col in df.columns:
+            _atomic_save(os.path.join(key_dir, f"{col}.npy"), df[col].to_numpy())
+
+        meta = {
+            "columns": list(df.columns),
+            "rows": len(df),
+            "tz": tz,
+            "index_name": index.name,
+            "coverage": coverage,
+            "fetched_at": time.time(),
+        }
+        _atomic_write_json(os.path.join(key_dir, self.META_FILE), meta)
+
+    def touch(self, ticker: str, interval: str):
+        """Ustawia fetched_at na teraz, żeby polityka max_age liczyła się od tego sprawdzenia."""
+        meta = self._read_meta(ticker, interval)
+        if meta is None:
+            return
+
+        meta["fetched_at"] = time.time()
+        _atomic_write_json(os.path.join(self._key_dir(ticker, interval), self.META_FILE), meta)
+
+    def is_fresh(self, ticker: str, interval: str) -> bool:
+        """Zwraca True, jeśli klucz był pobrany nie dawniej niż `max_age` temu."""
+        if self.max_age is None:
+            return False
+
+        meta = self._read_meta(ticker, interval)
+        if meta is None:
+            return False
+
+        return time.time() - meta["fetched_at"] <= self.max_age.total_seconds()
+
+    def coverage(self, ticker: str, interval: str) -> Optional[str]:
+        """Zwraca zakres pierwotnego pobrania zapisany w meta.json."""
+        meta = self._read_meta(ticker, interval)
+        return None if meta is None else meta["coverage"]
+
+
+def _atomic_save(path: str, values: np.ndarray):
+    """Zapisuje tablicę do pliku tymczasowego i podmienia go atomowo."""
+    tmp_path = _tmp_path(path)
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(values))
+    os.replace(tmp_path, path)
+
+
+def _atomic_write_json(path: str, payload: dict):
+    tmp_path = _tmp_path(path)
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def _tmp_path(path: str) -> str:
+    """Unikalny plik tymczasowy obok `path` - równolegli pisarze tego samego klucza nie podmieniają sobie plików."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)
+    return tmp_path
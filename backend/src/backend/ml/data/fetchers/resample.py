@@ -0,0 +1,153 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import Optional
+from pandas import DataFrame, DatetimeIndex
+from backend.ml.data.fetchers.ohlcv_cache import OhlcvCache
+from backend.ml.data.fetchers.yahoo_fetcher import REQUIRED_COLS, fetch_history
+
+# Interwały kalendarzowe yfinance i ich przybliżona długość (tylko do wyboru najdrobniejszego).
+CALENDAR_INTERVALS = {
+    "1d": pd.Timedelta(days=1),
+    "1wk": pd.Timedelta(days=7),
+    "1mo": pd.Timedelta(days=30),
+    "3mo": pd.Timedelta(days=91),
+}
+
+_INTRADAY_PATTERN = re.compile(r"^(\d+)(m|h)$")
+
+
+def interval_length(interval: str) -> pd.Timedelta:
+    """
+    Długość interwału yfinance, np. '15m' -> 15 minut, '1h' -> 1 godzina, '1wk' -> 7 dni.
+
+    Raises:
+        ValueError: Dla interwału, którego nie da się odtworzyć lokalnie (np. '5d').
+    """
+
+    if interval in CALENDAR_INTERVALS:
+        return CALENDAR_INTERVALS[interval]
+
+    match = _INTRADAY_PATTERN.match(interval)
+    if match is None:
+        raise ValueError(f"Nieobsługiwany interwał: {interval}")
+
+    value, unit = match.groups()
+    return pd.Timedelta(minutes=int(value)) if unit == "m" else pd.Timedelta(hours=int(value))
+
+
+def resample_ohlcv(df: DataFrame, interval: str, session_open: Optional[str] = None) -> DataFrame:
+    """
+    Składa świece z drobniejszego interwału w grubsze (Open=first, High=max, Low=min, Close=last, Volume=sum).
+
+    Kubełki nigdy nie przekraczają granicy dnia sesyjnego, liczonego w strefie czasowej
+    indeksu (yfinance zwraca intraday w strefie giełdy, więc zmiana czasu letniego nie
+    przesuwa sesji). Kubełki intraday są zakotwiczone na otwarciu sesji - dla NYSE
+    15m -> 1h daje świece 09:30, 10:30, ..., 15:30, tak jak yfinance. Świece dzienne i
+    dłuższe dostają etykietę północy bez strefy, jak w `yf.download(interval='1d')`.
+    Close dnia to ostatnia świeca intraday, więc może minimalnie odbiegać od oficjalnego
+    kursu zamknięcia z aukcji. Ostatni kubełek może być niepełny (trwająca sesja).
+
+    Args:
+        df (DataFrame): Świece [Open, High, Low, Close, Volume] z indeksem Datetime.
+        interval (str): Interwał docelowy: 'Nm', 'Nh', '1d', '1wk', '1mo' lub '3mo'.
+        session_open (Optional[str]): Godzina otwarcia sesji, np. '09:30'. Jeśli None, kotwicą
+            jest pierwsza świeca danego dnia.
+
+    Returns:
+        DataFrame: Świece w interwale docelowym, kolumny [Open, High, Low, Close, Volume].
+    """
+
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    if df.empty:
+        return df[REQUIRED_COLS].copy()
+
+    labels = _bucket_labels(df.index, interval, session_open)
+    label_values = labels.asi8
+    starts = np.flatnonzero(np.r_[True, label_values[1:] != label_values[:-1]])
+    ends = np.r_[starts[1:], len(df)] - 1
+
+    return DataFrame(
+        {
+            "Open": df["Open"].to_numpy()[starts],
+            "High": np.maximum.reduceat(df["High"].to_numpy(), starts),
+            "Low": np.minimum.reduceat(df["Low"].to_numpy(), starts),
+            "Close": df["Close"].to_numpy()[ends],
+            "Volume": np.add.reduceat(df["Volume"].to_numpy(), starts),
+        },
+        index=labels[starts],
+    )
+
+
+def fetch_history_multi(
+    ticker: str,
+    intervals: list[str],
+    start_date: Optional[str] = None,
+    period: str = 'max',
+    cache: Optional[OhlcvCache] = None,
+    base_interval: Optional[str] = None,
+    session_open: Optional[str] = None,
+) -> dict[str, DataFrame]:
+    """
+        Pobiera świece raz, w najdrobniejszym interwale, i wylicza z nich pozostałe interwały lokalnie.
+
+        Zakres historii jest ograniczony przez interwał bazowy (np. Yahoo daje świece 15m
+        tylko z ostatnich 60 dni), więc interwały wyliczone mają ten sam zakres. Zbiory dla
+        kilku interwałów: `{iv: build_dataset(df) for iv, df in fetch_history_multi(...).items()}`.
+
+        Args:
+            ticker (str): np. 'AAPL', 'BTC-USD'
+            intervals (list[str]): Interwały wynikowe, np. ['15m', '1h', '1d'].
+            start_date (str): Format 'YYYY-MM-DD'. Jeśli None, bierze 'period'.
+            period (str): '1y', '5y', 'max' (używane gdy brak start_date)
+            cache (Optional[OhlcvCache]): Lokalny cache świec przekazywany do fetch_history.
+            base_interval (Optional[str]): Interwał pobierany z sieci (domyślnie najdrobniejszy z `intervals`).
+            session_open (Optional[str]): Godzina otwarcia sesji dla resample_ohlcv.
+
+        Returns:
+            dict[str, DataFrame]: Świece OHLCV dla każdego interwału z `intervals`.
+    """
+
+    base_interval = base_interval or min(intervals, key=interval_length)
+    base = fetch_history(ticker, interval=base_interval, start_date=start_date, period=period, cache=cache)
+
+    return {
+        interval: base if interval == base_interval else resample_ohlcv(base, interval, session_open)
+        for interval in intervals
+    }
+
+
+def _bucket_labels(index: DatetimeIndex, interval: str, session_open: Optional[str]) -> DatetimeIndex:
+    """Etykieta kubełka (początek świecy docelowej) dla każdego wiersza."""
+    index = index.as_unit("ns")
+    days = index.normalize()
+
+    if interval in CALENDAR_INTERVALS:
+        if index.tz is not None:
+            days = days.tz_localize(None)
+        if interval == "1d":
+            return days
+        if interval == "1wk":
+            return days - pd.to_timedelta(days.weekday, unit="D")
+        months = days.to_period("M") if interval == "1mo" else days.to_period("Q")
+        return months.to_timestamp()
+
+    step = interval_length(interval).value
+
+    if session_open is not None:
+        hours, minutes = (int(part) for part in session_open.split(":"))
+        # Otwarcie liczone w czasie lokalnym, żeby dni zmiany czasu nie przesuwały sesji o godzinę.
+        # Godzina powtórzona przy cofnięciu zegara: sesja startuje przy pierwszym wystąpieniu (czas letni).
+        anchor = days.tz_localize(None) + pd.Timedelta(hours=hours, minutes=minutes)
+        if index.tz is not None:
+            anchor = anchor.tz_localize(index.tz, nonexistent="shift_forward", ambiguous=np.ones(len(anchor), dtype=bool))
+    else:
+        # Pierwsza świeca każdego dnia (indeks jest posortowany).
+        day_values = days.asi8
+        new_day = np.r_[True, day_values[1:] != day_values[:-1]]
+        anchor = index[np.flatnonzero(new_day)][np.cumsum(new_day) - 1]
+
+    offsets = index.asi8 - anchor.asi8
+    return anchor + pd.to_timedelta((offsets // step) * step, unit="ns")
@@ -1,35 +1,156 @@
 import yfinance as yf
 import pandas as pd
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+from backend.ml.data.fetchers.errors import EmptyDataError
+from backend.ml.data.fetchers.ohlcv_cache import OhlcvCache
+from backend.monitoring.instrumentation import instrumented
 
-def fetch_history(ticker: str, interval: str = '1d', start_date: Optional[str] = None, period: str = 'max') -> pd.DataFrame:
+REQUIRED_COLS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+@instrumented("fetch_history")
+def fetch_history(
+    ticker: str,
+    interval: str = '1d',
+    start_date: Optional[str] = None,
+    period: str = 'max',
+    cache: Optional[OhlcvCache] = None,
+) -> pd.DataFrame:
     """
         Pobiera dane historyczne OHLCV.
-        
+
         Args:
             ticker (str): np. 'AAPL', 'BTC-USD'
             interval (str): '1d', '1h', '15m'
             start_date (str): Format 'YYYY-MM-DD'. Jeśli None, bierze 'period'.
             period (str): '1y', '5y', 'max' (używane gdy brak start_date)
-            
+            cache (Optional[OhlcvCache]): Lokalny cache świec. Jeśli podany, pobierane są tylko
+                świece od ostatniego zapisanego znacznika czasu (lub żadne, gdy cache jest świeży).
+
         Returns:
             pd.DataFrame: Kolumny [Open, High, Low, Close, Volume] z indeksem Datetime
     """
 
+    if cache is None:
+        return _download(ticker, interval, start_date, period)
+
+    coverage = f"start={start_date}" if start_date is not None else f"period={period}"
+    cached = cache.read(ticker, interval)
+
+    if cached is None or cached.empty or cache.coverage(ticker, interval) != coverage:
+        df = _download(ticker, interval, start_date, period)
+        cache.write(ticker, interval, df, coverage)
+        return df
+
+    if cache.is_fresh(ticker, interval):
+        return cached
+
+    last_timestamp = cached.index[-1]
+    try:
+        new_bars = _download(ticker, interval, last_timestamp, period)
+    except EmptyDataError:
+        new_bars = cached.iloc[0:0]
+
+    # Brak nowych świec - świece zostają bez zmian, a odnowiony czas pobrania pozwala max_age zadziałać.
+    if new_bars.empty:
+        cache.touch(ticker, interval)
+        return cached
+
+    # Ostatnia zapisana świeca mogła być niedomknięta, więc jej nowa wersja (jeśli przyszła) ją nadpisuje.
+    df = pd.concat([cached, new_bars])
+    df = df[~df.index.duplicated(keep='last')]
+
+    cache.write(ticker, interval, df, coverage)
+
+    return df
+
+
+@dataclass
+class FetchResult:
+    """
+    Wynik pobrania pojedynczego tickera w fetch_history_many.
+
+    ## Attributes:
+        :ticker (str): Symbol, którego dotyczy wynik.
+        :data (Optional[pd.DataFrame]): Świece OHLCV albo None, gdy pobranie się nie udało.
+        :error (Optional[Exception]): Błąd pobrania albo None przy sukcesie.
+    """
+
+    ticker: str
+    data: Optional[pd.DataFrame] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def fetch_history_many(
+    tickers: list[str],
+    interval: str = '1d',
+    start_date: Optional[str] = None,
+    period: str = 'max',
+    cache: Optional[OhlcvCache] = None,
+    max_workers: int = 8,
+    fetch_fn: Optional[Callable[..., pd.DataFrame]] = None,
+) -> Iterator[FetchResult]:
+    """
+        Pobiera historię OHLCV dla wielu tickerów równolegle (ograniczona pula wątków).
+
+        Wyniki są zwracane strumieniowo, w kolejności ukończenia pobrań. Błąd jednego
+        tickera (np. ValueError dla pustych danych) trafia do jego FetchResult i nie
+        przerywa reszty paczki.
+
+        Args:
+            tickers (list[str]): Lista symboli, np. ['AAPL', 'MSFT']. Duplikaty są pomijane.
+            interval (str): '1d', '1h', '15m'
+            start_date (str): Format 'YYYY-MM-DD'. Jeśli None, bierze 'period'.
+            period (str): '1y', '5y', 'max' (używane gdy brak start_date)
+            cache (Optional[OhlcvCache]): Lokalny cache świec przekazywany do fetch_history.
+            max_workers (int): Maksymalna liczba równoległych pobrań (domyślnie 8).
+            fetch_fn (Optional[Callable[..., pd.DataFrame]]): Funkcja pobierająca jeden ticker
+                o sygnaturze fetch_history (domyślnie fetch_history). Pozwala podmienić źródło danych w testach.
+
+        Returns:
+            Iterator[FetchResult]: Po jednym wyniku na ticker.
+    """
+
+    fetch_fn = fetch_fn or fetch_history
+    unique_tickers = list(dict.fromkeys(tickers))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                fetch_fn, ticker, interval=interval, start_date=start_date, period=period, cache=cache
+            ): ticker
+            for ticker in unique_tickers
+        }
+
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                yield FetchResult(ticker=ticker, data=future.result())
+            except Exception as e:
+                yield FetchResult(ticker=ticker, error=e)
+
+
+def _download(ticker: str, interval: str, start_date: Optional[str | pd.Timestamp], period: str) -> pd.DataFrame:
+    """Pobiera świece z yfinance i sprowadza je do kolumn [Open, High, Low, Close, Volume]."""
+
     if start_date is not None:
         df = yf.download(tickers=ticker, interval=interval, start=start_date, progress=False)
     else:
         df = yf.download(tickers=ticker, interval=interval, period=period, progress=False)
 
     if df.empty:
-        raise ValueError(f"CRITICAL: Nie udało się pobrać danych.")
-        
+        raise EmptyDataError(f"CRITICAL: Nie udało się pobrać danych.")
+
     if isinstance(df.columns, pd.MultiIndex):
         df.columns = df.columns.droplevel(1)
 
-    required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
-    df = df[required_cols].copy()
-    df.dropna(inplace=True)
+    # Wybór listy kolumn tworzy już nowy DataFrame, więc osobne .copy() nie jest potrzebne.
+    df = df[REQUIRED_COLS].dropna()
 
     return df
-
@@ -0,0 +1,183 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Optional
+from pandas import DataFrame, Series
+
+FEATURE_COLUMNS = [
+    "log_returns",
+    "rsi",
+    "macd",
+    "macd_hist",
+    "atr",
+    "hour_sin",
+    "hour_cos",
+    "day_sin",
+    "day_cos",
+]
+
+
+@dataclass(frozen=True)
+class FeatureNode:
+    """
+    Węzeł grafu cech: nazwa, nazwy wejść i funkcja liczona na ich wartościach.
+
+    ## Attributes:
+        :name (str): Nazwa węzła (cechy albo wyniku pośredniego).
+        :inputs (tuple[str, ...]): Węzły, od których zależy (kolumny OHLCV to 'open', 'high', 'low', 'close', 'index').
+        :fn (Callable[..., Series | np.ndarray]): Funkcja przyjmująca wartości wejść w kolejności `inputs`.
+    """
+
+    name: str
+    inputs: tuple[str, ...]
+    fn: Callable[..., Series | np.ndarray]
+
+
+class FeatureGraph:
+    """
+    Deklaratywny graf cech z pamięcią wyników pośrednich.
+
+    Każda cecha deklaruje swoje wejścia, a wspólne etapy (EMA, różnice, true range,
+    wygładzanie Wildera) są osobnymi węzłami. `compute` liczy każdy potrzebny węzeł
+    dokładnie raz na wywołanie, więc np. EMA 12/26 są wspólne dla `macd` i `macd_hist`.
+
+    ## Args:
+        :params (Optional[dict]): Parametry, z którymi zbudowano graf (np. okna wskaźników) - np. do kluczy cache.
+
+    ## Methods:
+        :add(name, inputs, fn):
+            Rejestruje węzeł.
+        :compute(df, outputs) -> dict[str, Series | ndarray]:
+            Liczy wskazane węzły (i ich zależności) dla danych OHLCV.
+    """
+
+    SOURCES = {
+        "open": lambda df: df["Open"],
+        "high": lambda df: df["High"],
+        "low": lambda df: df["Low"],
+        "close": lambda df: df["Close"],
+        "index": lambda df: df.index,
+    }
+
+    def __init__(self, params: Optional[dict] = None):
+        self.nodes: dict[str, FeatureNode] = {}
+        self.params = dict(params or {})
+
+    def add(self, name: str, inputs: tuple[str, ...], fn: Callable[..., Series | np.ndarray]):
+        if name in self.nodes or name in self.SOURCES:
+            raise ValueError(f"Węzeł {name} jest już zdefiniowany.")
+
+        missing = [i for i in inputs if i not in self.nodes and i not in self.SOURCES]
+        if missing:
+            raise ValueError(f"Węzeł {name} zależy od niezdefiniowanych węzłów: {missing}")
+
+        self.nodes[name] = FeatureNode(name, inputs, fn)
+
+    def compute(self, df: DataFrame, outputs: list[str]) -> dict[str, Series | np.ndarray]:
+        memo: dict[str, Series | np.ndarray] = {}
+
+        def evaluate(name: str):
+            if name not in memo:
+                if name in self.SOURCES:
+                    memo[name] = self.SOURCES[name](df)
+                else:
+                    node = self.nodes[name]
+                    memo[name] = node.fn(*(evaluate(i) for i in node.inputs))
+            return memo[name]
+
+        return {name: evaluate(name) for name in outputs}
+
+
+def ema(series: Series, span: int) -> Series:
+    """EMA jak ta.utils._ema: ewm(span, min_periods=span, adjust=False)."""
+    return series.ewm(span=span, min_periods=span, adjust=False).mean()
+
+
+def wilder_ewm(series: Series, window: int) -> Series:
+    """Wygładzanie Wildera w wersji RSI z `ta`: ewm(alpha=1/window, min_periods=window, adjust=False)."""
+    return series.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+
+
+def rsi_from_smoothed(index, up: Series, down: Series) -> Series:
+    relative_strength = up / down
+    return Series(np.where(down == 0, 100, 100 - (100 / (1 + relative_strength))), index=index)
+
+
+def true_range(high: Series, low: Series, prev_close: Series) -> Series:
+    """max(H - L, |H - C_prev|, |L - C_prev|) z pominięciem NaN - jak IndicatorMixin._true_range z `ta`."""
+    ranges = np.fmax(np.fmax(high - low, (high - prev_close).abs()), (low - prev_close).abs())
+    return Series(ranges, index=high.index)
+
+
+def wilder_atr(true_range: Series, window: int) -> np.ndarray:
+    """
+    ATR jak ta.volatility.AverageTrueRange: średnia pierwszych `window` TR, potem
+    atr[i] = (atr[i-1] * (window - 1) + tr[i]) / window; zera przed rozgrzewką.
+    Rekurencja idzie po liście floatów Pythona (te same działania IEEE co w `ta`, bez .iloc).
+    """
+
+    atr = np.zeros(len(true_range))
+    if len(true_range) < window:
+        return atr
+
+    values = true_range.tolist()
+    previous = true_range.iloc[0:window].mean()
+    atr[window - 1] = previous
+    for i in range(window, len(values)):
+        previous = (previous * (window - 1) + values[i]) / float(window)
+        atr[i] = previous
+
+    return atr
+
+
+def time_function(value, devider: int):
+    return 2 * np.pi * value / devider
+
+
+def build_ohlcv_graph(
+    rsi_window: int = 14,
+    atr_window: int = 14,
+    macd_fast: int = 12,
+    macd_slow: int = 26,
+    macd_sign: int = 9,
+) -> FeatureGraph:
+    """Graf cech używany przez map_ohlcv_to_features (wraz z węzłami pośrednimi, które też można pobrać)."""
+    graph = FeatureGraph(
+        {
+            "rsi_window": rsi_window,
+            "atr_window": atr_window,
+            "macd_fast": macd_fast,
+            "macd_slow": macd_slow,
+            "macd_sign": macd_sign,
+        }
+    )
+
+    graph.add("prev_close", ("close",), lambda close: close.shift(1))
+    graph.add("close_diff", ("close", "prev_close"), lambda close, prev: close - prev)
+    graph.add("log_returns", ("close", "prev_close"), lambda close, prev: np.log(close / prev))
+
+    graph.add("gain", ("close_diff",), lambda diff: diff.where(diff > 0, 0.0))
+    graph.add("loss", ("close_diff",), lambda diff: -diff.where(diff < 0, 0.0))
+    graph.add("gain_wilder", ("gain",), lambda gain: wilder_ewm(gain, rsi_window))
+    graph.add("loss_wilder", ("loss",), lambda loss: wilder_ewm(loss, rsi_window))
+    graph.add("rsi", ("index", "gain_wilder", "loss_wilder"), rsi_from_smoothed)
+
+    graph.add("ema_fast", ("close",), lambda close: ema(close, macd_fast))
+    graph.add("ema_slow", ("close",), lambda close: ema(close, macd_slow))
+    graph.add("macd", ("ema_fast", "ema_slow"), lambda fast, slow: fast - slow)
+    graph.add("macd_signal", ("macd",), lambda macd: ema(macd, macd_sign))
+    graph.add("macd_hist", ("macd", "macd_signal"), lambda macd, signal: macd - signal)
+
+    graph.add("true_range", ("high", "low", "prev_close"), true_range)
+    graph.add("atr", ("true_range",), lambda tr: wilder_atr(tr, atr_window))
+
+    graph.add("hour_angle", ("index",), lambda index: time_function(index.hour, 24))
+    graph.add("hour_sin", ("hour_angle",), np.sin)
+    graph.add("hour_cos", ("hour_angle",), np.cos)
+    graph.add("day_angle", ("index",), lambda index: time_function(index.dayofweek, 7))
+    graph.add("day_sin", ("day_angle",), np.sin)
+    graph.add("day_cos", ("day_angle",), np.cos)
+
+    return graph
+
+
+OHLCV_GRAPH = build_ohlcv_graph()
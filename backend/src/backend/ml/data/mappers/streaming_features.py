@@ -0,0 +1,137 @@
+import numpy as np
+from typing import Optional
+from pandas import Series, Timestamp
+from backend.ml.data.mappers.feature_graph import FEATURE_COLUMNS
+
+
+class _Ewm:
+    """
+    Stan pojedynczej średniej wykładniczej (adjust=False), odwzorowujący krok po kroku
+    `Series.ewm(alpha=..., min_periods=..., adjust=False).mean()` z pandas.
+    """
+
+    def __init__(self, alpha: float, min_periods: int):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = np.nan
+        self.nobs = 0
+
+    def update(self, x: float) -> float:
+        """Dodaje obserwację i zwraca bieżącą średnią (NaN przed min_periods)."""
+        if np.isnan(x):
+            pass
+        elif np.isnan(self.value):
+            self.value = x
+            self.nobs += 1
+        else:
+            self.nobs += 1
+            # Ta sama kolejność działań co w pandas, żeby wynik był zgodny co do bitu.
+            if self.value != x:
+                old_wt = 1.0 - self.alpha
+                self.value = (old_wt * self.value + self.alpha * x) / (old_wt + self.alpha)
+
+        return self.value if self.nobs >= self.min_periods else np.nan
+
+
+class StreamingFeatureEngine:
+    """
+    Inkrementalny odpowiednik `map_ohlcv_to_features` dla danych live.
+
+    Trzyma stan wygładzania Wildera (RSI, ATR) oraz średnich EMA (MACD), dzięki czemu każda
+    nowa świeca kosztuje O(1) zamiast przeliczania całej historii. Po rozgrzewce wyniki są
+    zgodne z wersją wsadową opartą o bibliotekę `ta`.
+
+    ## Args:
+        :rsi_window (int): Okno RSI (domyślnie 14).
+        :atr_window (int): Okno ATR (domyślnie 14).
+        :macd_fast (int): Okno szybkiej EMA w MACD (domyślnie 12).
+        :macd_slow (int): Okno wolnej EMA w MACD (domyślnie 26).
+        :macd_sign (int): Okno linii sygnału MACD (domyślnie 9).
+
+    ## Methods:
+        :update(bar) -> Optional[Series]:
+            Przyjmuje świecę (Series z kolumnami OHLC i indeksem czasu w `bar.name`)
+            i zwraca wiersz cech albo None, jeśli wskaźniki jeszcze się rozgrzewają.
+    """
+
+    def __init__(
+        self,
+        rsi_window: int = 14,
+        atr_window: int = 14,
+        macd_fast: int = 12,
+        macd_slow: int = 26,
+        macd_sign: int = 9,
+    ):
+        self.atr_window = atr_window
+
+        self._rsi_up = _Ewm(alpha=1 / rsi_window, min_periods=rsi_window)
+        self._rsi_down = _Ewm(alpha=1 / rsi_window, min_periods=rsi_window)
+        self._ema_fast = _Ewm(alpha=2 / (macd_fast + 1), min_periods=macd_fast)
+        self._ema_slow = _Ewm(alpha=2 / (macd_slow + 1), min_periods=macd_slow)
+        self._macd_signal = _Ewm(alpha=2 / (macd_sign + 1), min_periods=macd_sign)
+
+        self._prev_close = np.nan
+        self._true_ranges: list[float] = []
+        self._atr = 0.0
+        self.n_bars = 0
+
+    def update(self, bar: Series) -> Optional[Series]:
+        """Aktualizuje stan o jedną świecę i zwraca wiersz cech (lub None w trakcie rozgrzewki)."""
+        close = float(bar["Close"])
+        high = float(bar["High"])
+        low = float(bar["Low"])
+        prev_close = self._prev_close
+
+        log_returns = np.log(close / prev_close)
+
+        diff = close - prev_close
+        up_direction = diff if diff > 0 else 0.0
+        down_direction = -diff if diff < 0 else -0.0
+        ema_up = self._rsi_up.update(up_direction)
+        ema_down = self._rsi_down.update(down_direction)
+        rsi = 100.0 if ema_down == 0 else 100 - (100 / (1 + ema_up / ema_down))
+
+        macd = self._ema_fast.update(close) - self._ema_slow.update(close)
+        macd_hist = macd - self._macd_signal.update(macd)
+
+        atr = self._update_atr(high, low, prev_close)
+
+        self._prev_close = close
+        self.n_bars += 1
+
+        if np.isnan([log_returns, rsi, macd, macd_hist, atr]).any():
+            return None
+
+        timestamp = Timestamp(bar.name)
+        hour_func = 2 * np.pi * timestamp.hour / 24
+        day_of_week_func = 2 * np.pi * timestamp.dayofweek / 7
+
+        return Series(
+            [
+                log_returns,
+                rsi,
+                macd,
+                macd_hist,
+                atr,
+                np.sin(hour_func),
+                np.cos(hour_func),
+                np.sin(day_of_week_func),
+                np.cos(day_of_week_func),
+            ],
+            index=FEATURE_COLUMNS,
+            name=bar.name,
+        )
+
+    def _update_atr(self, high: float, low: float, prev_close: float) -> float:
+        """ATR Wildera: średnia z pierwszych `atr_window` wartości True Range, potem wygładzanie."""
+        true_range = np.nanmax([high - low, abs(high - prev_close), abs(low - prev_close)])
+
+        if self.n_bars < self.atr_window:
+            self._true_ranges.append(true_range)
+            if self.n_bars == self.atr_window - 1:
+                self._atr = np.array(self._true_ranges).mean()
+                self._true_ranges = []
+        else:
+            self._atr = (self._atr * (self.atr_window - 1) + true_range) / float(self.atr_window)
+
+        return self._atr
@@ -0,0 +1,149 @@
+import queue
+import threading
+import numpy as np
+from typing import Iterator, Literal, Optional
+from numpy import ndarray
+from numpy.lib.stride_tricks import sliding_window_view
+from backend.ml.data.dataset import CompactDataset
+from backend.ml.evaluation.walk_forward import DEFAULT_PURGE, walk_forward_splits
+
+
+class SequenceWindows:
+    """
+    Okna sekwencji (lookback x cechy) nad jedną macierzą cech - bez kopiowania danych.
+
+    `windows` to widok z krokami (strided view) na macierz X o kształcie
+    (liczba okien, lookback, cechy); okno i kończy się na wierszu `ends[i]` i ma etykietę
+    y[ends[i]]. Pamięć nie rośnie z lookback - kopiowana jest dopiero konkretna paczka.
+    Wiersze X muszą być kolejnymi świecami (np. CompactDataset z build_dataset).
+
+    ## Args:
+        :X (ndarray): Cechy (wiersze, cechy); rzutowane na ciągłą tablicę float32.
+        :y (ndarray): Etykiety wierszy (np. target z create_market_target); NaN oznacza brak etykiety.
+        :lookback (int): Długość okna w świecach.
+
+    ## Methods:
+        :batch(ids) -> tuple[ndarray, ndarray]:
+            Kopiuje wskazane okna do tablicy (paczka, lookback, cechy) wraz z etykietami.
+        :splits(...) -> Iterator[tuple[ndarray, ndarray]]:
+            Walk-forward po oknach z przerwą purge między treningiem a testem.
+        :iter_batches(ids, batch_size, shuffle, seed, prefetch) -> Iterator[tuple[ndarray, ndarray]]:
+            Paczki NumPy przygotowywane z wyprzedzeniem w wątku w tle.
+        :to_tf_dataset(ids, batch_size, shuffle, seed) -> tf.data.Dataset:
+            Potok tf.data indeksujący jeden wspólny bufor cech.
+    """
+
+    def __init__(self, X: ndarray, y: ndarray, lookback: int):
+        if lookback < 1:
+            raise ValueError("lookback musi być dodatni.")
+
+        self.X = np.ascontiguousarray(X, dtype=np.float32)
+        self.lookback = lookback
+        self.windows = sliding_window_view(self.X, lookback, axis=0).transpose(0, 2, 1)
+
+        labels = np.asarray(y, dtype=np.float64)
+        ends = np.arange(lookback - 1, len(self.X))
+        self.ends = ends[~np.isnan(labels[ends])]
+        self.y = labels[self.ends].astype(np.int8)
+
+    @classmethod
+    def from_dataset(cls, dataset: CompactDataset, lookback: int) -> "SequenceWindows":
+        return cls(dataset.X, dataset.y, lookback)
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    def batch(self, ids: ndarray) -> tuple[ndarray, ndarray]:
+        starts = self.ends[ids] - (self.lookback - 1)
+        return self.windows[starts], self.y[ids]
+
+    def splits(
+        self,
+        n_splits: int = 5,
+        test_size: Optional[int] = None,
+        mode: Literal["expanding", "rolling"] = "expanding",
+        train_size: Optional[int] = None,
+        purge: int = DEFAULT_PURGE,
+    ) -> Iterator[tuple[ndarray, ndarray]]:
+        """
+        Podziały walk-forward na identyfikatorach okien (patrz walk_forward_splits).
+
+        Okna testowe mogą sięgać lookback wstecz do okresu treningowego - to tylko przeszłe
+        cechy. Przerwa `purge` (równa `window` z create_market_target) pilnuje, żeby etykiety
+        treningowe nie patrzyły na ceny z okresu testu.
+        """
+
+        for train, test in walk_forward_splits(len(self), n_splits, test_size, mode, train_size, purge):
+            yield np.arange(train.start, train.stop), np.arange(test.start, test.stop)
+
+    def iter_batches(
+        self,
+        ids: ndarray,
+        batch_size: int = 256,
+        shuffle: bool = False,
+        seed: Optional[int] = None,
+        prefetch: int = 2,
+    ) -> Iterator[tuple[ndarray, ndarray]]:
+        """Paczki (X, y) w kolejności ids (albo losowej); `prefetch` kolejnych paczek jest kopiowanych w tle."""
+        ids = np.random.default_rng(seed).permutation(ids) if shuffle else np.asarray(ids)
+        chunks = [ids[i : i + batch_size] for i in range(0, len(ids), batch_size)]
+
+        if prefetch <= 0:
+            for chunk in chunks:
+                yield self.batch(chunk)
+            return
+
+        ready: queue.Queue = queue.Queue(maxsize=prefetch)
+        done = object()
+        stop = threading.Event()
+
+        def producer():
+            for chunk in chunks:
+                if stop.is_set():
+                    return
+                ready.put(self.batch(chunk))
+            ready.put(done)
+
+        worker = threading.Thread(target=producer, daemon=True)
+        worker.start()
+        try:
+            while (item := ready.get()) is not done:
+                yield item
+        finally:
+            stop.set()
+            while worker.is_alive():
+                try:
+                    ready.get_nowait()
+                except queue.Empty:
+                    worker.join(timeout=0.01)
+
+    def to_tf_dataset(
+        self,
+        ids: ndarray,
+        batch_size: int = 256,
+        shuffle: bool = False,
+        seed: Optional[int] = None,
+    ):
+        """
+        Potok tf.data: po potoku płyną tylko indeksy okien, a paczki (paczka, lookback, cechy)
+        powstają przez tf.gather z jednego bufora cech. Zawiera batch i prefetch; używa
+        wyłącznie operacji dostępnych na CPU.
+        """
+
+        import tensorflow as tf
+
+        features = tf.constant(self.X)
+        labels = tf.constant(self.y)
+        starts = tf.constant(self.ends[np.asarray(ids)] - (self.lookback - 1), dtype=tf.int64)
+        window_ids = tf.constant(np.asarray(ids), dtype=tf.int64)
+        offsets = tf.range(self.lookback, dtype=tf.int64)
+
+        dataset = tf.data.Dataset.from_tensor_slices((starts, window_ids))
+        if shuffle:
+            dataset = dataset.shuffle(len(ids), seed=seed, reshuffle_each_iteration=True)
+
+        def gather(batch_starts, batch_ids):
+            rows = batch_starts[:, None] + offsets[None, :]
+            return tf.gather(features, rows), tf.gather(labels, batch_ids)
+
+        return dataset.batch(batch_size).map(gather, num_parallel_calls=tf.data.AUTOTUNE).prefetch(tf.data.AUTOTUNE)
@@ -0,0 +1,233 @@
+import json
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+from pandas import DataFrame
+from backend.ml.data.dataset import build_dataset
+from backend.ml.data.fetchers.ohlcv_cache import OhlcvCache
+from backend.ml.data.fetchers.yahoo_fetcher import fetch_history
+
+MANIFEST_FILE = "manifest.json"
+
+
+@dataclass
+class UniverseBuildReport:
+    """
+    Wynik build_universe_dataset.
+
+    ## Attributes:
+        :output_dir (str): Katalog z fragmentami per ticker i manifestem.
+        :rows (dict[str, int]): Liczba wierszy zbioru dla każdego udanego tickera.
+        :errors (dict[str, str]): Opis błędu dla tickerów, których nie udało się zbudować.
+        :wall_time_s (float): Całkowity czas budowy w sekundach.
+
+    ## Methods:
+        :panel() -> DataFrame:
+            Wczytuje panel (ticker, timestamp) z dysku, patrz load_panel.
+    """
+
+    output_dir: str
+    rows: dict[str, int] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    wall_time_s: float = 0.0
+
+    def panel(self) -> DataFrame:
+        return load_panel(self.output_dir)
+
+
+def build_universe_dataset(
+    tickers: list[str],
+    output_dir: str,
+    interval: str = '1d',
+    start_date: Optional[str] = None,
+    period: str = 'max',
+    tp_pct: float = 0.015,
+    sl_pct: float = 0.01,
+    window: int = 5,
+    cache: Optional[OhlcvCache] = None,
+    max_workers: Optional[int] = None,
+    fetch_fn: Optional[Callable[..., DataFrame]] = None,
+) -> UniverseBuildReport:
+    """
+    Buduje zbiory [cechy..., target] dla wielu tickerów w puli procesów.
+
+    Każdy proces wykonuje dla swojego tickera ten sam potok co `start_dev`
+    (fetch_history -> build_dataset) i sam zapisuje wynik na dysk jako fragment `.npy`.
+    Do procesu głównego wraca tylko opis fragmentu, a manifest jest aktualizowany po
+    każdym ukończonym tickerze - w pamięci jest naraz najwyżej `max_workers` zbiorów,
+    niezależnie od rozmiaru uniwersum. Błąd jednego tickera trafia do `errors` i nie
+    przerywa reszty.
+
+    Args:
+        tickers (list[str]): Lista symboli. Duplikaty są pomijane.
+        output_dir (str): Katalog docelowy fragmentów i manifestu.
+        interval (str): '1d', '1h', '15m'
+        start_date (str): Format 'YYYY-MM-DD'. Jeśli None, bierze 'period'.
+        period (str): '1y', '5y', 'max' (używane gdy brak start_date)
+        tp_pct (float): Próg Take Profit dla create_market_target.
+        sl_pct (float): Próg Stop Loss dla create_market_target.
+        window (int): Okno Triple Barrier.
+        cache (Optional[OhlcvCache]): Lokalny cache świec przekazywany do fetch_history.
+        max_workers (Optional[int]): Liczba procesów (domyślnie liczba rdzeni).
+        fetch_fn (Optional[Callable[..., DataFrame]]): Funkcja pobierająca jeden ticker o sygnaturze
+            fetch_history (domyślnie fetch_history). Musi dać się zserializować (funkcja modułu).
+
+    Returns:
+        UniverseBuildReport: Liczby wierszy, błędy i czas; panel() wczytuje wynik.
+    """
+
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+
+    unique_tickers = list(dict.fromkeys(tickers))
+    report = UniverseBuildReport(output_dir=output_dir)
+    manifest = {
+        "config": {
+            "interval": interval,
+            "start_date": start_date,
+            "period": period,
+            "tp_pct": tp_pct,
+            "sl_pct": sl_pct,
+            "window": window,
+        },
+        "tickers": unique_tickers,
+        "shards": {},
+        "errors": {},
+    }
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _build_ticker,
+                ticker,
+                output_dir,
+                interval,
+                start_date,
+                period,
+                tp_pct,
+                sl_pct,
+                window,
+                cache,
+                fetch_fn or fetch_history,
+            ): ticker
+            for ticker in unique_tickers
+        }
+
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                shard = future.result()
+            except Exception as e:
+                report.errors[ticker] = manifest["errors"][ticker] = f"{type(e).__name__}: {e}"
+            else:
+                report.rows[ticker] = shard["rows"]
+                manifest["shards"][ticker] = shard
+
+            _write_manifest(output_dir, manifest)
+
+    report.wall_time_s = time.perf_counter() - start
+
+    return report
+
+
+def load_panel(output_dir: str, tickers: Optional[list[str]] = None) -> DataFrame:
+    """
+    Skleja fragmenty z build_universe_dataset w jeden panel.
+
+    Indeks to MultiIndex (ticker, timestamp), a kolumna `ticker` jest typu category
+    z kategoriami w kolejności tickerów z manifestu. Gdy tickery mają różne strefy
+    czasowe, znaczniki są sprowadzane do UTC.
+
+    Args:
+        output_dir (str): Katalog z build_universe_dataset.
+        tickers (Optional[list[str]]): Podzbiór tickerów do wczytania (domyślnie wszystkie udane).
+
+    Returns:
+        DataFrame: [cechy..., target, ticker] z indeksem (ticker, timestamp).
+    """
+
+    manifest = _read_manifest(output_dir)
+    shards = manifest["shards"]
+    selected = [t for t in (tickers or manifest["tickers"]) if t in shards]
+
+    if not selected:
+        raise ValueError("Brak zbudowanych tickerów do wczytania.")
+
+    tz_set = {shards[t]["tz"] for t in selected}
+    common_tz = tz_set.pop() if len(tz_set) == 1 else "UTC"
+
+    frames = [_open_shard(output_dir, shards[t], common_tz) for t in selected]
+    panel = pd.concat(frames, keys=selected, names=["ticker", frames[0].index.name or "timestamp"])
+
+    categories = [t for t in manifest["tickers"] if t in shards]
+    panel["ticker"] = pd.Categorical(panel.index.get_level_values("ticker"), categories=categories)
+
+    return panel
+
+
+def _build_ticker(
+    ticker: str,
+    output_dir: str,
+    interval: str,
+    start_date: Optional[str],
+    period: str,
+    tp_pct: float,
+    sl_pct: float,
+    window: int,
+    cache: Optional[OhlcvCache],
+    fetch_fn: Callable[..., DataFrame],
+) -> dict:
+    """Potok jednego tickera w procesie roboczym: pobranie, cechy + target, zapis fragmentu."""
+    df = fetch_fn(ticker, interval=interval, start_date=start_date, period=period, cache=cache)
+    dataset = build_dataset(df, tp_pct=tp_pct, sl_pct=sl_pct, window=window)
+
+    shard_dir = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+    os.makedirs(os.path.join(output_dir, shard_dir), exist_ok=True)
+
+    index = dataset.index
+    tz = str(index.tz) if index.tz is not None else None
+    utc_index = index.tz_convert("UTC") if tz else index.tz_localize("UTC")
+
+    values = np.asfortranarray(dataset.to_numpy(dtype=np.float64))
+    for name, array in [("values.npy", values), ("index.npy", utc_index.asi8)]:
+        path = os.path.join(output_dir, shard_dir, name)
+        with open(path + ".tmp", "wb") as f:
+            np.save(f, array)
+        os.replace(path + ".tmp", path)
+
+    return {
+        "dir": shard_dir,
+        "columns": list(dataset.columns),
+        "rows": len(dataset),
+        "tz": tz,
+        "index_name": index.name,
+    }
+
+
+def _open_shard(output_dir: str, shard: dict, tz: Optional[str]) -> DataFrame:
+    shard_dir = os.path.join(output_dir, shard["dir"])
+    values = np.load(os.path.join(shard_dir, "values.npy"), mmap_mode="r")
+    index_values = np.load(os.path.join(shard_dir, "index.npy"))
+
+    index = pd.DatetimeIndex(pd.to_datetime(index_values, utc=True))
+    index = index.tz_convert(tz) if tz else index.tz_localize(None)
+    index.name = shard["index_name"]
+
+    return DataFrame(values, index=index, columns=shard["columns"], copy=False)
+
+
+def _read_manifest(output_dir: str) -> dict:
+    with open(os.path.join(output_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(output_dir: str, manifest: dict):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
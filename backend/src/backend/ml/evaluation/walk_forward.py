@@ -0,0 +1,192 @@
+import inspect
+import os
+import tempfile
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, Literal, Optional
+from pandas import DataFrame
+from sklearn.metrics import accuracy_score, f1_score
+from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+from backend.ml.data.create_target import create_market_target
+from backend.ml.data.feature_scaler import FeatureScaler
+
+# Domyślna przerwa train/test: tyle świec w przód patrzy domyślny Triple Barrier (`window` create_market_target).
+DEFAULT_PURGE: int = inspect.signature(create_market_target).parameters["window"].default
+
+# Stan procesu roboczego: macierz cech i target otwarte raz (mmap, tylko do odczytu).
+_WORKER_X: Optional[np.ndarray] = None
+_WORKER_Y: Optional[np.ndarray] = None
+_WORKER_COLUMNS: list[str] = []
+
+
+@dataclass
+class BacktestReport:
+    """
+    Wynik walk-forward.
+
+    ## Attributes:
+        :folds (DataFrame): Metryki per fold: zakresy train/test, accuracy, f1_macro, fit_s, fold_s.
+        :wall_time_s (float): Całkowity czas backtestu w sekundach.
+    """
+
+    folds: DataFrame
+    wall_time_s: float
+
+
+def walk_forward_splits(
+    n_samples: int,
+    n_splits: int = 5,
+    test_size: Optional[int] = None,
+    mode: Literal["expanding", "rolling"] = "expanding",
+    train_size: Optional[int] = None,
+    purge: int = DEFAULT_PURGE,
+) -> Iterator[tuple[range, range]]:
+    """
+    Generuje kolejne podziały train/test w czasie.
+
+    Foldy testowe leżą na końcu szeregu, jeden za drugim. Między końcem zbioru treningowego
+    a początkiem testowego zostaje przerwa `purge` - etykiety Triple Barrier patrzą `window`
+    świec w przód, więc bez niej ostatnie wiersze treningu znałyby ceny z okresu testu.
+
+    Args:
+        n_samples (int): Liczba wierszy zbioru.
+        n_splits (int): Liczba foldów.
+        test_size (Optional[int]): Długość foldu testowego. None oznacza n_samples // (n_splits + 1).
+        mode (Literal["expanding", "rolling"]): Okno treningowe rosnące od początku albo przesuwne o stałej długości.
+        train_size (Optional[int]): Długość okna przesuwnego (wymagana dla 'rolling').
+        purge (int): Przerwa między train a test; powinna być równa `window` z create_market_target.
+
+    Returns:
+        Iterator[tuple[range, range]]: Indeksy wierszy (train, test) dla każdego foldu.
+    """
+
+    if mode == "rolling" and train_size is None:
+        raise ValueError("Tryb 'rolling' wymaga podania train_size.")
+
+    test_size = test_size or n_samples // (n_splits + 1)
+
+    for k in range(n_splits):
+        test_start = n_samples - (n_splits - k) * test_size
+        train_stop = test_start - purge
+        train_start = 0 if mode == "expanding" else max(0, train_stop - train_size)
+
+        if train_stop <= train_start:
+            continue
+
+        yield range(train_start, train_stop), range(test_start, test_start + test_size)
+
+
+def _init_worker(x_path: str, y_path: str, columns: list[str]):
+    """Otwiera współdzieloną macierz cech raz na proces (bez kopiowania jej przy każdym foldzie)."""
+    global _WORKER_X, _WORKER_Y, _WORKER_COLUMNS
+    _WORKER_X = np.load(x_path, mmap_mode="r")
+    _WORKER_Y = np.load(y_path, mmap_mode="r")
+    _WORKER_COLUMNS = columns
+
+
+def _reset_worker():
+    """Zamyka mmapy bieżącego procesu (foldy liczone w procesie wywołującym)."""
+    global _WORKER_X, _WORKER_Y, _WORKER_COLUMNS
+    _WORKER_X = None
+    _WORKER_Y = None
+    _WORKER_COLUMNS = []
+
+
+def _run_fold(fold: int, train: range, test: range, model_params: dict, n_jobs: int) -> dict:
+    """Skaluje, trenuje i ocenia model na jednym foldzie."""
+    fold_start = time.perf_counter()
+
+    X_train = DataFrame(_WORKER_X[train.start : train.stop], columns=_WORKER_COLUMNS)
+    X_test = DataFrame(_WORKER_X[test.start : test.stop], columns=_WORKER_COLUMNS)
+    y_train = _WORKER_Y[train.start : train.stop]
+    y_test = _WORKER_Y[test.start : test.stop]
+
+    scaler = FeatureScaler()
+    X_train = scaler.fit_transform(X_train, _WORKER_COLUMNS)
+    X_test = scaler.transform(X_test)
+
+    model = MusaRandomForestTreeClassifier(**model_params)
+    model.model.set_params(n_jobs=n_jobs)
+
+    fit_start = time.perf_counter()
+    model.train(X_train, y_train)
+    fit_time = time.perf_counter() - fit_start
+
+    predictions = model.predict(X_test)
+
+    return {
+        "fold": fold,
+        "train_start": train.start,
+        "train_stop": train.stop,
+        "test_start": test.start,
+        "test_stop": test.stop,
+        "accuracy": accuracy_score(y_test, predictions),
+        "f1_macro": f1_score(y_test, predictions, average="macro", zero_division=0),
+        "fit_s": fit_time,
+        "fold_s": time.perf_counter() - fold_start,
+    }
+
+
+def walk_forward_backtest(
+    dataset: DataFrame,
+    target_col: str = "target",
+    n_splits: int = 5,
+    test_size: Optional[int] = None,
+    mode: Literal["expanding", "rolling"] = "expanding",
+    train_size: Optional[int] = None,
+    purge: int = DEFAULT_PURGE,
+    max_workers: Optional[int] = None,
+    model_params: Optional[dict] = None,
+) -> BacktestReport:
+    """
+    Walk-forward backtest MusaRandomForestTreeClassifier z równoległymi foldami.
+
+    Macierz cech jest zapisywana raz do pliku `.npy`, a każdy proces roboczy otwiera ją przez
+    mmap w inicjalizatorze, więc foldy dostają tylko zakresy indeksów zamiast kopii danych.
+
+    Args:
+        dataset (DataFrame): Cechy + kolumna targetu, posortowane w czasie i bez NaN (jak w start_dev).
+        target_col (str): Nazwa kolumny targetu.
+        n_splits (int): Liczba foldów.
+        test_size (Optional[int]): Długość foldu testowego.
+        mode (Literal["expanding", "rolling"]): Rodzaj okna treningowego.
+        train_size (Optional[int]): Długość okna przesuwnego.
+        purge (int): Przerwa między train a test (równa `window` Triple Barrier).
+        max_workers (Optional[int]): Liczba procesów. 1 uruchamia foldy w bieżącym procesie.
+        model_params (Optional[dict]): Argumenty konstruktora MusaRandomForestTreeClassifier.
+
+    Returns:
+        BacktestReport: Metryki per fold i całkowity czas.
+    """
+
+    start = time.perf_counter()
+    model_params = model_params or {}
+    columns = [col for col in dataset.columns if col != target_col]
+    splits = list(walk_forward_splits(len(dataset), n_splits, test_size, mode, train_size, purge))
+    workers = max_workers or min(len(splits), os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        x_path = os.path.join(tmp_dir, "X.npy")
+        y_path = os.path.join(tmp_dir, "y.npy")
+        np.save(x_path, dataset[columns].to_numpy(dtype=np.float64))
+        np.save(y_path, dataset[target_col].to_numpy())
+
+        if workers == 1:
+            _init_worker(x_path, y_path, columns)
+            try:
+                results = [_run_fold(k, train, test, model_params, -1) for k, (train, test) in enumerate(splits)]
+            finally:
+                # mmapy trzymają pliki z katalogu tymczasowego - zwalniamy je przed jego usunięciem.
+                _reset_worker()
+        else:
+            # Równoległość jest na poziomie foldów, więc las w każdym procesie używa jednego wątku.
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(x_path, y_path, columns)) as executor:
+                futures = [
+                    executor.submit(_run_fold, k, train, test, model_params, 1)
+                    for k, (train, test) in enumerate(splits)
+                ]
+                results = [future.result() for future in futures]
+
+    return BacktestReport(folds=DataFrame(results), wall_time_s=time.perf_counter() - start)
@@ -0,0 +1,275 @@
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+from backend.ml.architectures.forest_artifact import HEADER_FILE, load_artifact
+from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+from backend.ml.data.feature_scaler import FeatureScaler
+
+MODEL_FILE = "model.joblib"
+SCALER_FILE = "scaler.joblib"
+ARTIFACT_DIR = "forest"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelEntry:
+    """
+    Para model/skaler wczytana dla jednego (ticker, interval, version).
+
+    ## Attributes:
+        :ticker (str): Symbol, np. 'AAPL'.
+        :interval (str): Interwał świec, np. '1d'.
+        :version (str): Rozwiązana wersja artefaktu (nazwa katalogu).
+        :model (MusaRandomForestTreeClassifier): Wczytany model.
+        :scaler (Optional[FeatureScaler]): Wczytany skaler lub None, jeśli artefakt go nie zawiera.
+        :size_bytes (int): Szacowany rozmiar w pamięci (rozmiar plików artefaktu).
+        :mtime (float): Czas modyfikacji artefaktu w chwili wczytania.
+    """
+
+    ticker: str
+    interval: str
+    version: str
+    model: MusaRandomForestTreeClassifier
+    scaler: Optional[FeatureScaler]
+    size_bytes: int
+    mtime: float
+    checked_at: float = field(default_factory=time.monotonic)
+
+
+def _version_key(version: str) -> list:
+    """Klucz sortowania naturalnego, żeby 'v10' było nowsze niż 'v9'."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", version)]
+
+
+class ModelRegistry:
+    """
+    Rejestr modeli per (ticker, interval, version) z leniwym wczytywaniem, eviction LRU i hot reloadem.
+
+    Artefakty leżą w `root/<ticker>/<interval>/<version>/` jako `model.joblib` (zapis
+    `MusaRandomForestTreeClassifier.save`) oraz opcjonalnie `scaler.joblib` (zapis
+    `FeatureScaler.save_scaler`), albo jako katalog `forest/` (zapis `forest_artifact.save_artifact`,
+    ze skalerem w nagłówku) - ten ma pierwszeństwo i jest mapowany przez mmap zamiast kopiowany
+    do pamięci procesu. Wersja None oznacza najnowszą wersję na dysku.
+
+    Nowy artefakt jest wczytywany obok starego, a podmiana wpisu w rejestrze jest atomowa -
+    predykcje w toku dalej korzystają ze starej pary, którą już trzymają. Jeśli przeładowanie
+    się nie powiedzie (np. artefakt jest jeszcze w trakcie zapisu), rejestr loguje błąd i dalej
+    serwuje wczytany wpis; kolejna próba następuje po `reload_check_s`.
+
+    Wpisy są trzymane pod rozwiązaną wersją, więc wersja None i jawna nazwa najnowszej wersji
+    dzielą jeden wczytany model.
+
+    ## Args:
+        :root (str): Katalog z artefaktami.
+        :memory_budget_bytes (Optional[int]): Limit łącznego rozmiaru wczytanych modeli. None wyłącza eviction (domyślnie None).
+        :reload_check_s (float): Jak często (w sekundach) sprawdzać dysk w poszukiwaniu nowszego artefaktu (domyślnie 5).
+
+    ## Methods:
+        :get(ticker, interval, version) -> ModelEntry:
+            Zwraca wczytaną parę model/skaler, wczytując lub przeładowując ją w razie potrzeby.
+        :versions(ticker, interval) -> list[str]:
+            Lista wersji na dysku, od najstarszej do najnowszej.
+        :loaded_bytes() -> int:
+            Łączny rozmiar wczytanych modeli.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        memory_budget_bytes: Optional[int] = None,
+        reload_check_s: float = 5.0,
+    ):
+        self.root = root
+        self.memory_budget_bytes = memory_budget_bytes
+        self.reload_check_s = reload_check_s
+
+        self._entries: OrderedDict[tuple, ModelEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        # (ticker, interval) -> [blokada wczytywania, liczba wątków, które ją trzymają lub na nią czekają].
+        self._load_locks: dict[tuple, list] = {}
+        self._latest: dict[tuple, tuple[str, float]] = {}
+        # Wpisy pobierane z jawną wersją - zmiana najnowszej wersji ich nie zwalnia.
+        self._pinned: set[tuple] = set()
+
+    def versions(self, ticker: str, interval: str) -> list[str]:
+        interval_dir = os.path.join(self.root, ticker, interval)
+        if not os.path.isdir(interval_dir):
+            return []
+
+        versions = [
+            name
+            for name in os.listdir(interval_dir)
+            if os.path.exists(os.path.join(interval_dir, name, MODEL_FILE))
+            or os.path.exists(os.path.join(interval_dir, name, ARTIFACT_DIR, HEADER_FILE))
+        ]
+        return sorted(versions, key=_version_key)
+
+    def loaded_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._entries.values())
+
+    def get(self, ticker: str, interval: str, version: Optional[str] = None) -> ModelEntry:
+        """
+        Zwraca parę model/skaler dla klucza.
+
+        Args:
+            ticker (str): Symbol, np. 'AAPL'.
+            interval (str): Interwał, np. '1d'.
+            version (Optional[str]): Konkretna wersja albo None dla najnowszej.
+
+        Returns:
+            ModelEntry: Wczytany wpis.
+        """
+
+        alias = (ticker, interval)
+
+        with self._lock:
+            if version is None:
+                resolved, alias_checked_at = self._latest.get(alias, (None, float("-inf")))
+                alias_fresh = time.monotonic() - alias_checked_at < self.reload_check_s
+            else:
+                resolved, alias_fresh = version, True
+
+            key = (ticker, interval, resolved)
+            entry = self._entries.get(key)
+            if alias_fresh and entry is not None and time.monotonic() - entry.checked_at < self.reload_check_s:
+                self._entries.move_to_end(key)
+                if version is not None:
+                    self._pinned.add(key)
+                return entry
+            slot = self._load_locks.setdefault(alias, [threading.Lock(), 0])
+            slot[1] += 1
+
+        try:
+            with slot[0]:
+                return self._refresh(ticker, interval, version)
+        finally:
+            with self._lock:
+                slot[1] -= 1
+                if slot[1] == 0 and self._load_locks.get(alias) is slot:
+                    del self._load_locks[alias]
+
+    def _refresh(self, ticker: str, interval: str, version: Optional[str]) -> ModelEntry:
+        """Sprawdza dysk i w razie potrzeby wczytuje artefakt. Wywoływać pod blokadą wczytywania (ticker, interval)."""
+        alias = (ticker, interval)
+
+        try:
+            resolved = version or self._latest_version(ticker, interval)
+            key = (ticker, interval, resolved)
+            artifact_dir = os.path.join(self.root, ticker, interval, resolved)
+            mtime = self._artifact_mtime(artifact_dir)
+
+            with self._lock:
+                entry = self._entries.get(key)
+
+            if entry is None or entry.mtime != mtime:
+                entry = self._load(ticker, interval, resolved, artifact_dir, mtime)
+        except Exception:
+            fallback = self._fallback(alias, version)
+            if fallback is None:
+                raise
+
+            logger.exception(
+                "Nie udało się przeładować modelu %s (%s, %s) - dalej serwowana wersja %s.",
+                ticker, interval, version or "latest", fallback.version,
+            )
+            return fallback
+
+        with self._lock:
+            entry.checked_at = time.monotonic()
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if version is None:
+                previous = (*alias, self._latest.get(alias, (resolved,))[0])
+                # Poprzednia najnowsza wersja nie jest już celem None - zwalniamy ją, chyba że ktoś pobiera ją jawnie.
+                if previous != key and previous not in self._pinned:
+                    self._entries.pop(previous, None)
+                self._latest[alias] = (resolved, entry.checked_at)
+            else:
+                self._pinned.add(key)
+            self._evict(keep=key)
+
+        return entry
+
+    def _fallback(self, alias: tuple, version: Optional[str]) -> Optional[ModelEntry]:
+        """Wpis serwowany dalej po nieudanym przeładowaniu; odświeża jego checked_at, żeby nie ponawiać co zapytanie."""
+        with self._lock:
+            resolved = version or self._latest.get(alias, (None, 0.0))[0]
+            entry = self._entries.get((*alias, resolved))
+            if entry is None:
+                return None
+
+            entry.checked_at = time.monotonic()
+            self._entries.move_to_end((*alias, resolved))
+            if version is None:
+                self._latest[alias] = (resolved, entry.checked_at)
+            return entry
+
+    def _latest_version(self, ticker: str, interval: str) -> str:
+        versions = self.versions(ticker, interval)
+        if not versions:
+            raise FileNotFoundError(f"Brak modelu dla {ticker} ({interval}) w {self.root}")
+        return versions[-1]
+
+    @staticmethod
+    def _artifact_mtime(artifact_dir: str) -> float:
+        paths = [
+            os.path.join(artifact_dir, MODEL_FILE),
+            os.path.join(artifact_dir, SCALER_FILE),
+            os.path.join(artifact_dir, ARTIFACT_DIR, HEADER_FILE),
+        ]
+        return max(os.path.getmtime(p) for p in paths if os.path.exists(p))
+
+    @staticmethod
+    def _load(ticker: str, interval: str, version: str, artifact_dir: str, mtime: float) -> ModelEntry:
+        model_path = os.path.join(artifact_dir, MODEL_FILE)
+        scaler_path = os.path.join(artifact_dir, SCALER_FILE)
+        forest_dir = os.path.join(artifact_dir, ARTIFACT_DIR)
+
+        if os.path.exists(os.path.join(forest_dir, HEADER_FILE)):
+            artifact = load_artifact(forest_dir)
+            model, scaler = artifact.model, artifact.scaler
+            size_bytes = sum(entry.stat().st_size for entry in os.scandir(forest_dir))
+        else:
+            model = MusaRandomForestTreeClassifier.load(model_path)
+            size_bytes = os.path.getsize(model_path)
+            scaler = None
+
+        if scaler is None and os.path.exists(scaler_path):
+            scaler = FeatureScaler()
+            scaler.load_scaler(scaler_path)
+            size_bytes += os.path.getsize(scaler_path)
+
+        return ModelEntry(
+            ticker=ticker,
+            interval=interval,
+            version=version,
+            model=model,
+            scaler=scaler,
+            size_bytes=size_bytes,
+            mtime=mtime,
+        )
+
+    def _evict(self, keep: tuple):
+        """Usuwa najdawniej używane modele, dopóki suma rozmiarów przekracza budżet. Wywoływać pod self._lock."""
+        if self.memory_budget_bytes is None:
+            return
+
+        total = sum(entry.size_bytes for entry in self._entries.values())
+        for key in list(self._entries):
+            if total <= self.memory_budget_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self._entries.pop(key).size_bytes
+
+            self._pinned.discard(key)
+            alias = key[:2]
+            if self._latest.get(alias, (None,))[0] == key[2]:
+                del self._latest[alias]
@@ -0,0 +1,205 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+# tracemalloc jest globalny dla procesu, więc licznik etapów, które go używają, jest wspólny dla wszystkich
+# recorderów. Śledzenie startuje przy pierwszym wejściu i kończy się przy ostatnim wyjściu - etap kończący się
+# w jednym wątku nie zatrzymuje pomiaru etapów trwających równolegle (np. predict_batch w wątkach API).
+_tracer_lock = threading.Lock()
+_tracer_users = 0
+_tracer_owned = False
+
+
+def _acquire_tracer() -> bool:
+    """Rejestruje etap jako użytkownika tracemalloc; True, jeśli ten etap uruchomił śledzenie."""
+    global _tracer_users, _tracer_owned
+    with _tracer_lock:
+        _tracer_users += 1
+        if _tracer_users > 1 or tracemalloc.is_tracing():
+            return False
+        tracemalloc.start()
+        _tracer_owned = True
+        return True
+
+
+def _release_tracer():
+    """Wyrejestrowuje etap; ostatni zatrzymuje śledzenie, o ile uruchomił je recorder, a nie kod zewnętrzny."""
+    global _tracer_users, _tracer_owned
+    with _tracer_lock:
+        _tracer_users -= 1
+        if _tracer_users == 0 and _tracer_owned:
+            tracemalloc.stop()
+            _tracer_owned = False
+
+
+class StageRecorder:
+    """
+    Zbiera pomiary etapów potoku: czas, liczba wierszy i alokacje pamięci.
+
+    Domyślnie wyłączony - wtedy dekorator `instrumented` wywołuje funkcję bez żadnej
+    dodatkowej pracy poza sprawdzeniem jednej flagi. Włączenie: `configure(enabled=True)`
+    albo zmienna środowiskowa MUSA_INSTRUMENTATION=1 (lub =memory, aby mierzyć też pamięć).
+
+    ## Attributes:
+        :enabled (bool): Czy pomiary są zbierane.
+        :track_memory (bool): Czy mierzyć pamięć przez tracemalloc (spowalnia kod pythonowy).
+        :records (list[dict]): Surowe pomiary: stage, time_s, rows, alloc_bytes, peak_bytes, timestamp.
+
+    ## Methods:
+        :stage(name, rows) -> ContextManager[dict]:
+            Mierzy blok kodu; liczbę wierszy można ustawić później przez zwrócony słownik.
+        :summary() -> dict[str, dict]:
+            Agregaty per etap (count, time_s_sum, time_s_max, rows_sum, alloc_bytes_sum, peak_bytes_max).
+        :export_json(path):
+            Zapisuje migawkę surowych pomiarów do pliku JSON Lines (nadpisuje plik).
+        :render_prometheus() -> str:
+            Agregaty w formacie tekstowym Prometheusa (dla /metrics).
+        :reset():
+            Czyści zebrane pomiary.
+    """
+
+    def __init__(self, enabled: bool = False, track_memory: bool = False, max_records: int = 10_000):
+        self.enabled = enabled
+        self.track_memory = track_memory
+        self.max_records = max_records
+        self.records: list[dict] = []
+        self._summary: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[dict]:
+        record = {"stage": name, "rows": rows}
+        if not self.enabled:
+            yield record
+            return
+
+        track_memory = self.track_memory
+        if track_memory:
+            owns_tracing = _acquire_tracer()
+            start_memory, _ = tracemalloc.get_traced_memory()
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["time_s"] = time.perf_counter() - start
+            record["timestamp"] = time.time()
+            record["alloc_bytes"] = None
+            record["peak_bytes"] = None
+
+            if track_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                _release_tracer()
+                record["alloc_bytes"] = current - start_memory
+                # Szczyt jest wiarygodny tylko dla etapu, który sam uruchomił tracemalloc (nie zagnieżdżonego
+                # ani równoległego) - obejmuje też alokacje etapów trwających w tym czasie w innych wątkach.
+                if owns_tracing:
+                    record["peak_bytes"] = peak - start_memory
+
+            self._add(record)
+
+    def _add(self, record: dict):
+        with self._lock:
+            self.records.append(record)
+            if len(self.records) > self.max_records:
+                del self.records[: len(self.records) - self.max_records]
+
+            stats = self._summary.setdefault(
+                record["stage"],
+                {"count": 0, "time_s_sum": 0.0, "time_s_max": 0.0, "rows_sum": 0, "alloc_bytes_sum": 0, "peak_bytes_max": 0},
+            )
+            stats["count"] += 1
+            stats["time_s_sum"] += record["time_s"]
+            stats["time_s_max"] = max(stats["time_s_max"], record["time_s"])
+            stats["rows_sum"] += record["rows"] or 0
+            stats["alloc_bytes_sum"] += record["alloc_bytes"] or 0
+            stats["peak_bytes_max"] = max(stats["peak_bytes_max"], record["peak_bytes"] or 0)
+
+    def summary(self) -> dict[str, dict]:
+        with self._lock:
+            return {stage: dict(stats) for stage, stats in self._summary.items()}
+
+    def reset(self):
+        with self._lock:
+            self.records = []
+            self._summary = {}
+
+    def export_json(self, path: str):
+        with self._lock:
+            records = list(self.records)
+
+        # Migawka, nie dopisywanie - kolejne eksporty tego samego recordera nie duplikują pomiarów.
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+    def render_prometheus(self) -> str:
+        metrics = [
+            ("musa_stage_duration_seconds_total", "counter", "Łączny czas etapu w sekundach.", "time_s_sum"),
+            ("musa_stage_duration_seconds_max", "gauge", "Najdłuższe wykonanie etapu w sekundach.", "time_s_max"),
+            ("musa_stage_calls_total", "counter", "Liczba wykonań etapu.", "count"),
+            ("musa_stage_rows_total", "counter", "Łączna liczba przetworzonych wierszy.", "rows_sum"),
+            # Alokacje netto mogą być ujemne (etap zwolnił pamięć), więc to gauge, a nie counter.
+            ("musa_stage_alloc_net_bytes", "gauge", "Łączne alokacje netto (tracemalloc).", "alloc_bytes_sum"),
+            ("musa_stage_peak_bytes_max", "gauge", "Największy szczyt pamięci etapu (tracemalloc).", "peak_bytes_max"),
+        ]
+        summary = self.summary()
+
+        lines = []
+        for metric, metric_type, help_text, key in metrics:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for stage, stats in sorted(summary.items()):
+                lines.append(f'{metric}{{stage="{stage}"}} {stats[key]}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _recorder_from_env() -> StageRecorder:
+    mode = os.environ.get("MUSA_INSTRUMENTATION", "").lower()
+    return StageRecorder(enabled=mode in ("1", "true", "memory"), track_memory=mode == "memory")
+
+
+recorder = _recorder_from_env()
+
+
+def configure(enabled: bool = True, track_memory: bool = False):
+    """Włącza lub wyłącza zbieranie pomiarów w globalnym recorderze."""
+    recorder.enabled = enabled
+    recorder.track_memory = track_memory
+
+
+def _count_rows(result: Any, args: tuple) -> Optional[int]:
+    """Liczba wierszy: z wyniku, a gdy go brak (np. train), z pierwszego argumentu tablicowego."""
+    for value in (result, *args):
+        shape = getattr(value, "shape", None)
+        if shape:
+            return int(shape[0])
+    return None
+
+
+def instrumented(name: str) -> Callable:
+    """
+    Dekorator mierzący wywołania funkcji jako etap `name` w globalnym recorderze.
+    Przy wyłączonych pomiarach narzut to jedno sprawdzenie flagi.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not recorder.enabled:
+                return fn(*args, **kwargs)
+
+            with recorder.stage(name) as record:
+                result = fn(*args, **kwargs)
+                record["rows"] = _count_rows(result, args)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,109 @@
+import asyncio
+import time
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from yfinance.exceptions import YFRateLimitError
+from backend.ml.data.fetchers.async_fetcher import AsyncFetcher, FakeBackend, TokenBucket, YFinanceBackend
+from backend.ml.data.fetchers.errors import EmptyDataError, RateLimitError
+
+
+def _bars(n: int = 5) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"Open": 1.0, "High": 2.0, "Low": 0.5, "Close": 1.5, "Volume": 100.0},
+        index=pd.date_range("2024-01-01", periods=n, freq="D"),
+    )
+
+
+def test_token_bucket_limits_rate():
+    async def scenario():
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # Pierwszy żeton jest od razu, kolejne 5 co 20 ms.
+    assert asyncio.run(scenario()) >= 0.09
+
+
+def test_token_bucket_and_fetcher_are_reusable_across_event_loops():
+    """Blokada kubełka i semafor są tworzone dla każdej pętli, więc kolejne asyncio.run działają."""
+    bucket = TokenBucket(rate=200, capacity=1)
+    backend = FakeBackend({f"T{i}": _bars() for i in range(4)}, latency_s=0.01)
+    fetcher = AsyncFetcher(backend, rate_per_s=200, burst=1, max_concurrency=2)
+
+    async def scenario():
+        await asyncio.gather(*(bucket.acquire() for _ in range(3)))
+        return await fetcher.fetch_many([f"T{i}" for i in range(4)])
+
+    for _ in range(2):
+        assert all(r.ok for r in asyncio.run(scenario()))
+
+
+def test_yfinance_backend_maps_rate_limit_and_empty_data():
+    """Limit zapytań z Ticker.history to RateLimitError (ponawiany), pusta ramka - EmptyDataError."""
+    backend = YFinanceBackend()
+
+    with patch("backend.ml.data.fetchers.async_fetcher.yf.Ticker") as mock_ticker:
+        mock_ticker.return_value.history.side_effect = YFRateLimitError()
+        with pytest.raises(RateLimitError):
+            asyncio.run(backend.download("AAPL", "1d", None, "1y"))
+
+        mock_ticker.return_value.history.side_effect = None
+        mock_ticker.return_value.history.return_value = pd.DataFrame()
+        with pytest.raises(EmptyDataError):
+            asyncio.run(backend.download("AAPL", "1d", None, "1y"))
+
+        mock_ticker.return_value.history.return_value = _bars().assign(Dividends=0.0)
+        df = asyncio.run(backend.download("AAPL", "1d", "2024-01-01", "1y"))
+
+    assert list(df.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert mock_ticker.return_value.history.call_args.kwargs == {"interval": "1d", "start": "2024-01-01"}
+
+
+def test_fetch_many_respects_concurrency_and_rate():
+    backend = FakeBackend({f"T{i}": _bars() for i in range(8)}, latency_s=0.02)
+    fetcher = AsyncFetcher(backend, rate_per_s=100, burst=8, max_concurrency=3)
+
+    results = asyncio.run(fetcher.fetch_many([f"T{i}" for i in range(8)]))
+
+    assert all(r.ok for r in results)
+    assert [r.ticker for r in results] == [f"T{i}" for i in range(8)]
+    assert backend.max_active == 3
+    assert fetcher.stats.requests == 8 and fetcher.stats.retries == 0
+
+
+def test_fetch_retries_rate_limit_with_backoff():
+    backend = FakeBackend({"AAPL": _bars()}, failures={"AAPL": [RateLimitError("429"), ConnectionError()]})
+    fetcher = AsyncFetcher(backend, rate_per_s=1000, backoff_base_s=0.01, max_retries=3)
+
+    df = asyncio.run(fetcher.fetch("AAPL"))
+
+    assert len(df) == 5
+    assert len(backend.calls) == 3
+    assert (fetcher.stats.requests, fetcher.stats.retries, fetcher.stats.failures) == (3, 2, 0)
+
+
+def test_fetch_gives_up_after_max_retries():
+    backend = FakeBackend({"AAPL": _bars()}, failures={"AAPL": [RateLimitError("429")] * 5})
+    fetcher = AsyncFetcher(backend, rate_per_s=1000, backoff_base_s=0.001, max_retries=2)
+
+    with pytest.raises(RateLimitError):
+        asyncio.run(fetcher.fetch("AAPL"))
+
+    assert len(backend.calls) == 3
+    assert fetcher.stats.failures == 1
+
+
+def test_empty_data_is_not_retried_and_stays_a_value_error():
+    backend = FakeBackend({"AAPL": _bars()})
+    fetcher = AsyncFetcher(backend, rate_per_s=1000)
+
+    results = asyncio.run(fetcher.fetch_many(["AAPL", "BLEDNY_TICKER"]))
+
+    errors = {r.ticker: r.error for r in results}
+    assert errors["AAPL"] is None
+    assert isinstance(errors["BLEDNY_TICKER"], EmptyDataError)
+    assert isinstance(errors["BLEDNY_TICKER"], ValueError)
+    assert len(backend.calls) == 2
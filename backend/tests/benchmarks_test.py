@@ -0,0 +1,58 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from backend.benchmarks.pipeline_suite import STAGES, compare_results, run_pipeline_suite
+from backend.benchmarks.synthetic import generate_ohlcv
+
+
+def test_generate_ohlcv_is_deterministic_and_consistent():
+    """Ten sam seed daje ten sam szereg, a High/Low obejmują Open i Close."""
+    df = generate_ohlcv(1_000, freq="min")
+
+    pd.testing.assert_frame_equal(df, generate_ohlcv(1_000, freq="min"))
+    assert (df["High"] >= df[["Open", "Close"]].max(axis=1)).all()
+    assert (df["Low"] <= df[["Open", "Close"]].min(axis=1)).all()
+
+
+def test_generate_ohlcv_market_hours_index():
+    """Indeks sesyjny ma tylko dni robocze i świece w godzinach 09:30-16:00."""
+    df = generate_ohlcv(100, freq="30min", market_hours=True)
+
+    minutes = df.index.hour * 60 + df.index.minute
+    assert len(df) == 100
+    assert df.index.is_monotonic_increasing
+    assert (df.index.dayofweek < 5).all()
+    assert ((minutes >= 9 * 60 + 30) & (minutes < 16 * 60)).all()
+
+
+def test_generate_ohlcv_upper_bound_fits_datetime_range():
+    """10M świec minutowych (ciągłych i sesyjnych) mieści się w datetime64[ns]; za długi szereg daje czytelny ValueError."""
+    for market_hours in (False, True):
+        index = generate_ohlcv(10_000_000, freq="min", market_hours=market_hours).index
+        assert len(index) == 10_000_000 and index.is_monotonic_increasing and index.is_unique
+
+    daily = generate_ohlcv(200_000, freq="D").index
+    assert len(daily) == 200_000 and daily[-1] <= pd.Timestamp("2262-01-01")
+
+    with pytest.raises(ValueError, match="datetime64"):
+        generate_ohlcv(10_000_000, freq="D")
+    with pytest.raises(ValueError, match="datetime64"):
+        generate_ohlcv(10_000_000, freq="h", market_hours=True)
+
+
+def test_pipeline_suite_writes_comparable_results(tmp_path):
+    """Suite zapisuje wszystkie etapy do JSON, a compare_results zestawia dwa przebiegi."""
+    output = tmp_path / "bench.json"
+
+    report = run_pipeline_suite(sizes=(300,), max_train_rows=200, output_path=str(output))
+
+    with open(output, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert [r["stage"] for r in saved["results"]] == STAGES
+    assert all(r["time_s"] >= 0 and r["peak_mb"] is not None for r in report["results"])
+    assert "commit" in saved["environment"]
+
+    comparison = compare_results(str(output), str(output))
+    assert len(comparison) == len(STAGES)
+    np.testing.assert_allclose(comparison["time_ratio"], 1.0)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from backend.benchmarks.synthetic import generate_ohlcv
+from backend.ml.data.chunked import MIN_OVERLAP, iter_chunks, map_features_and_target_chunked, plan_chunks
+from backend.ml.data.create_target import create_market_target
+from backend.ml.data.dataset import build_dataset
+from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
+
+
+@pytest.fixture(scope="module")
+def ohlcv():
+    return generate_ohlcv(12_000, freq="min")
+
+
+def test_plan_chunks_covers_series_with_overlaps():
+    """Kawałki pokrywają szereg bez przerw; zakładki nie wychodzą poza jego granice."""
+    specs = plan_chunks(1_000, chunk_size=300, overlap=100, window=5)
+
+    assert [(s.start, s.stop) for s in specs] == [(0, 300), (300, 600), (600, 900), (900, 1000)]
+    assert [s.lead for s in specs] == [0, 100, 100, 100]
+    assert [s.lookahead for s in specs] == [5, 5, 5, 0]
+
+    with pytest.raises(ValueError):
+        plan_chunks(1_000, chunk_size=300, overlap=MIN_OVERLAP - 1)
+
+
+@pytest.mark.parametrize(
+    "chunk_size, overlap, window, max_workers",
+    [(2_500, 1024, 5, 1), (3_001, 1024, 12, 2), (4_000, MIN_OVERLAP, 5, 1), (700, 64, 0, 2)],
+)
+def test_chunked_matches_full_run_exactly(ohlcv, chunk_size, overlap, window, max_workers):
+    """Sklejone kawałki są identyczne co do bitu z pełnym przebiegiem - także przy zbyt krótkiej zakładce."""
+    features, target = map_features_and_target_chunked(
+        ohlcv, chunk_size, overlap, window=window, max_workers=max_workers
+    )
+
+    pd.testing.assert_frame_equal(features, map_ohlcv_to_features(ohlcv), check_exact=True, check_freq=False)
+    pd.testing.assert_series_equal(target, create_market_target(ohlcv, window=window), check_exact=True, check_freq=False)
+
+
+def test_iter_chunks_streams_in_order_and_sorts_input(ohlcv):
+    """iter_chunks oddaje kawałki po kolei; nieposortowane wejście jest sortowane jak w map_ohlcv_to_features."""
+    shuffled = ohlcv.sample(frac=1.0, random_state=0)
+    parts = list(iter_chunks(shuffled, chunk_size=5_000, compact=True, max_workers=1))
+
+    assert [len(target) for _, target in parts] == [5_000, 5_000, 2_000]
+    features = pd.concat([f for f, _ in parts])
+    assert features.dtypes.unique().tolist() == [np.float32]
+    pd.testing.assert_frame_equal(features, map_ohlcv_to_features(ohlcv, compact=True), check_freq=False)
+
+
+def test_build_dataset_chunked_matches_default(ohlcv):
+    pd.testing.assert_frame_equal(
+        build_dataset(ohlcv, chunk_size=4_000, max_workers=2), build_dataset(ohlcv), check_freq=False
+    )
+
+
+def test_retry_overlap_is_capped(ohlcv):
+    """Rozbieżny stan na granicy nie rozciąga wycinka do całego szeregu - powyżej max_overlap jest ValueError."""
+    with patch("backend.ml.data.chunked._same_state", return_value=False):
+        with pytest.raises(ValueError, match="max_overlap"):
+            list(iter_chunks(ohlcv, chunk_size=3_000, overlap=64, max_workers=1, max_overlap=256))
+
+    with pytest.raises(ValueError):
+        list(iter_chunks(ohlcv, chunk_size=3_000, overlap=1024, max_workers=1, max_overlap=512))
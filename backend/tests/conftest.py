@@ -0,0 +1,32 @@
+from typing import Callable
+import numpy as np
+import pytest
+from pandas import DataFrame
+from ta.momentum import rsi
+from ta.trend import macd, macd_diff
+from ta.volatility import average_true_range
+
+
+def _ta_reference_features(df: DataFrame) -> DataFrame:
+    """Referencyjne cechy z biblioteki `ta` - każdy wskaźnik liczy swoje etapy od zera (poprzednia wersja mappera)."""
+    X = DataFrame(index=df.index)
+    X["log_returns"] = np.log(df["Close"] / df["Close"].shift(1))
+    X["rsi"] = rsi(close=df["Close"], window=14)
+    X["macd"] = macd(close=df["Close"])
+    X["macd_hist"] = macd_diff(close=df["Close"])
+    X["atr"] = average_true_range(high=df["High"], low=df["Low"], close=df["Close"], window=14)
+
+    hour = 2 * np.pi * df.index.hour / 24
+    X["hour_sin"] = np.sin(hour)
+    X["hour_cos"] = np.cos(hour)
+    day_of_week = 2 * np.pi * df.index.dayofweek / 7
+    X["day_sin"] = np.sin(day_of_week)
+    X["day_cos"] = np.cos(day_of_week)
+
+    return X.dropna()
+
+
+@pytest.fixture
+def ta_features() -> Callable[[DataFrame], DataFrame]:
+    """Implementacja referencyjna map_ohlcv_to_features oparta o `ta`, do testów zgodności co do bitu."""
+    return _ta_reference_features
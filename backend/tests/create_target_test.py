@@ -2,7 +2,7 @@ import pytest
 import pandas as pd
 import numpy as np
 from pandas import DataFrame
-from backend.ml.data.create_target import create_market_target
+from backend.ml.data.create_target import barrier_grid, create_market_target, create_market_target_grid
 
 
 @pytest.fixture
@@ -60,3 +60,77 @@ def test_target_priority_tp_over_sl(sample_ohlcv):
 
     result = create_market_target(sample_ohlcv, tp_pct=0.015, sl_pct=0.01, window=3)
     assert result.iloc[0] == 1.0
+
+
+@pytest.mark.parametrize("window", [0, 1, 3, 5, 20])
+def test_target_vectorized_matches_loop(window):
+    """Sprawdza, czy silnik wektorowy daje identyczne etykiety jak pętla referencyjna."""
+    rng = np.random.default_rng(7)
+    periods = 500
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    df = DataFrame(
+        {
+            "High": close * (1 + rng.uniform(0, 0.015, periods)),
+            "Low": close * (1 - rng.uniform(0, 0.015, periods)),
+            "Close": close,
+        },
+        index=pd.date_range("2024-01-01", periods=periods, freq="h"),
+    )
+
+    expected = create_market_target(df, window=window, engine="loop")
+    result = create_market_target(df, window=window, engine="vectorized")
+
+    pd.testing.assert_series_equal(result, expected)
+
+
+def test_target_vectorized_short_history(sample_ohlcv):
+    """Sprawdza, czy historia krótsza niż okno daje same NaN w obu silnikach."""
+    expected = create_market_target(sample_ohlcv, window=15, engine="loop")
+    result = create_market_target(sample_ohlcv, window=15)
+
+    assert result.isna().all()
+    pd.testing.assert_series_equal(result, expected)
+
+
+def test_target_grid_matches_single_config_calls():
+    """Każda kolumna siatki daje te same etykiety co osobne wywołanie create_market_target."""
+    rng = np.random.default_rng(11)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 500)))
+    df = DataFrame(
+        {
+            "High": close * (1 + rng.uniform(0, 0.015, 500)),
+            "Low": close * (1 - rng.uniform(0, 0.015, 500)),
+            "Close": close,
+        },
+        index=pd.date_range("2024-01-01", periods=500, freq="h"),
+    )
+    configs = barrier_grid([0.005, 0.015, 0.03], [0.005, 0.01], [1, 5, 12]) + [(0.01, 0.01, 0)]
+
+    grid = create_market_target_grid(df, configs, chunk_size=1000)
+
+    assert grid.labels.shape == (500, len(configs)) and grid.labels.dtype == np.int8
+    for k, (tp, sl, window) in enumerate(configs):
+        expected = create_market_target(df, tp_pct=tp, sl_pct=sl, window=window)
+        pd.testing.assert_series_equal(grid.label_series(k), expected)
+
+
+def test_target_grid_hit_time_and_return(sample_ohlcv):
+    sample_ohlcv.loc[sample_ohlcv.index[2], "High"] = 102.0
+    sample_ohlcv.loc[sample_ohlcv.index[4], "Low"] = 98.0
+    sample_ohlcv.loc[sample_ohlcv.index[5:], "Close"] = 101.0
+
+    grid = create_market_target_grid(sample_ohlcv, [(0.015, 0.01, 3), (0.05, 0.01, 4), (0.05, 0.05, 2)])
+
+    # TP w drugiej świecy okna.
+    assert (grid.labels[0, 0], grid.hit_bars[0, 0]) == (1, 2)
+    assert grid.returns[0, 0] == np.float32(0.015)
+    # TP poza zasięgiem, SL w czwartej świecy.
+    assert (grid.labels[0, 1], grid.hit_bars[0, 1]) == (-1, 4)
+    assert grid.returns[0, 1] == np.float32(-0.01)
+    # Bariera czasowa: zwrot z Close na końcu okna.
+    assert (grid.labels[3, 2], grid.hit_bars[3, 2]) == (0, 2)
+    assert grid.returns[3, 2] == np.float32(0.01)
+    assert not grid.valid[-2:, 2].any() and np.isnan(grid.returns[-2:, 2]).all()
+
+    summary = grid.summary()
+    assert list(summary["window"]) == [3, 4, 2]
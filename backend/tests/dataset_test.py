@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from backend.ml.data.create_target import create_market_target
+from backend.ml.data.dataset import CompactDataset, build_dataset
+from backend.ml.data.feature_scaler import FeatureScaler
+from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
+
+
+def _random_walk_ohlcv(periods: int = 300) -> DataFrame:
+    rng = np.random.default_rng(21)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    return DataFrame(
+        {
+            "Open": close,
+            "High": close * (1 + rng.uniform(0, 0.02, periods)),
+            "Low": close * (1 - rng.uniform(0, 0.02, periods)),
+            "Close": close,
+            "Volume": rng.integers(1000, 5000, periods),
+        },
+        index=pd.date_range("2024-01-01", periods=periods, freq="h"),
+    )
+
+
+def test_build_dataset_matches_manual_concat():
+    """Domyślny tryb odtwarza dotychczasowe pd.concat([cechy, target]).dropna() ze start_dev."""
+    df = _random_walk_ohlcv()
+    expected = pd.concat([map_ohlcv_to_features(df), create_market_target(df)], axis=1).dropna()
+
+    pd.testing.assert_frame_equal(build_dataset(df), expected)
+
+
+def test_build_dataset_compact_matches_default():
+    """Tryb kompaktowy ma te same wiersze i wartości (z dokładnością float32) w ciągłych tablicach."""
+    df = _random_walk_ohlcv()
+    expected = build_dataset(df, window=7)
+    compact = build_dataset(df, window=7, compact=True)
+
+    assert isinstance(compact, CompactDataset)
+    assert compact.X.dtype == np.float32 and compact.X.flags.c_contiguous
+    assert compact.y.dtype == np.int8
+    pd.testing.assert_index_equal(compact.index, expected.index)
+    np.testing.assert_array_equal(compact.y, expected["target"].to_numpy())
+    np.testing.assert_allclose(compact.X, expected.drop(columns="target").to_numpy(), rtol=1e-6, atol=1e-6)
+
+
+def test_compact_to_frame_is_a_view():
+    compact = build_dataset(_random_walk_ohlcv(), compact=True)
+
+    frame = compact.to_frame()
+
+    assert list(frame.columns) == compact.columns
+    assert np.shares_memory(frame.to_numpy(), compact.X)
+
+
+def test_compact_scaling_in_place_writes_into_x():
+    """transform_array(X, out=X) skaluje X w miejscu; transform(inplace=True) na to_frame() nie zmienia X."""
+    compact = build_dataset(_random_walk_ohlcv(), compact=True)
+    original = compact.X.copy()
+    scaler = FeatureScaler()
+    scaler.fit_chunks([compact.X], compact.columns)
+
+    scaled = scaler.transform(compact.to_frame(), inplace=True)
+    np.testing.assert_array_equal(compact.X, original)
+
+    scaler.transform_array(compact.X, out=compact.X)
+    np.testing.assert_allclose(compact.X, scaled.to_numpy(), rtol=1e-5, atol=1e-5)
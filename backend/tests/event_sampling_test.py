@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas import DataFrame
+from backend.ml.data.dataset import build_dataset
+from backend.ml.data.event_sampling import cusum_events, volatility_threshold
+
+
+def _random_walk(periods: int = 5_000, seed: int = 5) -> DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, periods)))
+    return DataFrame(
+        {
+            "Open": close,
+            "High": close * (1 + rng.uniform(0, 0.002, periods)),
+            "Low": close * (1 - rng.uniform(0, 0.002, periods)),
+            "Close": close,
+            "Volume": rng.integers(1000, 5000, periods),
+        },
+        index=pd.date_range("2024-01-02 09:30", periods=periods, freq="min"),
+    )
+
+
+@pytest.mark.parametrize("threshold", [0.003, 0.01, 0.03])
+def test_cusum_vectorized_matches_loop_constant_threshold(threshold):
+    """Rzadkie zdarzenia idą ścieżką blokową, gęste pętlą - oba silniki dają te same świece."""
+    df = _random_walk()
+
+    expected = cusum_events(df, threshold, engine="loop")
+    result = cusum_events(df, threshold, engine="vectorized")
+
+    assert len(expected) > 0
+    pd.testing.assert_index_equal(result, expected)
+
+
+@pytest.mark.parametrize("multiplier", [1.0, 6.0])
+def test_cusum_vectorized_matches_loop_volatility_threshold(multiplier):
+    df = _random_walk(seed=8)
+    threshold = volatility_threshold(df, span=50, multiplier=multiplier)
+
+    pd.testing.assert_index_equal(
+        cusum_events(df, threshold), cusum_events(df, threshold, engine="loop")
+    )
+
+
+def test_cusum_detects_jumps_both_ways():
+    close = np.r_[np.full(10, 100.0), np.full(10, 105.0), np.full(10, 99.0)]
+    df = DataFrame({"Close": close}, index=pd.date_range("2024-01-01", periods=30, freq="h"))
+
+    events = cusum_events(df, 0.03)
+
+    assert list(events) == [df.index[10], df.index[20]]
+
+
+def test_cusum_unknown_engine():
+    with pytest.raises(ValueError):
+        cusum_events(_random_walk(100), 0.01, engine="numba")
+
+
+def test_build_dataset_keeps_only_event_rows():
+    df = _random_walk()
+    events = cusum_events(df, 0.01)
+
+    full = build_dataset(df)
+    sampled = build_dataset(df, events=events)
+
+    assert 0 < len(sampled) < len(full)
+    assert sampled.index.isin(events).all()
+    pd.testing.assert_frame_equal(sampled, full.loc[full.index.isin(events)])
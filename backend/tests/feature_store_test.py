@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas import DataFrame
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from backend.ml.data.feature_store import FeatureStore
+from backend.ml.data.mappers.feature_graph import build_ohlcv_graph
+
+
+@pytest.fixture
+def ohlcv() -> DataFrame:
+    """Losowy szereg OHLCV wystarczająco długi, żeby wskaźniki się rozgrzały."""
+    rng = np.random.default_rng(11)
+    periods = 200
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    return DataFrame(
+        {
+            "Open": close,
+            "High": close * (1 + rng.uniform(0, 0.02, periods)),
+            "Low": close * (1 - rng.uniform(0, 0.02, periods)),
+            "Close": close,
+            "Volume": rng.integers(1000, 5000, periods),
+        },
+        index=pd.date_range("2024-01-01", periods=periods, freq="h"),
+    )
+
+
+def test_feature_store_reuses_entry(ohlcv, tmp_path):
+    """Drugie wywołanie z tą samą konfiguracją i danymi nie liczy cech od nowa."""
+    store = FeatureStore(str(tmp_path))
+    first = store.get_or_build("AAPL", "1h", ohlcv)
+
+    with patch("backend.ml.data.feature_store.build_dataset") as mock_mapper:
+        second = store.get_or_build("AAPL", "1h", ohlcv)
+        mock_mapper.assert_not_called()
+
+    pd.testing.assert_frame_equal(second, first, check_freq=False)
+    assert "target" in second.columns
+    assert second.isna().sum().sum() == 0
+
+
+def test_feature_store_load_is_memory_mapped(ohlcv, tmp_path):
+    """Zbiór z magazynu jest widokiem na plik (memmap), a nie kopią."""
+    store = FeatureStore(str(tmp_path))
+    store.get_or_build("AAPL", "1h", ohlcv)
+
+    dataset = store.load("AAPL", "1h")
+
+    values = dataset.to_numpy()
+    bases = []
+    while values is not None:
+        bases.append(values)
+        values = getattr(values, "base", None)
+
+    assert any(isinstance(base, np.memmap) for base in bases)
+    assert store.load("AAPL", "1h", window=10) is None
+
+
+def test_feature_store_rebuilds_on_config_or_source_change(ohlcv, tmp_path):
+    """Zmiana parametrów targetu lub danych źródłowych wymusza przeliczenie."""
+    store = FeatureStore(str(tmp_path))
+    base = store.get_or_build("AAPL", "1h", ohlcv)
+
+    other_window = store.get_or_build("AAPL", "1h", ohlcv, window=10)
+    assert len(other_window) == len(base) - 5
+
+    changed = ohlcv.copy()
+    changed.iloc[-20:, changed.columns.get_loc("Close")] *= 1.1
+    rebuilt = store.get_or_build("AAPL", "1h", changed)
+    assert not rebuilt["log_returns"].equals(base["log_returns"])
+
+
+def test_feature_store_evicts_least_recently_used(ohlcv, tmp_path):
+    """Po przekroczeniu max_bytes znika najdawniej używany wpis."""
+    store = FeatureStore(str(tmp_path))
+    store.get_or_build("AAPL", "1h", ohlcv)
+    entry_bytes = store.total_bytes()
+
+    store = FeatureStore(str(tmp_path), max_bytes=int(entry_bytes * 2.5))
+    store.get_or_build("MSFT", "1h", ohlcv)
+    store.load("AAPL", "1h")
+    store.get_or_build("NVDA", "1h", ohlcv)
+
+    assert store.load("MSFT", "1h") is None
+    assert store.load("AAPL", "1h") is not None
+    assert store.load("NVDA", "1h") is not None
+    assert store.total_bytes() <= store.max_bytes
+
+
+def test_feature_store_read_does_not_rewrite_metadata(ohlcv, tmp_path):
+    """Odczyt nie zapisuje metadanych wpisu - czas dostępu trafia do mtime katalogu wpisu."""
+    store = FeatureStore(str(tmp_path))
+    store.get_or_build("AAPL", "1h", ohlcv)
+    entry_dir = next(path for path in tmp_path.iterdir() if path.is_dir())
+    meta_path = entry_dir / FeatureStore.META_FILE
+    meta_before = (meta_path.read_bytes(), meta_path.stat().st_mtime_ns)
+    accessed_before = entry_dir.stat().st_mtime_ns
+
+    store.load("AAPL", "1h")
+    store.get_or_build("AAPL", "1h", ohlcv)
+
+    assert (meta_path.read_bytes(), meta_path.stat().st_mtime_ns) == meta_before
+    assert entry_dir.stat().st_mtime_ns > accessed_before
+
+
+def test_feature_store_concurrent_builders_keep_all_entries(ohlcv, tmp_path):
+    """Równoległe budowanie różnych wpisów nie gubi żadnego z nich."""
+    store = FeatureStore(str(tmp_path))
+    tickers = [f"T{i}" for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda ticker: store.get_or_build(ticker, "1h", ohlcv), tickers))
+
+    assert all(store.load(ticker, "1h") is not None for ticker in tickers)
+
+
+def test_feature_store_config_hash_covers_feature_graph_params():
+    """Zmiana parametrów grafu cech (np. okna RSI) daje inny klucz wpisu."""
+    base = FeatureStore.config_hash(0.015, 0.01, 5)
+
+    with patch("backend.ml.data.feature_store.OHLCV_GRAPH", build_ohlcv_graph(rsi_window=7)):
+        assert FeatureStore.config_hash(0.015, 0.01, 5) != base
+
+    assert FeatureStore.config_hash(0.015, 0.01, 5) == base
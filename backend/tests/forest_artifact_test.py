@@ -0,0 +1,96 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.exceptions import NotFittedError
+from backend.api.services.prediction_service import PredictionService
+from backend.ml.architectures.forest_artifact import is_artifact, load_artifact, save_artifact
+from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+from backend.ml.data.feature_scaler import FeatureScaler
+
+FEATURES = ["log_returns", "rsi", "macd", "atr"]
+
+
+@pytest.fixture
+def trained():
+    """Mały model i skaler wytrenowane na losowych danych."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(400, len(FEATURES))), columns=FEATURES)
+    y = pd.Series(np.where(X["rsi"] > 0.5, 1, np.where(X["macd"] < -0.5, -1, 0)))
+
+    scaler = FeatureScaler()
+    X_scaled = scaler.fit_transform(X, FEATURES)
+    bot = MusaRandomForestTreeClassifier(n_estimators=15, max_depth=6)
+    bot.train(X_scaled, y)
+
+    return bot, scaler, X
+
+
+def test_artifact_roundtrip_matches_sklearn(trained, tmp_path):
+    """Model z artefaktu (mmap) daje te same prawdopodobieństwa co sklearn - także dla dużych paczek."""
+    bot, scaler, X = trained
+    save_artifact(bot, str(tmp_path), scaler)
+
+    artifact = load_artifact(str(tmp_path))
+    X_scaled = artifact.scaler.transform(X)
+
+    assert is_artifact(str(tmp_path))
+    np.testing.assert_allclose(artifact.model.predict_proba(X_scaled), bot.model.predict_proba(X_scaled), rtol=1e-12, atol=1e-15)
+    np.testing.assert_array_equal(artifact.model.predict(X_scaled.head(3)), bot.model.predict(X_scaled.head(3)))
+    pd.testing.assert_frame_equal(X_scaled, scaler.transform(X))
+    assert list(artifact.model.compiled.feature_names_in_) == FEATURES
+
+
+def test_save_artifact_does_not_compile_live_model(trained, tmp_path):
+    """Zapis artefaktu nie przełącza żywego modelu na ścieżkę skompilowaną."""
+    bot, scaler, _ = trained
+    save_artifact(bot, str(tmp_path), scaler)
+
+    assert bot.compiled is None
+
+
+def test_artifact_arrays_are_memory_mapped(trained, tmp_path):
+    """Tablice węzłów są mapowane z plików tylko do odczytu, a dane .npy zaczynają się na granicy 64 bajtów."""
+    bot, _, _ = trained
+    save_artifact(bot, str(tmp_path))
+
+    compiled = load_artifact(str(tmp_path)).model.compiled
+
+    assert isinstance(compiled.threshold.base, np.memmap)
+    assert not compiled.threshold.flags.writeable
+    with open(tmp_path / "value.npy", "rb") as f:
+        np.lib.format.read_magic(f)
+        np.lib.format.read_array_header_1_0(f)
+        assert f.tell() % 64 == 0
+
+    header = json.loads((tmp_path / "header.json").read_text())
+    assert header["feature_names"] == FEATURES
+    assert header["scaler"] is None
+    assert header["n_trees"] == 15
+
+
+def test_artifact_model_is_inference_only(trained, tmp_path):
+    """Model z artefaktu nie ma drzew sklearn, więc update() jest blokowany, a train() trenuje od zera."""
+    bot, _, X = trained
+    save_artifact(bot, str(tmp_path))
+    model = load_artifact(str(tmp_path)).model
+
+    with pytest.raises(NotFittedError):
+        model.update(X, pd.Series(np.zeros(len(X))))
+
+    model.train(X, bot.model.predict(X))
+    assert model.compiled is None
+    assert len(model.predict(X)) == len(X)
+
+
+def test_prediction_service_loads_artifact_directory(trained, tmp_path):
+    """PredictionService.from_paths przyjmuje katalog artefaktu i bierze skaler z nagłówka."""
+    bot, scaler, X = trained
+    save_artifact(bot, str(tmp_path), scaler)
+
+    service = PredictionService.from_paths(str(tmp_path))
+    results = service.predict_batch(X.head(5).to_dict("records"))
+
+    expected = bot.predict_proba(scaler.transform(X.head(5)))
+    assert service.classes == [-1, 0, 1]
+    assert [r["probabilities"]["1"] for r in results] == pytest.approx(expected[:, 2])
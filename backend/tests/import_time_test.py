@@ -0,0 +1,46 @@
+import os
+import re
+import subprocess
+import sys
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# Budżety czasu importu (skumulowane µs z `python -X importtime`). Są celowo luźne,
+# bo CI bywa wolne - regresję typu "import pandas/sklearn na starcie" i tak wyłapie
+# lista zakazanych modułów poniżej.
+IMPORT_BUDGETS_US = {
+    "backend.main": 300_000,
+    "backend.api.services.prediction_service": 800_000,
+}
+
+HEAVY_MODULES = ["pandas", "sklearn", "scipy", "joblib", "yfinance", "ta", "tensorflow"]
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": SRC_DIR}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code], capture_output=True, text=True, env=env, check=True
+    )
+
+
+def _cumulative_import_us(module: str) -> int:
+    """Skumulowany czas importu modułu w µs, w świeżym interpreterze."""
+    stderr = _run(f"import {module}", "-X", "importtime").stderr
+    pattern = re.compile(rf"^import time:\s+\d+ \|\s+(\d+) \|\s*{re.escape(module)}$", re.MULTILINE)
+    match = pattern.search(stderr)
+    assert match is not None, stderr[-2000:]
+    return int(match.group(1))
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_US))
+def test_import_time_within_budget(module):
+    elapsed_us = _cumulative_import_us(module)
+    assert elapsed_us < IMPORT_BUDGETS_US[module], f"{module}: {elapsed_us / 1000:.1f} ms"
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_US))
+def test_import_does_not_load_heavy_dependencies(module):
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    loaded = _run(code).stdout.strip()
+    assert loaded == ""
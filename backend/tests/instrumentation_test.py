@@ -0,0 +1,112 @@
+import json
+import threading
+import tracemalloc
+import numpy as np
+import pandas as pd
+import pytest
+from backend.monitoring.instrumentation import StageRecorder, configure, instrumented, recorder
+from backend.ml.data.create_target import create_market_target
+
+
+@pytest.fixture
+def enabled_recorder():
+    """Włącza globalny recorder na czas testu i przywraca stan wyłączony."""
+    recorder.reset()
+    configure(enabled=True, track_memory=True)
+    yield recorder
+    configure(enabled=False)
+    recorder.reset()
+
+
+def test_disabled_recorder_collects_nothing():
+    local = StageRecorder()
+
+    with local.stage("features", rows=10):
+        pass
+
+    assert local.records == []
+    assert local.summary() == {}
+
+
+def test_instrumented_pipeline_function_records_rows(enabled_recorder):
+    """Dekorator na create_market_target zapisuje czas, liczbę wierszy i alokacje."""
+    df = pd.DataFrame(
+        {"High": np.full(50, 100.0), "Low": np.full(50, 100.0), "Close": np.full(50, 100.0)},
+        index=pd.date_range("2024-01-01", periods=50, freq="h"),
+    )
+
+    create_market_target(df)
+
+    record = enabled_recorder.records[-1]
+    assert record["stage"] == "create_market_target"
+    assert record["rows"] == 50
+    assert record["time_s"] >= 0
+    assert record["peak_bytes"] is not None
+    assert enabled_recorder.summary()["create_market_target"]["count"] == 1
+
+
+def test_nested_stages_and_exports(tmp_path):
+    """Zagnieżdżone etapy są mierzone osobno, a eksport JSON i Prometheus zawiera oba."""
+    local = StageRecorder(enabled=True, track_memory=True)
+
+    with local.stage("outer", rows=3):
+        with local.stage("inner") as record:
+            record["rows"] = 2
+
+    assert [r["stage"] for r in local.records] == ["inner", "outer"]
+    assert local.records[0]["peak_bytes"] is None
+    assert local.records[1]["peak_bytes"] is not None
+
+    path = tmp_path / "metrics.jsonl"
+    local.export_json(str(path))
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["rows"] for line in lines] == [2, 3]
+
+    # Kolejny eksport nadpisuje plik migawką zamiast dopisywać te same pomiary.
+    local.export_json(str(path))
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
+    text = local.render_prometheus()
+    assert 'musa_stage_calls_total{stage="inner"} 1' in text
+    assert 'musa_stage_rows_total{stage="outer"} 3' in text
+    # Każdy counter kończy się na _total (wymóg Prometheusa/OpenMetrics).
+    counters = [line.split()[2] for line in text.splitlines() if line.startswith("# TYPE") and line.endswith(" counter")]
+    assert counters and all(name.endswith("_total") for name in counters)
+
+
+def test_instrumented_decorator_preserves_function():
+    @instrumented("double")
+    def double(x: int) -> int:
+        """Podwaja liczbę."""
+        return x * 2
+
+    assert double(4) == 8
+    assert double.__name__ == "double"
+    assert double.__doc__ == "Podwaja liczbę."
+
+
+def test_parallel_stages_keep_tracing_until_last_exit():
+    """Etap, który uruchomił tracemalloc i skończył się pierwszy, nie zatrzymuje pomiaru etapu w innym wątku."""
+    local = StageRecorder(enabled=True, track_memory=True)
+    entered, first_done = threading.Event(), threading.Event()
+    tracing_after_first_exit = []
+
+    def parallel_stage():
+        with local.stage("parallel") as record:
+            entered.set()
+            first_done.wait(timeout=5)
+            tracing_after_first_exit.append(tracemalloc.is_tracing())
+            record["rows"] = 1
+
+    with local.stage("first"):
+        worker = threading.Thread(target=parallel_stage)
+        worker.start()
+        entered.wait(timeout=5)
+    first_done.set()
+    worker.join()
+
+    assert tracing_after_first_exit == [True]
+    assert not tracemalloc.is_tracing()
+    first, parallel = local.records
+    assert first["peak_bytes"] is not None
+    assert parallel["peak_bytes"] is None and parallel["alloc_bytes"] is not None
@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
 import numpy as np
+from backend.ml.data.mappers.feature_graph import FeatureGraph
 from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
 from pandas import DataFrame
 
@@ -166,3 +167,34 @@ def test_map_ohlcv_macd_direction():
 
     assert result["macd"].iloc[-1] < 0
     assert result["macd_hist"].iloc[-1] < 0
+
+
+def test_map_ohlcv_matches_ta_bit_for_bit(ta_features):
+    """Graf cech daje dokładnie te same wartości co wskaźniki z biblioteki `ta`."""
+    from backend.benchmarks.synthetic import generate_ohlcv
+
+    df = generate_ohlcv(2_000, market_hours=True)
+
+    pd.testing.assert_frame_equal(map_ohlcv_to_features(df), ta_features(df), check_exact=True)
+
+
+def test_feature_graph_computes_shared_nodes_once():
+    graph = FeatureGraph()
+    calls = []
+
+    def ema_fast(close):
+        calls.append("ema_fast")
+        return close * 2
+
+    graph.add("ema_fast", ("close",), ema_fast)
+    graph.add("a", ("ema_fast",), lambda x: x + 1)
+    graph.add("b", ("ema_fast", "close"), lambda x, close: x - close)
+
+    df = pd.DataFrame({"Close": [1.0, 2.0]})
+    result = graph.compute(df, ["a", "b"])
+
+    assert calls == ["ema_fast"]
+    assert list(result["a"]) == [3.0, 5.0] and list(result["b"]) == [1.0, 2.0]
+
+    with pytest.raises(ValueError):
+        graph.add("c", ("missing",), lambda x: x)
@@ -0,0 +1,186 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from backend.ml.architectures.forest_artifact import save_artifact
+from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+from backend.ml.data.feature_scaler import FeatureScaler
+from backend.ml.models.model_registry import ModelRegistry
+
+FEATURES = ["f1", "f2", "f3"]
+
+
+def _save_artifact(
+    root, ticker: str, interval: str, version: str, n_estimators: int = 3, seed: int = 0, mmap: bool = False
+):
+    """Trenuje mały model ze skalerem i zapisuje go w układzie katalogów rejestru."""
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.random((30, len(FEATURES))), columns=FEATURES)
+    y = pd.Series([1, 0, -1] * 10)
+
+    scaler = FeatureScaler()
+    bot = MusaRandomForestTreeClassifier(n_estimators=n_estimators)
+    bot.train(scaler.fit_transform(X, FEATURES), y)
+
+    artifact_dir = os.path.join(root, ticker, interval, version)
+    os.makedirs(artifact_dir, exist_ok=True)
+    if mmap:
+        save_artifact(bot, os.path.join(artifact_dir, "forest"), scaler)
+        return
+
+    bot.save(os.path.join(artifact_dir, "model.joblib"))
+    scaler.save_scaler(os.path.join(artifact_dir, "scaler.joblib"))
+
+
+def test_registry_lazy_loads_latest_version(tmp_path):
+    """Rejestr nic nie wczytuje przed pierwszym użyciem i wybiera najnowszą wersję."""
+    for version in ["v2", "v10", "v9"]:
+        _save_artifact(tmp_path, "AAPL", "1d", version)
+
+    registry = ModelRegistry(str(tmp_path))
+    assert registry.loaded_bytes() == 0
+
+    entry = registry.get("AAPL", "1d")
+
+    assert entry.version == "v10"
+    assert entry.model.is_trained is True
+    assert entry.scaler.columns_to_scale == FEATURES
+    assert registry.get("AAPL", "1d") is entry
+    assert registry.get("AAPL", "1d", version="v2").version == "v2"
+
+
+def test_registry_evicts_least_recently_used(tmp_path):
+    """Po przekroczeniu budżetu z pamięci znika najdawniej używany model."""
+    for ticker in ["AAPL", "MSFT", "NVDA"]:
+        _save_artifact(tmp_path, ticker, "1d", "v1")
+
+    probe = ModelRegistry(str(tmp_path))
+    entry_size = probe.get("AAPL", "1d").size_bytes
+
+    registry = ModelRegistry(str(tmp_path), memory_budget_bytes=int(entry_size * 2.5))
+    first = registry.get("AAPL", "1d")
+    evicted = registry.get("MSFT", "1d")
+    registry.get("AAPL", "1d")
+    registry.get("NVDA", "1d")
+
+    assert registry.loaded_bytes() <= registry.memory_budget_bytes
+    assert registry.get("AAPL", "1d") is first
+    assert registry.get("MSFT", "1d") is not evicted
+    assert registry._load_locks == {}
+
+
+def test_registry_hot_swaps_new_version(tmp_path):
+    """Nowa wersja na dysku podmienia model, a stary wpis nadal działa dla predykcji w toku."""
+    _save_artifact(tmp_path, "AAPL", "1d", "v1")
+    registry = ModelRegistry(str(tmp_path), reload_check_s=0)
+
+    old = registry.get("AAPL", "1d")
+    _save_artifact(tmp_path, "AAPL", "1d", "v2", n_estimators=4, seed=1)
+    new = registry.get("AAPL", "1d")
+
+    assert new is not old
+    assert new.version == "v2"
+    assert len(new.model.model.estimators_) == 4
+
+    X = pd.DataFrame(np.random.rand(5, len(FEATURES)), columns=FEATURES)
+    assert len(old.model.predict(old.scaler.transform(X))) == 5
+
+
+def test_registry_missing_model_raises(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+
+    with pytest.raises(FileNotFoundError):
+        registry.get("AAPL", "1d")
+
+
+def test_registry_loads_mmap_artifact(tmp_path):
+    """Wersja zapisana jako katalog forest/ jest widoczna i wczytywana razem ze skalerem z nagłówka."""
+    _save_artifact(tmp_path, "AAPL", "1d", "v1")
+    _save_artifact(tmp_path, "AAPL", "1d", "v2", n_estimators=4, mmap=True)
+    registry = ModelRegistry(str(tmp_path))
+
+    entry = registry.get("AAPL", "1d")
+
+    assert registry.versions("AAPL", "1d") == ["v1", "v2"]
+    assert entry.version == "v2"
+    assert entry.model.compiled.n_trees == 4
+    assert entry.scaler.columns_to_scale == FEATURES
+    assert entry.size_bytes > 0
+
+    X = pd.DataFrame(np.random.rand(5, len(FEATURES)), columns=FEATURES)
+    assert len(entry.model.predict(entry.scaler.transform(X))) == 5
+
+
+def test_registry_latest_and_explicit_version_share_entry(tmp_path, monkeypatch):
+    """Wersja None i jawna nazwa najnowszej wersji to ten sam wczytany model."""
+    _save_artifact(tmp_path, "AAPL", "1d", "v1")
+    loads = []
+    load = ModelRegistry._load
+    monkeypatch.setattr(ModelRegistry, "_load", staticmethod(lambda *args: loads.append(args[2]) or load(*args)))
+    registry = ModelRegistry(str(tmp_path))
+
+    assert registry.get("AAPL", "1d") is registry.get("AAPL", "1d", version="v1")
+    assert loads == ["v1"]
+
+
+def test_registry_keeps_serving_model_when_reload_fails(tmp_path, monkeypatch, caplog):
+    """Uszkodzony nowy artefakt nie przerywa predykcji: zostaje stary model, a kolejna próba czeka reload_check_s."""
+    _save_artifact(tmp_path, "AAPL", "1d", "v1")
+    registry = ModelRegistry(str(tmp_path), reload_check_s=0.2)
+    old = registry.get("AAPL", "1d")
+
+    loads = []
+    load = ModelRegistry._load
+    monkeypatch.setattr(ModelRegistry, "_load", staticmethod(lambda *args: loads.append(args[2]) or load(*args)))
+
+    broken_dir = tmp_path / "AAPL" / "1d" / "v2"
+    broken_dir.mkdir()
+    (broken_dir / "model.joblib").write_bytes(b"niedopisany plik")
+    time.sleep(0.25)
+
+    assert registry.get("AAPL", "1d") is old
+    assert registry.get("AAPL", "1d") is old
+    assert loads == ["v2"]
+    assert "v1" in caplog.text
+
+    _save_artifact(tmp_path, "AAPL", "1d", "v2", n_estimators=4, seed=1)
+    time.sleep(0.25)
+
+    assert registry.get("AAPL", "1d").version == "v2"
+
+
+def test_registry_keeps_pinned_version_when_latest_changes(tmp_path):
+    """Nowa najnowsza wersja nie zwalnia wersji pobieranej jawnie."""
+    _save_artifact(tmp_path, "AAPL", "1d", "v1")
+    registry = ModelRegistry(str(tmp_path), reload_check_s=0)
+    pinned = registry.get("AAPL", "1d", version="v1")
+    assert registry.get("AAPL", "1d") is pinned
+
+    _save_artifact(tmp_path, "AAPL", "1d", "v2", n_estimators=4, seed=1)
+
+    assert registry.get("AAPL", "1d").version == "v2"
+    assert registry.get("AAPL", "1d", version="v1") is pinned
+
+
+def test_registry_concurrent_first_get_loads_once(tmp_path, monkeypatch):
+    """Równoległe pierwsze pobrania czekają na jedno wczytanie, a blokady znikają po zakończeniu."""
+    _save_artifact(tmp_path, "AAPL", "1d", "v1")
+    loads = []
+    load = ModelRegistry._load
+
+    def slow_load(*args):
+        loads.append(args[2])
+        time.sleep(0.1)
+        return load(*args)
+
+    monkeypatch.setattr(ModelRegistry, "_load", staticmethod(slow_load))
+    registry = ModelRegistry(str(tmp_path))
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        entries = list(executor.map(lambda _: registry.get("AAPL", "1d"), range(6)))
+
+    assert loads == ["v1"]
+    assert all(entry is entries[0] for entry in entries)
+    assert registry._load_locks == {}
@@ -0,0 +1,126 @@
+import asyncio
+import pytest
+from backend.api.services.prediction_cache import PredictionCache, PredictionKey
+
+
+def _key(ticker: str = "AAPL", last_bar: int = 0) -> PredictionKey:
+    return PredictionKey(ticker, "1h", "v1", last_bar)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_hits_until_ttl_expires():
+    """Ten sam klucz jest liczony raz, a po upływie TTL - ponownie."""
+    clock = _Clock()
+    cache = PredictionCache(ttl_s=10, clock=clock)
+    calls = []
+
+    async def compute():
+        calls.append(clock.now)
+        return {"prediction": len(calls)}
+
+    async def scenario():
+        first = await cache.get_or_compute(_key(), compute)
+        clock.now = 9.9
+        second = await cache.get_or_compute(_key(), compute)
+        clock.now = 10.0
+        third = await cache.get_or_compute(_key(), compute)
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+
+    assert first is second
+    assert third == {"prediction": 2}
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.expirations) == (1, 2, 1)
+
+
+def test_cache_evicts_least_recently_used():
+    """Po przekroczeniu max_entries wypada najdawniej używany wpis."""
+    cache = PredictionCache(max_entries=2)
+
+    async def value(v):
+        return v
+
+    async def scenario():
+        await cache.get_or_compute(_key("A"), lambda: value("A"))
+        await cache.get_or_compute(_key("B"), lambda: value("B"))
+        await cache.get_or_compute(_key("A"), lambda: value("A2"))
+        await cache.get_or_compute(_key("C"), lambda: value("C"))
+        return await cache.get_or_compute(_key("A"), lambda: value("A3")), await cache.get_or_compute(_key("B"), lambda: value("B2"))
+
+    assert asyncio.run(scenario()) == ("A", "B2")
+    assert len(cache) == 2
+    assert cache.stats.evictions == 2
+
+
+def test_cache_single_flight_for_concurrent_misses():
+    """Równoległe chybienia tego samego klucza czekają na jedno wyliczenie."""
+    cache = PredictionCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "signal"
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_compute(_key(), compute) for _ in range(20)))
+
+    assert asyncio.run(scenario()) == ["signal"] * 20
+    assert len(calls) == 1
+    assert (cache.stats.misses, cache.stats.coalesced) == (1, 19)
+
+
+def test_cache_does_not_store_errors_and_survives_cancellation():
+    """Błąd trafia do wszystkich czekających, ale nie jest zapamiętany; anulowanie jednego nie przerywa wyliczenia."""
+    cache = PredictionCache()
+    attempts = []
+
+    async def failing():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("brak cech")
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def scenario():
+        results = await asyncio.gather(*(cache.get_or_compute(_key(), failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+        with pytest.raises(ValueError):
+            await cache.get_or_compute(_key(), failing)
+
+        first = asyncio.ensure_future(cache.get_or_compute(_key("B"), slow))
+        second = asyncio.ensure_future(cache.get_or_compute(_key("B"), slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == "ok"
+    assert len(attempts) == 2
+    assert len(cache) == 1
+
+
+def test_cache_prometheus_counters():
+    cache = PredictionCache()
+
+    async def compute():
+        return 1
+
+    async def scenario():
+        for _ in range(3):
+            await cache.get_or_compute(_key(), compute)
+
+    asyncio.run(scenario())
+    text = cache.render_prometheus()
+
+    assert 'musa_prediction_cache_requests_total{result="hits"} 2' in text
+    assert 'musa_prediction_cache_requests_total{result="misses"} 1' in text
+    assert "musa_prediction_cache_entries 1" in text
@@ -0,0 +1,214 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from backend.api.app import create_app
+from backend.api.services.micro_batcher import MicroBatcher
+from backend.api.services.prediction_cache import PredictionCache
+from backend.api.services.prediction_service import PredictionService
+from backend.ml.architectures.random_forest_tree_class import MusaRandomForestTreeClassifier
+from backend.ml.data.feature_scaler import FeatureScaler
+from backend.benchmarks.synthetic import generate_ohlcv
+from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
+
+FEATURES = ["log_returns", "rsi", "macd", "atr"]
+
+
+@pytest.fixture
+def trained_service(tmp_path) -> PredictionService:
+    """Trenuje mały model i skaler, zapisuje je i wczytuje przez PredictionService.from_paths."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((60, len(FEATURES))), columns=FEATURES)
+    y = pd.Series([1, 0, -1] * 20)
+
+    scaler = FeatureScaler()
+    X_scaled = scaler.fit_transform(X, FEATURES)
+    bot = MusaRandomForestTreeClassifier(n_estimators=5)
+    bot.train(X_scaled, y)
+
+    model_path = str(tmp_path / "model.joblib")
+    scaler_path = str(tmp_path / "scaler.joblib")
+    bot.save(model_path)
+    scaler.save_scaler(scaler_path)
+
+    return PredictionService.from_paths(model_path, scaler_path, max_wait_ms=20)
+
+
+def test_predict_endpoint_matches_model(trained_service):
+    """Odpowiedź /predict zgadza się z bezpośrednim wywołaniem predict_proba."""
+    row = {"log_returns": 0.1, "rsi": 0.5, "macd": 0.2, "atr": 0.7}
+
+    with TestClient(create_app(trained_service)) as client:
+        response = client.post("/predict", json={"features": row})
+
+    assert response.status_code == 200
+    body = response.json()
+
+    X = trained_service.scaler.transform(pd.DataFrame([row]))
+    expected = trained_service.model.predict_proba(X)[0]
+    assert [body["probabilities"][str(c)] for c in trained_service.classes] == pytest.approx(expected)
+    assert body["prediction"] == trained_service.classes[int(np.argmax(expected))]
+
+
+def test_predict_endpoint_missing_feature(trained_service):
+    """Brak wymaganej cechy kończy się błędem 422 zamiast błędu serwera."""
+    with TestClient(create_app(trained_service)) as client:
+        response = client.post("/predict", json={"features": {"rsi": 0.5}})
+
+    assert response.status_code == 422
+
+
+def test_invalid_request_does_not_fail_concurrent_batch(trained_service):
+    """Zapytanie bez cechy dostaje własny błąd z właściwą listą braków, a pozostałe w tej samej paczce przechodzą."""
+    good = {"log_returns": 0.1, "rsi": 0.5, "macd": 0.2, "atr": 0.7}
+    bad = {"log_returns": 0.1, "rsi": 0.5}
+    batches = []
+    predict_batch = trained_service.predict_batch
+
+    def counting_batch(rows):
+        batches.append(len(rows))
+        return predict_batch(rows)
+
+    trained_service.batcher.batch_fn = counting_batch
+
+    async def scenario() -> list:
+        trained_service.batcher.start()
+        results = await asyncio.gather(
+            trained_service.predict(good),
+            trained_service.predict(bad),
+            trained_service.predict(good),
+            return_exceptions=True,
+        )
+        await trained_service.batcher.stop()
+        return results
+
+    first, error, second = asyncio.run(scenario())
+
+    assert first == second and first["batch_size"] == 2
+    assert isinstance(error, ValueError)
+    assert "['atr', 'macd']" in str(error)
+    assert batches == [2]
+
+
+def test_micro_batcher_groups_concurrent_requests():
+    """Równoległe zapytania są obsługiwane jednym wywołaniem funkcji wsadowej."""
+    batch_sizes = []
+
+    def batch_fn(items: list) -> list:
+        batch_sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    async def scenario() -> list:
+        batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=50)
+        batcher.start()
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert results == [i * 2 for i in range(10)]
+    assert batch_sizes == [8, 2]
+
+
+def test_micro_batcher_stop_fails_pending_requests():
+    """Zapytania z przerwanej paczki i z kolejki dostają wyjątek przy stop(), zamiast czekać w nieskończoność."""
+    release = threading.Event()
+
+    def batch_fn(items: list) -> list:
+        release.wait(timeout=5)
+        return items
+
+    async def scenario() -> list:
+        batcher = MicroBatcher(batch_fn, max_batch_size=1, max_wait_ms=1)
+        batcher.start()
+        tasks = [asyncio.create_task(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0.05)
+        await batcher.stop()
+        release.set()
+        return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=1)
+
+    results = asyncio.run(scenario())
+
+    assert len(results) == 3
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_metrics_endpoint_exposes_prometheus_text(trained_service):
+    """Endpoint /metrics zwraca pomiary etapów w formacie Prometheusa."""
+    with TestClient(create_app(trained_service)) as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE musa_stage_duration_seconds_total counter" in response.text
+
+
+def test_signal_endpoint_serves_repeated_bar_from_cache(trained_service):
+    """Powtórzone zapytania o tę samą świecę nie dotykają modelu; nowa świeca liczy sygnał od nowa."""
+    ohlcv = generate_ohlcv(200, freq="h")
+    bars = {"AAPL": ohlcv.iloc[:-1]}
+    batches = []
+    predict_batch = trained_service.predict_batch
+
+    def counting_batch(rows):
+        batches.append(len(rows))
+        return predict_batch(rows)
+
+    trained_service.batcher.batch_fn = counting_batch
+    trained_service.cache = PredictionCache(ttl_s=60)
+    trained_service.ohlcv_source = lambda ticker, interval: bars[ticker]
+
+    with TestClient(create_app(trained_service)) as client:
+        first = client.get("/signal/AAPL", params={"interval": "1h"}).json()
+        repeated = [client.get("/signal/AAPL", params={"interval": "1h"}).json() for _ in range(3)]
+        bars["AAPL"] = ohlcv
+        next_bar = client.get("/signal/AAPL", params={"interval": "1h"}).json()
+        metrics = client.get("/metrics").text
+
+    assert repeated == [first] * 3
+    assert first["bar_timestamp"] == ohlcv.index[-2].isoformat()
+    assert next_bar["bar_timestamp"] == ohlcv.index[-1].isoformat()
+    assert batches == [1, 1]
+    assert 'musa_prediction_cache_requests_total{result="hits"} 3' in metrics
+
+    X = trained_service.scaler.transform(map_ohlcv_to_features(ohlcv).tail(1)[FEATURES])
+    assert next_bar["probabilities"]["1"] == pytest.approx(trained_service.model.predict_proba(X)[0, 2])
+
+
+def test_signal_endpoint_fetches_ohlcv_once_for_concurrent_requests(trained_service):
+    """Równoległe /signal dla jednego tickera wywołują źródło świec raz i wszystkie dostają ten sam sygnał."""
+    ohlcv = generate_ohlcv(200, freq="h")
+    calls = []
+    lock = threading.Lock()
+
+    def slow_source(ticker, interval):
+        with lock:
+            calls.append((ticker, interval))
+        time.sleep(0.3)
+        return ohlcv
+
+    trained_service.cache = PredictionCache(ttl_s=60)
+    trained_service.ohlcv_source = slow_source
+
+    with TestClient(create_app(trained_service)) as client:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(pool.map(lambda _: client.get("/signal/AAPL", params={"interval": "1h"}), range(8)))
+
+    assert [r.status_code for r in responses] == [200] * 8
+    assert len({r.json()["bar_timestamp"] for r in responses}) == 1
+    assert calls == [("AAPL", "1h")]
+
+
+def test_signal_endpoint_without_source_or_history(trained_service):
+    """Bez źródła świec /signal zwraca 503, a przy zbyt krótkiej historii - 422."""
+    with TestClient(create_app(trained_service)) as client:
+        assert client.get("/signal/AAPL").status_code == 503
+
+    trained_service.ohlcv_source = lambda ticker, interval: generate_ohlcv(10, freq="h")
+    with TestClient(create_app(trained_service)) as client:
+        assert client.get("/signal/AAPL").status_code == 422
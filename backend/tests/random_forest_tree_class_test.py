@@ -64,3 +64,149 @@ def test_save_and_load_persistence(dummy_data):
     finally:
         if os.path.exists(file_name):
             os.remove(file_name)
+
+
+@pytest.mark.parametrize("n_rows", [1, 7, 64, 500])
+def test_compiled_forest_matches_sklearn(n_rows):
+    """Sprawdza, czy skompilowany las zwraca te same prawdopodobieństwa i klasy co sklearn."""
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(rng.normal(size=(300, 4)), columns=["f1", "f2", "f3", "f4"])
+    y = pd.Series(np.where(X["f1"] > 0.5, 1, np.where(X["f2"] < -0.5, -1, 0)))
+
+    bot = MusaRandomForestTreeClassifier(n_estimators=20)
+    bot.train(X, y)
+    X_test = pd.DataFrame(rng.normal(size=(n_rows, 4)), columns=["f1", "f2", "f3", "f4"])
+
+    expected_proba = bot.predict_proba(X_test)
+    expected_classes = bot.predict(X_test)
+    bot.compile()
+
+    np.testing.assert_allclose(bot.predict_proba(X_test), expected_proba, rtol=1e-12, atol=1e-15)
+    np.testing.assert_array_equal(bot.predict(X_test), expected_classes)
+    np.testing.assert_allclose(bot.compiled.predict_proba(X_test.to_numpy()), expected_proba, rtol=1e-12, atol=1e-15)
+
+
+def test_compile_requires_training():
+    """Kompilacja niewytrenowanego modelu jest blokowana."""
+    bot = MusaRandomForestTreeClassifier()
+
+    with pytest.raises(NotFittedError):
+        bot.compile()
+
+
+@pytest.mark.filterwarnings("ignore:overflow encountered in cast:RuntimeWarning")
+def test_compiled_forest_validates_input_like_sklearn():
+    """Nieskończoności dają ten sam błąd co sklearn, a NaN jest obsługiwany tylko tak jak w sklearn."""
+    X, y = _regime_data(3)
+    bot = MusaRandomForestTreeClassifier(n_estimators=10)
+    bot.train(X, y)
+    compiled = bot.compile()
+
+    X_bad = X.iloc[:3].copy()
+    for value in (np.inf, -np.inf, 1e300):
+        X_bad.iloc[1, 2] = value
+        with pytest.raises(ValueError) as expected:
+            bot.model.predict_proba(X_bad)
+        with pytest.raises(ValueError, match="infinity") as actual:
+            compiled.predict_proba(X_bad)
+        assert str(actual.value) == str(expected.value)
+
+    X_bad.iloc[1, 2] = np.nan
+    np.testing.assert_allclose(compiled.predict_proba(X_bad), bot.model.predict_proba(X_bad), rtol=1e-12, atol=1e-15)
+
+    compiled.allow_nan = False
+    with pytest.raises(ValueError, match="Input X contains NaN"):
+        compiled.predict(X_bad)
+
+
+def _regime_data(seed: int, n_rows: int = 300):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n_rows, 4)), columns=["f1", "f2", "f3", "f4"])
+    y = pd.Series(np.where(X["f1"] > 0.5, 1, np.where(X["f2"] < -0.5, -1, 0)))
+    return X, y
+
+
+def test_update_grows_new_trees_and_retires_oldest():
+    """Aktualizacja dorasta nowe drzewa, a las nie przekracza max_trees - wypadają najstarsze."""
+    X, y = _regime_data(1)
+    bot = MusaRandomForestTreeClassifier(n_estimators=20)
+    bot.train(X, y)
+    original = list(bot.model.estimators_)
+
+    X_new, y_new = _regime_data(2, n_rows=100)
+    bot.update(X_new, y_new, n_new_trees=5)
+    bot.update(X_new, y_new, n_new_trees=5)
+
+    assert len(bot.model.estimators_) == 20
+    assert bot.model.n_estimators == 20
+    assert bot.model.estimators_[:10] == original[10:]
+    np.testing.assert_array_equal(bot.tree_generations, [0] * 10 + [1] * 5 + [2] * 5)
+    assert bot.generation == 2
+    assert bot.predict_proba(X_new).shape == (100, 3)
+
+    bot.update(X_new, y_new, n_new_trees=5, max_trees=30)
+    assert len(bot.model.estimators_) == 25
+
+
+def test_update_tracks_new_regime():
+    """Po kilku aktualizacjach na odwróconym reżimie las przewiduje nowy reżim."""
+    X, y = _regime_data(1, n_rows=500)
+    bot = MusaRandomForestTreeClassifier(n_estimators=20)
+    bot.train(X, y)
+
+    X_new, y_new = _regime_data(2, n_rows=500)
+    y_new = -y_new
+    for _ in range(4):
+        bot.update(X_new, y_new, n_new_trees=5)
+
+    assert set(bot.tree_generations) == {1, 2, 3, 4}
+    assert np.mean(bot.predict(X_new) == y_new) > 0.9
+
+
+def test_update_validates_state(dummy_data):
+    """Aktualizacja wymaga wytrenowanego modelu i tych samych klas w oknie."""
+    X, y = dummy_data
+    bot = MusaRandomForestTreeClassifier(n_estimators=5)
+
+    with pytest.raises(NotFittedError):
+        bot.update(X, y)
+
+    bot.train(X, y)
+    with pytest.raises(ValueError):
+        bot.update(X, y.replace(-1, 0))
+
+
+def test_update_state_survives_save_and_load(tmp_path):
+    """Po save/load aktualizacje kontynuują generacje i limit drzew, a compile() widzi nowe drzewa."""
+    X, y = _regime_data(1)
+    bot = MusaRandomForestTreeClassifier(n_estimators=10)
+    bot.train(X, y)
+    bot.update(X, y, n_new_trees=4, max_trees=12)
+
+    path = tmp_path / "model.joblib"
+    bot.save(str(path))
+    loaded = MusaRandomForestTreeClassifier.load(str(path))
+
+    np.testing.assert_array_equal(loaded.tree_generations, bot.tree_generations)
+    loaded.update(X, y, n_new_trees=4)
+
+    assert len(loaded.model.estimators_) == 12
+    np.testing.assert_array_equal(loaded.tree_generations, [0] * 4 + [1] * 4 + [2] * 4)
+    loaded.compile()
+    np.testing.assert_allclose(loaded.predict_proba(X.head(8)), loaded.model.predict_proba(X.head(8)), rtol=1e-12)
+
+
+def test_train_after_update_is_reproducible():
+    """Pełny trening po aktualizacjach używa bazowego seeda - wynik jak świeżego modelu."""
+    X, y = _regime_data(1)
+    fresh = MusaRandomForestTreeClassifier(n_estimators=10)
+    fresh.train(X, y)
+
+    bot = MusaRandomForestTreeClassifier(n_estimators=10)
+    bot.train(X, y)
+    bot.update(X, y, n_new_trees=3)
+    assert bot.model.random_state == 50
+    bot.train(X, y)
+
+    assert bot.model.base_random_state_ == 50
+    np.testing.assert_array_equal(bot.model.predict_proba(X), fresh.model.predict_proba(X))
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from pandas import DataFrame
+from backend.ml.data.fetchers.resample import fetch_history_multi, interval_length, resample_ohlcv
+
+
+def _nyse_15m(days: str = "2024-03-06", periods: int = 6) -> DataFrame:
+    """Świece 15m w godzinach sesji NYSE (09:30-16:00, strefa giełdy), także przez zmianę czasu 10.03."""
+    sessions = pd.bdate_range(days, periods=periods)
+    index = pd.DatetimeIndex(
+        [
+            pd.Timestamp(day) + pd.Timedelta(hours=9, minutes=30) + pd.Timedelta(minutes=15 * k)
+            for day in sessions
+            for k in range(26)
+        ]
+    ).tz_localize("America/New_York")
+
+    rng = np.random.default_rng(3)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, len(index))))
+    return DataFrame(
+        {
+            "Open": close * (1 + rng.normal(0, 0.001, len(index))),
+            "High": close * 1.003,
+            "Low": close * 0.997,
+            "Close": close,
+            "Volume": rng.integers(1_000, 5_000, len(index)),
+        },
+        index=index,
+    )
+
+
+def test_interval_length():
+    assert interval_length("15m") == pd.Timedelta(minutes=15)
+    assert interval_length("1h") == pd.Timedelta(hours=1)
+    assert interval_length("1wk") == pd.Timedelta(days=7)
+
+    with pytest.raises(ValueError):
+        interval_length("5d")
+
+
+def test_hourly_bars_anchored_at_session_open_across_dst():
+    df = _nyse_15m()
+    hourly = resample_ohlcv(df, "1h")
+
+    local_times = sorted(set(hourly.index.strftime("%H:%M")))
+    assert local_times == ["09:30", "10:30", "11:30", "12:30", "13:30", "14:30", "15:30"]
+    assert len(hourly) == 6 * 7
+
+    # Referencja: groupby po (dzień, godzina od otwarcia).
+    keys = [df.index.date, (df.index.hour * 60 + df.index.minute - 570) // 60]
+    expected = df.groupby(keys).agg(
+        {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    )
+    np.testing.assert_array_equal(hourly.to_numpy(), expected.to_numpy())
+
+    with_open = resample_ohlcv(df, "1h", session_open="09:30")
+    pd.testing.assert_frame_equal(with_open, hourly)
+
+
+def test_session_open_in_repeated_dst_hour_keeps_all_bars():
+    """Otwarcie sesji w godzinie powtórzonej przy cofnięciu zegara (03.11) nie gubi świec - sesja startuje w czasie letnim."""
+    index = pd.date_range("2024-11-03 05:30", periods=12, freq="15min", tz="UTC").tz_convert("America/New_York")
+    values = np.arange(12, dtype=np.float64)
+    df = DataFrame({"Open": values, "High": values + 1, "Low": values - 1, "Close": values, "Volume": np.ones(12)}, index=index)
+
+    hourly = resample_ohlcv(df, "1h", session_open="01:30")
+
+    assert list(hourly.index.tz_convert("UTC").strftime("%H:%M")) == ["05:30", "06:30", "07:30"]
+    assert hourly["Volume"].sum() == 12
+    np.testing.assert_array_equal(hourly["Open"].to_numpy(), [0.0, 4.0, 8.0])
+
+
+def test_daily_and_weekly_bars_match_yfinance_labels():
+    df = _nyse_15m()
+    daily = resample_ohlcv(df, "1d")
+
+    assert daily.index.tz is None
+    assert list(daily.index) == list(pd.bdate_range("2024-03-06", periods=6))
+    assert daily["Volume"].sum() == df["Volume"].sum()
+    assert daily["Close"].iloc[0] == df["Close"].iloc[25]
+
+    weekly = resample_ohlcv(df, "1wk")
+    assert list(weekly.index) == [pd.Timestamp("2024-03-04"), pd.Timestamp("2024-03-11")]
+    assert weekly["High"].iloc[0] == df.loc[: "2024-03-08 16:00"]["High"].max()
+
+
+def test_fetch_history_multi_downloads_finest_interval_once():
+    df = _nyse_15m()
+
+    with patch("backend.ml.data.fetchers.resample.fetch_history", return_value=df) as mock_fetch:
+        bars = fetch_history_multi("AAPL", ["1d", "15m", "1h"])
+
+    mock_fetch.assert_called_once()
+    assert mock_fetch.call_args.kwargs["interval"] == "15m"
+    assert bars["15m"] is df
+    assert len(bars["1h"]) == 42 and len(bars["1d"]) == 6
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from backend.ml.data.sequence_windows import SequenceWindows
+
+
+def _data(n: int = 200, n_features: int = 3):
+    X = np.arange(n * n_features, dtype=np.float32).reshape(n, n_features)
+    y = np.tile([1.0, 0.0, -1.0], n)[:n]
+    y[-5:] = np.nan
+    return X, y
+
+
+def test_windows_are_views_without_copy():
+    X, y = _data()
+    seq = SequenceWindows(X, y, lookback=10)
+
+    assert seq.windows.shape == (191, 10, 3)
+    assert np.shares_memory(seq.windows, seq.X)
+    # Okna kończą się na wierszach z etykietą - ostatnie 5 wierszy bez targetu odpada.
+    assert len(seq) == 200 - 9 - 5
+    assert seq.ends[0] == 9 and seq.ends[-1] == 194
+
+
+def test_batch_matches_manual_slices():
+    X, y = _data()
+    seq = SequenceWindows(X, y, lookback=10)
+
+    ids = np.array([0, 7, 100])
+    batch_X, batch_y = seq.batch(ids)
+
+    for k, i in enumerate(ids):
+        end = seq.ends[i]
+        np.testing.assert_array_equal(batch_X[k], X[end - 9 : end + 1])
+        assert batch_y[k] == y[end]
+    assert batch_y.dtype == np.int8
+
+
+def test_splits_are_walk_forward_with_purge():
+    X, y = _data()
+    seq = SequenceWindows(X, y, lookback=10)
+
+    splits = list(seq.splits(n_splits=3, purge=5))
+
+    assert len(splits) == 3
+    for train, test in splits:
+        assert train[-1] + 5 < test[0]
+        assert seq.ends[train[-1]] + 5 < seq.ends[test[0]]
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_iter_batches_covers_all_ids(prefetch):
+    X, y = _data()
+    seq = SequenceWindows(X, y, lookback=10)
+    ids = np.arange(len(seq))
+
+    batches = list(seq.iter_batches(ids, batch_size=32, shuffle=True, seed=1, prefetch=prefetch))
+
+    assert sum(len(b[1]) for b in batches) == len(ids)
+    assert all(b[0].shape[1:] == (10, 3) for b in batches)
+
+
+def test_iter_batches_can_stop_early():
+    X, y = _data()
+    seq = SequenceWindows(X, y, lookback=10)
+
+    iterator = seq.iter_batches(np.arange(len(seq)), batch_size=4, prefetch=1)
+    next(iterator)
+    iterator.close()
+
+
+def test_tf_dataset_matches_numpy_batches():
+    tf = pytest.importorskip("tensorflow")
+    X, y = _data()
+    seq = SequenceWindows(X, y, lookback=10)
+    ids = np.arange(50)
+
+    batches = list(seq.to_tf_dataset(ids, batch_size=16).as_numpy_iterator())
+    expected_X, expected_y = seq.batch(ids)
+
+    np.testing.assert_array_equal(np.concatenate([b[0] for b in batches]), expected_X)
+    np.testing.assert_array_equal(np.concatenate([b[1] for b in batches]), expected_y)
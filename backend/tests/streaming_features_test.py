@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from backend.ml.data.mappers.map_ohlcv_to_features import map_ohlcv_to_features
+from backend.ml.data.mappers.streaming_features import (
+    FEATURE_COLUMNS,
+    StreamingFeatureEngine,
+)
+
+
+def _random_walk_ohlcv(periods: int = 400) -> DataFrame:
+    rng = np.random.default_rng(3)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    return DataFrame(
+        {
+            "Open": close,
+            "High": close * (1 + rng.uniform(0, 0.01, periods)),
+            "Low": close * (1 - rng.uniform(0, 0.01, periods)),
+            "Close": close,
+            "Volume": rng.integers(1000, 5000, periods),
+        },
+        index=pd.date_range("2024-01-01", periods=periods, freq="h"),
+    )
+
+
+def test_streaming_matches_batch_after_warmup():
+    """
+    Odtwarza całą historię świeca po świecy i porównuje z wersją wsadową (ta).
+    """
+    df = _random_walk_ohlcv()
+    expected = map_ohlcv_to_features(df)
+
+    engine = StreamingFeatureEngine()
+    rows = [row for _, bar in df.iterrows() if (row := engine.update(bar)) is not None]
+    result = DataFrame(rows)
+
+    assert list(result.columns) == FEATURE_COLUMNS
+    pd.testing.assert_index_equal(result.index, expected.index, check_names=False)
+    pd.testing.assert_frame_equal(result, expected[FEATURE_COLUMNS], check_freq=False, check_names=False, rtol=1e-10)
+
+
+def test_streaming_warmup_returns_none():
+    """Podczas rozgrzewki wskaźników silnik nie zwraca wierszy."""
+    df = _random_walk_ohlcv(periods=20)
+    engine = StreamingFeatureEngine()
+
+    assert all(engine.update(bar) is None for _, bar in df.iterrows())
+    assert engine.n_bars == 20
+
+
+def test_streaming_flat_prices_rsi_100():
+    """Brak spadków (emadn == 0) daje RSI równe 100, tak jak w ta."""
+    periods = 60
+    prices = [100.0 + i for i in range(periods)]
+    df = DataFrame(
+        {"Open": prices, "High": prices, "Low": prices, "Close": prices, "Volume": [1000] * periods},
+        index=pd.date_range("2024-01-01", periods=periods, freq="D"),
+    )
+    engine = StreamingFeatureEngine()
+
+    last = [engine.update(bar) for _, bar in df.iterrows()][-1]
+
+    assert last["rsi"] == 100.0
+    assert last["rsi"] == map_ohlcv_to_features(df)["rsi"].iloc[-1]
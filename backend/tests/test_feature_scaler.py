@@ -94,3 +94,55 @@ def test_save_load_model_weights(market_data, tmp_path):
     result_loaded = new_scaler.transform(market_data)
     
     pd.testing.assert_frame_equal(result_original, result_loaded)
+
+def test_inplace_transform_matches_copy(market_data):
+    """Tryb inplace daje te same wartości co domyślny, ale nie tworzy kopii całej ramki."""
+    features = ['Volume', 'RSI']
+    expected = FeatureScaler().fit_transform(market_data, features)
+
+    frame = market_data.copy()
+    result = FeatureScaler().fit_transform(frame, features, inplace=True)
+
+    assert result is frame
+    pd.testing.assert_frame_equal(result, expected)
+
+def test_fit_chunks_matches_full_fit(market_data):
+    """Dopasowanie porcjami (DataFrame i ndarray) daje te same parametry co fit na całości."""
+    features = ['Close', 'Volume', 'RSI']
+    full = FeatureScaler()
+    expected = full.fit_transform(market_data, features)
+
+    chunked = FeatureScaler()
+    chunked.fit_chunks([market_data.iloc[:3], market_data[features].iloc[3:7].to_numpy(), market_data.iloc[7:]], features)
+
+    np.testing.assert_allclose(chunked.scaler.mean_, full.scaler.mean_)
+    np.testing.assert_allclose(chunked.scaler.scale_, full.scaler.scale_)
+    pd.testing.assert_frame_equal(chunked.transform(market_data), expected)
+
+def test_fit_chunks_refit_with_no_data_raises(market_data):
+    """Ponowne dopasowanie pustym strumieniem nie zostawia skalera oznaczonego jako wytrenowany."""
+    features = ['Close', 'Volume', 'RSI']
+    scaler = FeatureScaler()
+    scaler.fit_chunks([market_data], features)
+
+    with pytest.raises(ValueError, match="Brak danych"):
+        scaler.fit_chunks(iter([]), features)
+
+    assert scaler.is_fitted is False
+    with pytest.raises(ValueError, match="nie został wytrenowany"):
+        scaler.transform(market_data)
+
+def test_transform_array_matches_transform(market_data):
+    """Ścieżka NumPy daje te same wartości co transform na DataFrame, także dla jednego wiersza i float32."""
+    features = ['Close', 'Volume', 'RSI']
+    scaler = FeatureScaler()
+    expected = scaler.fit_transform(market_data, features)[features].to_numpy()
+    X = market_data[features].to_numpy(dtype=np.float64)
+
+    np.testing.assert_allclose(scaler.transform_array(X), expected, rtol=1e-12)
+    np.testing.assert_allclose(scaler.transform_array(X[-1:]), expected[-1:], rtol=1e-12)
+
+    X32 = X.astype(np.float32)
+    result32 = scaler.transform_array(X32, out=X32)
+    assert result32 is X32 and result32.dtype == np.float32
+    np.testing.assert_allclose(result32, expected, rtol=1e-5, atol=1e-6)
@@ -1,7 +1,12 @@
+import json
+import os
 import pytest
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from unittest.mock import patch, MagicMock
-from backend.ml.data.fetchers.yahoo_fetcher import fetch_history
+from backend.ml.data.fetchers.yahoo_fetcher import fetch_history, fetch_history_many
+from backend.ml.data.fetchers.ohlcv_cache import OhlcvCache
 
 
 @pytest.fixture
@@ -42,3 +47,165 @@ def test_fetch_history_empty_raises_error():
         
         with pytest.raises(ValueError, match="CRITICAL"):
             fetch_history("BLEDNY_TICKER")
+
+
+def _bars(dates, start_price=100.0):
+    prices = [start_price + i for i in range(len(dates))]
+    df = pd.DataFrame(
+        {
+            'Open': prices,
+            'High': [p + 1 for p in prices],
+            'Low': [p - 1 for p in prices],
+            'Close': prices,
+            'Volume': [1000] * len(dates),
+        }
+    )
+    df.index = pd.DatetimeIndex(pd.to_datetime(dates), name='Date')
+    return df
+
+
+def test_fetch_history_cache_tops_up_only_new_bars(tmp_path):
+    """
+    Drugie wywołanie z cache ma pobrać tylko świece od ostatniego zapisanego znacznika czasu.
+    """
+    cache = OhlcvCache(str(tmp_path))
+    history = _bars(['2023-01-02', '2023-01-03', '2023-01-04'])
+    # Ostatnia świeca z pierwszego pobrania zostaje poprawiona przy dociąganiu.
+    top_up = _bars(['2023-01-04', '2023-01-05'], start_price=200.0)
+
+    with patch('backend.ml.data.fetchers.yahoo_fetcher.yf.download') as mock_download:
+        mock_download.side_effect = [history, top_up]
+
+        first = fetch_history("AAPL", cache=cache)
+        second = fetch_history("AAPL", cache=cache)
+
+        assert mock_download.call_count == 2
+        assert mock_download.call_args.kwargs['start'] == pd.Timestamp('2023-01-04')
+
+    pd.testing.assert_frame_equal(first, history, check_freq=False)
+    assert list(second.index) == list(pd.to_datetime(['2023-01-02', '2023-01-03', '2023-01-04', '2023-01-05']))
+    assert second.loc['2023-01-04', 'Close'] == 200.0
+    pd.testing.assert_frame_equal(cache.read("AAPL", '1d'), second, check_freq=False)
+
+
+def test_fetch_history_cache_fresh_skips_network(tmp_path):
+    """
+    Świeży cache (młodszy niż max_age) jest zwracany bez wywołania yf.download.
+    """
+    cache = OhlcvCache(str(tmp_path), max_age=timedelta(hours=1))
+    history = _bars(['2023-01-02', '2023-01-03'])
+
+    with patch('backend.ml.data.fetchers.yahoo_fetcher.yf.download') as mock_download:
+        mock_download.return_value = history
+
+        fetch_history("BTC-USD", interval='1h', cache=cache)
+        result = fetch_history("BTC-USD", interval='1h', cache=cache)
+
+        mock_download.assert_called_once()
+
+    pd.testing.assert_frame_equal(result, history, check_freq=False)
+
+
+def test_fetch_history_stale_cache_without_new_bars_keeps_data(tmp_path):
+    """
+    Nieświeży cache, dla którego dociąganie nie zwraca nowych świec, zostaje nietknięty.
+    """
+    cache = OhlcvCache(str(tmp_path))
+    history = _bars(['2023-01-02', '2023-01-03', '2023-01-04'])
+
+    with patch('backend.ml.data.fetchers.yahoo_fetcher.yf.download') as mock_download:
+        mock_download.side_effect = [history, pd.DataFrame(), pd.DataFrame(), pd.DataFrame()]
+
+        fetch_history("AAPL", cache=cache)
+        results = [fetch_history("AAPL", cache=cache) for _ in range(3)]
+
+        assert mock_download.call_count == 4
+
+    for result in results:
+        pd.testing.assert_frame_equal(result, history, check_freq=False)
+    pd.testing.assert_frame_equal(cache.read("AAPL", '1d'), history, check_freq=False)
+
+
+def test_fetch_history_empty_top_up_renews_fetched_at(tmp_path):
+    """
+    Puste dociąganie odnawia czas pobrania - kolejne wywołanie w oknie max_age nie idzie do sieci.
+    """
+    cache = OhlcvCache(str(tmp_path), max_age=timedelta(hours=1))
+    history = _bars(['2023-01-02', '2023-01-03'])
+    cache.write("AAPL", '1d', history, coverage="period=max")
+
+    meta_path = tmp_path / "AAPL__1d" / OhlcvCache.META_FILE
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["fetched_at"] = 0.0
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+    with patch('backend.ml.data.fetchers.yahoo_fetcher.yf.download') as mock_download:
+        mock_download.return_value = pd.DataFrame()
+
+        fetch_history("AAPL", cache=cache)
+        result = fetch_history("AAPL", cache=cache)
+
+        mock_download.assert_called_once()
+
+    pd.testing.assert_frame_equal(result, history, check_freq=False)
+
+
+def test_fetch_history_top_up_propagates_data_errors(tmp_path):
+    """
+    Tylko brak nowych świec (EmptyDataError) jest traktowany jak pusty wynik - inne błędy nie są ukrywane.
+    """
+    cache = OhlcvCache(str(tmp_path))
+    cache.write("AAPL", '1d', _bars(['2023-01-02', '2023-01-03']), coverage="period=max")
+
+    broken = _bars(['2023-01-04']).drop(columns='Close')
+    with patch('backend.ml.data.fetchers.yahoo_fetcher.yf.download', return_value=broken):
+        with pytest.raises(KeyError):
+            fetch_history("AAPL", cache=cache)
+
+
+def test_ohlcv_cache_concurrent_writers_of_one_key(tmp_path):
+    """
+    Równoległe zapisy tego samego klucza nie wchodzą sobie w drogę plikami tymczasowymi.
+    """
+    cache = OhlcvCache(str(tmp_path))
+    history = _bars(['2023-01-02', '2023-01-03', '2023-01-04'])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(cache.write, "AAPL", '1d', history, "period=max") for _ in range(32)]
+        for future in futures:
+            future.result()
+
+    pd.testing.assert_frame_equal(cache.read("AAPL", '1d'), history, check_freq=False)
+    assert not [name for name in os.listdir(tmp_path / "AAPL__1d") if name.endswith(".tmp")]
+
+
+def test_ohlcv_cache_preserves_timezone(tmp_path):
+    """Cache odtwarza strefę czasową indeksu świec intraday."""
+    cache = OhlcvCache(str(tmp_path))
+    df = _bars(['2023-01-02 09:30', '2023-01-02 10:30'])
+    df.index = df.index.tz_localize('America/New_York').rename('Datetime')
+
+    cache.write("^GSPC", '1h', df, coverage="period=max")
+
+    pd.testing.assert_frame_equal(cache.read("^GSPC", '1h'), df)
+
+
+def test_fetch_history_many_isolates_per_ticker_errors(mock_valid_data):
+    """
+    Błąd jednego tickera nie przerywa paczki - trafia do jego FetchResult.
+    """
+    def fake_download(tickers, **kwargs):
+        return pd.DataFrame() if tickers == "BLEDNY_TICKER" else mock_valid_data.copy()
+
+    with patch('backend.ml.data.fetchers.yahoo_fetcher.yf.download', side_effect=fake_download):
+        results = {
+            r.ticker: r
+            for r in fetch_history_many(["AAPL", "BLEDNY_TICKER", "MSFT", "AAPL"], max_workers=2)
+        }
+
+    assert set(results) == {"AAPL", "BLEDNY_TICKER", "MSFT"}
+    assert results["AAPL"].ok and len(results["AAPL"].data) == 2
+    assert results["MSFT"].ok
+    assert not results["BLEDNY_TICKER"].ok
+    assert isinstance(results["BLEDNY_TICKER"].error, ValueError)
+    assert results["BLEDNY_TICKER"].data is None
@@ -0,0 +1,61 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from backend.ml.data.dataset import build_dataset
+from backend.ml.data.universe import build_universe_dataset, load_panel
+
+
+def fake_fetch(ticker, interval="1d", start_date=None, period="max", cache=None) -> DataFrame:
+    """Deterministyczne świece per ticker; 'BROKEN' symuluje błąd pobrania."""
+    if ticker == "BROKEN":
+        raise ValueError("CRITICAL: Nie udało się pobrać danych.")
+
+    periods = {"AAA": 300, "BBB": 250, "CCC": 200}[ticker]
+    rng = np.random.default_rng(sum(map(ord, ticker)))
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    return DataFrame(
+        {
+            "Open": close,
+            "High": close * (1 + rng.uniform(0, 0.02, periods)),
+            "Low": close * (1 - rng.uniform(0, 0.02, periods)),
+            "Close": close,
+            "Volume": rng.integers(1000, 5000, periods),
+        },
+        index=pd.date_range("2024-01-01", periods=periods, freq="h"),
+    )
+
+
+def test_universe_panel_matches_per_ticker_build(tmp_path):
+    tickers = ["AAA", "BBB", "CCC"]
+    report = build_universe_dataset(tickers, str(tmp_path), interval="1h", max_workers=2, fetch_fn=fake_fetch)
+
+    assert report.errors == {}
+    panel = report.panel()
+
+    assert list(panel.index.names) == ["ticker", "timestamp"]
+    assert isinstance(panel["ticker"].dtype, pd.CategoricalDtype)
+    assert list(panel["ticker"].cat.categories) == tickers
+
+    for ticker in tickers:
+        expected = build_dataset(fake_fetch(ticker))
+        actual = panel.xs(ticker, level="ticker").drop(columns="ticker")
+
+        assert report.rows[ticker] == len(expected)
+        np.testing.assert_array_equal(actual.to_numpy(), expected.to_numpy())
+        assert (actual.index == expected.index).all()
+
+
+def test_universe_records_errors_and_skips_failed_ticker(tmp_path):
+    report = build_universe_dataset(["AAA", "BROKEN"], str(tmp_path), max_workers=2, fetch_fn=fake_fetch)
+
+    assert "BROKEN" in report.errors
+    assert list(report.rows) == ["AAA"]
+
+    with open(os.path.join(tmp_path, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert set(manifest["shards"]) == {"AAA"}
+
+    panel = load_panel(str(tmp_path))
+    assert list(panel["ticker"].cat.categories) == ["AAA"]
@@ -0,0 +1,67 @@
+import inspect
+import numpy as np
+import pandas as pd
+import pytest
+from backend.ml.evaluation import walk_forward
+from backend.ml.data.create_target import create_market_target
+from backend.ml.evaluation.walk_forward import DEFAULT_PURGE, walk_forward_backtest, walk_forward_splits
+
+
+def test_splits_expanding_respect_purge():
+    """Każdy test zaczyna się `purge` wierszy po końcu treningu, a trening rośnie od zera."""
+    splits = list(walk_forward_splits(120, n_splits=5, purge=5))
+
+    assert len(splits) == 5
+    for train, test in splits:
+        assert train.start == 0
+        assert test.start - train.stop == 5
+        assert len(test) == 20
+    assert splits[-1][1].stop == 120
+
+
+def test_splits_rolling_fixed_train_size():
+    splits = list(walk_forward_splits(200, n_splits=4, test_size=25, mode="rolling", train_size=50, purge=3))
+
+    assert all(len(train) == 50 for train, _ in splits)
+    assert [test.start for _, test in splits] == [100, 125, 150, 175]
+
+
+def test_splits_rolling_requires_train_size():
+    with pytest.raises(ValueError):
+        list(walk_forward_splits(100, mode="rolling"))
+
+
+def test_walk_forward_backtest_parallel_matches_sequential():
+    """Foldy w puli procesów dają te same metryki co uruchomione po kolei."""
+    rng = np.random.default_rng(5)
+    periods = 300
+    X = pd.DataFrame(rng.normal(size=(periods, 3)), columns=["f1", "f2", "f3"])
+    dataset = X.assign(target=np.where(X["f1"] > 0.3, 1, np.where(X["f1"] < -0.3, -1, 0)))
+    params = {"n_estimators": 10, "max_depth": 3}
+
+    parallel = walk_forward_backtest(dataset, n_splits=3, max_workers=2, model_params=params)
+    sequential = walk_forward_backtest(dataset, n_splits=3, max_workers=1, model_params=params)
+
+    assert len(parallel.folds) == 3
+    assert parallel.wall_time_s > 0
+    pd.testing.assert_series_equal(parallel.folds["accuracy"], sequential.folds["accuracy"])
+    assert (parallel.folds["accuracy"] > 0.5).all()
+
+
+def test_sequential_backtest_releases_worker_mmaps():
+    """Przy max_workers=1 mmapy plików z katalogu tymczasowego nie zostają w globalnym stanie modułu."""
+    rng = np.random.default_rng(7)
+    X = pd.DataFrame(rng.normal(size=(120, 2)), columns=["f1", "f2"])
+    dataset = X.assign(target=np.sign(X["f1"]).astype(int))
+
+    walk_forward_backtest(dataset, n_splits=2, max_workers=1, model_params={"n_estimators": 5, "max_depth": 2})
+
+    assert walk_forward._WORKER_X is None
+    assert walk_forward._WORKER_Y is None
+
+
+def test_default_purge_follows_target_window():
+    """Domyślna przerwa to domyślne `window` create_market_target, a nie osobno wpisana liczba."""
+    assert DEFAULT_PURGE == inspect.signature(create_market_target).parameters["window"].default
+    train, test = next(walk_forward_splits(120, n_splits=2))
+    assert test.start - train.stop == DEFAULT_PURGE